@@ -2,7 +2,6 @@ from flask import Flask, request, render_template, redirect, url_for, flash
 from pathlib import Path
 from automation import run_analysis
 from automation import comdirect_status_update
-from automation import comdirect_status_report
 from src import server
 
 
@@ -128,6 +127,9 @@ def call_run_update_part2():
 
 @server.server.route('/report', methods=['POST', 'GET'])
 def render_report():
+    # The report (Plotly, PIL) is only imported when requested.
+    from automation import comdirect_status_report
+
     comdirect_status_report.make_report(server.dash_app)
     return redirect('/report1/')
 
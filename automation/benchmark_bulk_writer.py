@@ -0,0 +1,187 @@
+"""Benchmark of the writing of a dataframe into a database table: the previous
+path (one ``executemany`` with the complete dataframe as a list of rows)
+against the bulk writer (``insert`` and ``load_data`` modes).
+
+The database is an in-memory SQLite stand-in which accepts the statements of
+the writers in the MySQL dialect (placeholders, ``ON DUPLICATE KEY UPDATE``
+and ``LOAD DATA LOCAL INFILE``), so the benchmark runs without a MySQL server.
+It measures the time and the peak memory of the Python side. The duration of
+``load_data`` includes the parsing of the CSV file by the stand-in (in Python),
+which a MySQL server does natively.
+
+Usage::
+
+    python -m automation.benchmark_bulk_writer --rows 200000
+
+"""
+import argparse
+import csv
+import re
+import sqlite3
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.lib.storage.bulk_writer import bulk_insert, load_data, quote
+
+
+class StandInCursor:
+    """Cursor of SQLite, translating the MySQL statements of the writers."""
+
+    load_data_pattern = re.compile(
+        r"LOAD DATA LOCAL INFILE '(?P<path>[^']*)' REPLACE INTO TABLE `(?P<table>[^`]*)`.*\((?P<columns>[^)]*)\)$",
+        re.DOTALL)
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.cursor = connection.cursor()
+        self.statements = 0
+
+    @staticmethod
+    def translate(query: str):
+        query = query.replace("%s", "?")
+        query = query.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+        return re.sub(r"VALUES\((`[^`]*`)\)", r"excluded.\1", query)
+
+    def execute(self, query: str, parameter=None):
+        self.statements += 1
+
+        match = self.load_data_pattern.match(query.strip())
+        if match:
+            return self.load_data(match)
+
+        self.cursor.execute(self.translate(query), parameter or [])
+
+    def executemany(self, query: str, parameter: list):
+        self.statements += 1
+        self.cursor.executemany(self.translate(query), parameter)
+
+    def load_data(self, match):
+        """Reads the CSV file as ``LOAD DATA`` does (``\\N`` as ``NULL`` and
+        ``\\`` as the escape character)."""
+        columns = match.group("columns")
+        placeholders = ", ".join(["?"] * len(columns.split(",")))
+        sql_query = f"INSERT OR REPLACE INTO `{match.group('table')}` ({columns}) VALUES ({placeholders})"
+
+        def rows(file):
+            for row in csv.reader(file):
+                yield [None if value == "\\N" else value.replace("\\\\", "\\") for value in row]
+
+        with open(match.group("path"), newline="", encoding="utf-8") as file:
+            self.cursor.executemany(sql_query, rows(file))
+
+
+def create_history(rows: int, seed: int = 0):
+    """Synthetic depot history: one row per day and position."""
+    rng = np.random.default_rng(seed)
+    positions = 20
+    days = max(rows // positions, 1)
+
+    dates = np.repeat(pd.date_range("2010-01-01", periods=days, freq="D"), positions)
+    dataframe = pd.DataFrame({
+        "Date": dates,
+        "WKN": np.tile([f"WKN{i:04d}" for i in range(positions)], days),
+        "Position ID": np.tile([f"{i:010d}" for i in range(positions)], days),
+        "Quantity": rng.integers(1, 1000, len(dates)),
+        "Current Price": rng.normal(100.0, 10.0, len(dates)),
+        "Current Value": rng.normal(10000.0, 1000.0, len(dates)),
+        "Profit/Loss Purchase Relative": rng.normal(0.0, 5.0, len(dates)),
+        "Current Price Unit": "EUR",
+    })
+    dataframe.loc[::97, "Current Price"] = np.nan
+    dataframe.loc[::101, "Current Value"] = np.inf
+
+    return dataframe
+
+
+def create_table(connection: sqlite3.Connection, table_name: str, dataframe: pd.DataFrame):
+    columns = ", ".join(quote(column) for column in dataframe.columns)
+    connection.execute(f"DROP TABLE IF EXISTS {quote(table_name)}")
+    connection.execute(f"CREATE TABLE {quote(table_name)} ({columns}, "
+                       "UNIQUE (`Date`, `Position ID`))")
+
+
+def write_legacy(cursor, table_name: str, dataframe: pd.DataFrame):
+    """Previous path of ``save_pandas_as_db_item``. The replace of ``NaN`` by
+    ``pd.NA`` before the ``where`` is left out (the result is the same), since
+    it fails for integer columns with some versions of Pandas."""
+    dataframe_storage = dataframe.copy()
+    dataframe_storage.replace([np.inf, -np.inf], np.nan, inplace=True)
+    dataframe_storage_clear = dataframe_storage.astype(object).where(
+        dataframe_storage.notnull(), None)
+    values = dataframe_storage_clear.to_numpy().tolist()
+
+    columns = ", ".join(quote(column) for column in dataframe.columns)
+    placeholders = ", ".join(["%s"] * len(dataframe.columns))
+    updates = ", ".join(f"{quote(column)} = VALUES({quote(column)})" for column in dataframe.columns)
+    cursor.executemany(f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders}) "
+                       f"ON DUPLICATE KEY UPDATE {updates}", values)
+
+
+def benchmark(rows: int, chunk_rows: int = 1000):
+    """Writes the same history with each method into an empty table.
+
+    Returns
+    -------
+        results: dict
+            Duration (s), peak memory (MB), statements and rows stored, with
+            the method as key.
+
+    """
+    dataframe = create_history(rows)
+    # SQLite (unlike the MySQL connector) doesn't take timestamps as
+    # parameters, so the dates are given as text to all the methods.
+    dataframe["Date"] = dataframe["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    methods = {
+        "legacy": lambda cursor: write_legacy(cursor, "history", dataframe),
+        "insert": lambda cursor: bulk_insert(cursor, "history", dataframe, chunk_rows=chunk_rows),
+        "load_data": lambda cursor: load_data(cursor, "history", dataframe),
+    }
+
+    results = {}
+    for method, write in methods.items():
+        results[method] = {}
+
+        # ----------------------------------------------------------------------
+        #   The duration and the memory are measured in separate runs, since
+        #   the tracing of the memory slows down the allocations.
+        # ----------------------------------------------------------------------
+        for trace_memory in [False, True]:
+            connection = sqlite3.connect(":memory:")
+            create_table(connection, "history", dataframe)
+            cursor = StandInCursor(connection)
+
+            if trace_memory:
+                tracemalloc.start()
+            time_start = time.perf_counter()
+            write(cursor)
+            connection.commit()
+            duration = time.perf_counter() - time_start
+
+            if trace_memory:
+                results[method]["Peak Memory"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                tracemalloc.stop()
+            else:
+                results[method]["Duration"] = duration
+
+            results[method]["Statements"] = cursor.statements
+            results[method]["Rows"] = connection.execute(
+                "SELECT COUNT(*) FROM history").fetchone()[0]
+            connection.close()
+
+    return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark of the bulk writer.")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-rows", type=int, default=1000)
+    arguments = parser.parse_args()
+
+    results = benchmark(rows=arguments.rows, chunk_rows=arguments.chunk_rows)
+
+    print(f"{'Method':<10} {'Duration (s)':>12} {'Peak (MB)':>10} {'Statements':>10} {'Rows':>8}")
+    for method, result in results.items():
+        print(f"{method:<10} {result['Duration']:>12.2f} {result['Peak Memory']:>10.1f} "
+              f"{result['Statements']:>10} {result['Rows']:>8}")
@@ -8,6 +8,7 @@ from datetime import datetime
 import pandas as pd
 import json
 from src.lib.config import Config
+from src.lib.http_session import HttpSessions
 from src.session import Session
 from src.communication import Communication
 from src.lib import constants as C
@@ -106,10 +107,13 @@ def run_update(mode: int = 0, wait_time: int = 0):
     # --------------------------------------------------------------------------
     #   Example of accessing a Comdirect account and fetching information.
     # --------------------------------------------------------------------------
+    http = HttpSessions.from_config(config.http_config)
+
     if mode == 0 or mode == 1 or mode == 3:
         comdirect = Session(access_config=config.data_source_trade_access_data,
                             access_userdata=config.data_source_trade_user_data,
                             logger_name=LOGGER_NAME,
+                            http=http,
                             )
         connection, flag, level, message = comdirect.connect(mode=mode,
                                                              wait_time=wait_time)
@@ -129,7 +133,8 @@ def run_update(mode: int = 0, wait_time: int = 0):
         comdirect = Session(access_config=config.data_source_trade_access_data,
                             access_userdata=config.data_source_trade_user_data,
                             logger_name=LOGGER_NAME,
-                            session_info=session_info
+                            session_info=session_info,
+                            http=http,
                             )
         connection, flag, level, message = comdirect.connect(mode=mode,
                                                              wait_time=wait_time)
@@ -152,6 +157,7 @@ def run_update(mode: int = 0, wait_time: int = 0):
         # print(orders_after.T)
         # logger.info(orders_after.T)
         comdirect.revoke_token()
+        http.close()
 
         # --------------------------------------------------------------------------
         #   Store the results into an Excel files.
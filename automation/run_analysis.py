@@ -2,28 +2,62 @@
 a report of the overall results for performance evaluation.
 
 """
+import os
 import sys
 import logging
-import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from src.communication import Communication
-from src.lib.config import Config
 from src.lib import constants as C
-from src.data_access import DataAccess
+from src.run_context import RunContext
+from src.async_data_access import AsyncDataAccess
 from src.analysis import Analysis
+from src.panel_analysis import PanelAnalysis
 from src.lib import print_table as pt
-from src.storage import Storage
 
 LOGGER_NAME = "invst.run_analysis"
 
-
-def run_analysis(ticker_input: list = None):
-
-    # --------------------------------------------------------------------------
-    #   Defines the logger configuration and start the logger. Add a few
-    #   message to mark the start of the execution.
-    # --------------------------------------------------------------------------
+# Context of the run in each worker process from the pool, created once by
+# ``initialize_worker``.
+WORKER_CONTEXT = None
+
+# ------------------------------------------------------------------------------
+#   Default list of symbols, also used by the training of the models.
+# ------------------------------------------------------------------------------
+SYMBOLS = [
+    {"name": "Daimler AG", "symbol": "DAI.DE"},
+    {"name": "Siemens AG", "symbol": "SIE.DE"},
+    {"name": "Coca-Cola Co.", "symbol": "KO"},
+    {"name": "Alphabet Inc.", "symbol": "GOOG"},
+    {"name": "Tesla, Inc.", "symbol": "TSLA"},
+    {"name": "Boeing Co.", "symbol": "BA"},
+    {"name": "Apple", "symbol": "AAPL"},
+    {"name": "Amazon", "symbol": "AMZN"},
+    {"name": "Bristol-Meyers Squibb", "symbol": "BMY"},
+    {"name": "General Motors", "symbol": "GM"},
+    {"name": "AbbVie Inc.", "symbol": "ABBV"},
+    {"name": "American Express CO.", "symbol": "AXP"},
+    {"name": "3M CO.", "symbol": "MMM"},
+    {"name": "CISCO INC.", "symbol": "CSCO"},
+    {"name": "IBM CORP.", "symbol": "IBM"},
+    {"name": "The Walt Disney Co.", "symbol": "DIS"},
+    {"name": "Johnson & Johnson", "symbol": "JNJ"},
+    {"name": "IDEX", "symbol": "IEX"},
+    {"name": "Akamai Technologies, Inc.", "symbol": "AKAM"},
+    {"name": "Telefonaktiebolaget LM Ericsson", "symbol": "ERIC"},
+    {"name": "Thermo Fisher Scientific Inc.", "symbol": "TMO"},
+    {"name": "Zscaler, Inc.", "symbol": "ZS"},
+    {"name": "Meta", "symbol": "FB"},
+]
+
+
+def configure_logging():
+    """Defines the logger configuration, storing the messages in the file
+    ``logs/logs.log``. Used by the main process and by each worker.
+
+    """
     logs_folder = Path.cwd().resolve() / "logs"
     logs_folder.mkdir(parents=True, exist_ok=True)
     if not (logs_folder / "logs.log").exists():
@@ -38,6 +72,110 @@ def run_analysis(ticker_input: list = None):
         level=logging.DEBUG,
     )
 
+
+def limit_worker_threads(tf_threads: int):
+    """Limits the number of threads of the native libraries (OpenMP and the
+    BLAS used by Numpy, and TensorFlow) in the worker processes.
+
+    These libraries read the limits from the environment only when they are
+    loaded, which happens in the worker before ``initialize_worker`` runs
+    (Numpy is imported with the modules of the analysis). So the variables are
+    set in the main process, before the pool is created, and the workers
+    inherit them.
+
+    Parameters
+    ----------
+        tf_threads: int
+            Number of threads for each worker. For 0, the defaults of the
+            libraries are kept.
+
+    """
+    if tf_threads > 0:
+        for variable in ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                         "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"]:
+            os.environ[variable] = str(tf_threads)
+
+
+def initialize_worker(tf_threads: int, import_tensorflow: bool = True):
+    """Initializes a worker process from the pool, limiting the number of
+    threads used by TensorFlow, so the workers together don't use more threads
+    than the available cores. The threads of Numpy are limited by the
+    environment set in the main process (see ``limit_worker_threads``).
+
+    Parameters
+    ----------
+        tf_threads: int
+            Number of threads for each TensorFlow thread pool (intra and inter
+            operations). For 0, the TensorFlow default is kept.
+        import_tensorflow: bool, optional
+            If ``False`` (the analysis only predicts with the exported
+            weights), TensorFlow is not imported, and the initializer doesn't
+            limit any threads.
+
+    """
+    global WORKER_CONTEXT
+
+    configure_logging()
+    WORKER_CONTEXT = RunContext(logger_name=LOGGER_NAME)
+
+    if tf_threads > 0 and import_tensorflow:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(tf_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(tf_threads)
+
+
+def analyze_symbol(ticker: str, ohlc_data, incremental: bool = False):
+    """Performs the analysis of a single symbol. This function is executed by
+    the workers from the pool, so only the results (and not the ``Analysis``
+    object) are sent back to the main process.
+
+    Returns
+    -------
+        analysis_results: `dictionary`
+            Summary from the results from the ticker.
+
+    """
+    analysis = Analysis(symbol=ticker,
+                        ohlc_data=ohlc_data,
+                        logger_name=LOGGER_NAME,
+                        context=WORKER_CONTEXT)
+    if incremental:
+        analysis.analyze_incremental()
+    else:
+        analysis.analyze()
+
+    return analysis.analysis_results
+
+
+def run_analysis(ticker_input: list = None, panel: bool = None, workers: int = None):
+    """Runs the analysis for a list of symbols / tickers.
+
+    Parameters
+    ----------
+        ticker_input: list, optional
+            List of symbols to be analyzed. If not passed, a default list of
+            symbols is used.
+        panel: bool, optional
+            If ``True``, the data for all the symbols is fetched first and the
+            analysis is done for all of them at once by the ``PanelAnalysis``.
+            Otherwise, each symbol is analyzed right after its data is fetched.
+            If not passed, the ``panel_analysis`` execution parameter is used.
+        workers: int, optional
+            Number of processes for the analysis. For more than 1, the analysis
+            of each symbol is sent to a process pool as soon as its data is
+            fetched, while the data fetch remains in the main process (so the
+            requests are still limited by a single rate limiter). A failure in the
+            analysis of a symbol only removes that symbol from the results. If
+            not passed, the ``workers`` execution parameter is used.
+
+    """
+
+    # --------------------------------------------------------------------------
+    #   Defines the logger configuration and start the logger. Add a few
+    #   message to mark the start of the execution.
+    # --------------------------------------------------------------------------
+    configure_logging()
+
     logformat = logging.Formatter(
         fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y.%m.%d %I:%M:%S %p",)
@@ -54,26 +192,20 @@ def run_analysis(ticker_input: list = None):
     logger.info("========================== NEW RUN ==========================")
 
     # --------------------------------------------------------------------------
-    #   Defines the location of the files with configurations and load them.
+    #   Context of the run: the configuration is loaded once and shared, with
+    #   the storage and connections, by all the symbols.
     # --------------------------------------------------------------------------
-    config_base_path = Path.cwd().resolve() / "cfg"
-    config_access_file = config_base_path / "api-cfg.json"
-    config_access_userdata_file = config_base_path / "user" / "api-cfg-access.json"
-    config_local_file = config_base_path / "local" / "local.json"
-    config_parameters_file = config_base_path / "parameters.json"
+    context = RunContext(logger_name=LOGGER_NAME)
+    config = context.config
 
-    config = Config(logger_name=LOGGER_NAME)
-    re_load_config = config.load_config(filename=config_access_file)
-    re_load_user = config.load_config(filename=config_access_userdata_file)
-    re_load_local = config.load_config(filename=config_local_file)
-    re_load_param = config.load_config(filename=config_parameters_file)
-
-    if (re_load_config[1] != C.SUCCESS or
-            re_load_user[1] != C.SUCCESS or
-            re_load_local[1] != C.SUCCESS or
-            re_load_param[1] != C.SUCCESS):
+    if not context.config_loaded:
         return "Error loading files"
 
+    if panel is None:
+        panel = config.panel_analysis
+    if workers is None:
+        workers = config.workers
+
     # --------------------------------------------------------------------------
     #   Collects data about the execution.
     # --------------------------------------------------------------------------
@@ -105,31 +237,7 @@ def run_analysis(ticker_input: list = None):
                 {"name": "", "symbol": ticker_item},
             )
     else:
-        symbols = [
-            {"name": "Daimler AG", "symbol": "DAI.DE"},
-            {"name": "Siemens AG", "symbol": "SIE.DE"},
-            {"name": "Coca-Cola Co.", "symbol": "KO"},
-            {"name": "Alphabet Inc.", "symbol": "GOOG"},
-            {"name": "Tesla, Inc.", "symbol": "TSLA"},
-            {"name": "Boeing Co.", "symbol": "BA"},
-            {"name": "Apple", "symbol": "AAPL"},
-            {"name": "Amazon", "symbol": "AMZN"},
-            {"name": "Bristol-Meyers Squibb", "symbol": "BMY"},
-            {"name": "General Motors", "symbol": "GM"},
-            {"name": "AbbVie Inc.", "symbol": "ABBV"},
-            {"name": "American Express CO.", "symbol": "AXP"},
-            {"name": "3M CO.", "symbol": "MMM"},
-            {"name": "CISCO INC.", "symbol": "CSCO"},
-            {"name": "IBM CORP.", "symbol": "IBM"},
-            {"name": "The Walt Disney Co.", "symbol": "DIS"},
-            {"name": "Johnson & Johnson", "symbol": "JNJ"},
-            {"name": "IDEX", "symbol": "IEX"},
-            {"name": "Akamai Technologies, Inc.", "symbol": "AKAM"},
-            {"name": "Telefonaktiebolaget LM Ericsson", "symbol": "ERIC"},
-            {"name": "Thermo Fisher Scientific Inc.", "symbol": "TMO"},
-            {"name": "Zscaler, Inc.", "symbol": "ZS"},
-            {"name": "Meta", "symbol": "FB"},
-        ]
+        symbols = SYMBOLS
 
     execution_data["execution"]["Symbols"] = symbols
     execution_data["execution"]["Symbols count"] = len(symbols)
@@ -137,40 +245,71 @@ def run_analysis(ticker_input: list = None):
     results_data = []
     results_analysis = []
     results_summary = []
+    panel_data = {}
+
+    # --------------------------------------------------------------------------
+    #   Process pool for the analysis. The "spawn" start is used since forking
+    #   a process with TensorFlow already loaded is not safe. The limits of
+    #   threads are set before, so the workers inherit them.
+    # --------------------------------------------------------------------------
+    executor = None
+    futures = []
+    if workers > 1 and not panel:
+        limit_worker_threads(config.tf_threads)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initialize_worker,
+            initargs=(config.tf_threads,
+                      config.lstm_train_in_analysis or not config.lstm_numpy_inference))
+
+    # --------------------------------------------------------------------------
+    #   The data is fetched in the background, limited by the rate of the
+    #   provider, while the symbols already fetched are analyzed. The pooled
+    #   connections to the provider and the local store of the OHLC data (so
+    #   only the latest entries are fetched) come from the context.
+    # --------------------------------------------------------------------------
+    fetcher = AsyncDataAccess.from_context(context=context,
+                                           logger_name=LOGGER_NAME)
 
     i = 1
-    for symbol in symbols:
+    for ticker, result, fetch_result in fetcher.iterate(
+            tickers=[symbol["symbol"] for symbol in symbols],
+            type_series="TIMESERIES", period="DAILY"):
 
         logger.info(f"---------- Analysis {i} from {len(symbols)} ----------")
         i = i + 1
 
-        # Short pause between requests to avoid over-request to AlphaVantage
-        time.sleep(config.parameters["execution"]["time_sleep"]["value"])
-
-        ticker = symbol["symbol"]
+        if fetch_result is None:
+            continue
 
-        result = DataAccess(ticker=ticker,
-                            source=config.data_source_fetch_name,
-                            access_config=config.data_source_fetch_access_data,
-                            access_userdata=config.data_source_fetch_user_data,
-                            logger_name=LOGGER_NAME,
-                            )
-
-        result_values, flag, level, message = result.update_values(
-            type_series="TIMESERIES", period="DAILY"
-        )
+        result_values, flag, level, message = fetch_result
 
         if flag == C.SUCCESS:
 
             results_data.append(result)
 
+            if panel:
+                panel_data[ticker] = result_values
+                continue
+
+            if executor is not None:
+                futures.append((ticker, executor.submit(
+                    analyze_symbol, ticker, result_values,
+                    config.incremental_analysis)))
+                continue
+
             # ------------------------------------------------------------------
             #   Perform analysis of the data.
             # ------------------------------------------------------------------
             analysis = Analysis(symbol=ticker,
                                 ohlc_data=result_values,
-                                logger_name=LOGGER_NAME)
-            decision = analysis.analyze()
+                                logger_name=LOGGER_NAME,
+                                context=context)
+            if config.incremental_analysis:
+                decision = analysis.analyze_incremental()
+            else:
+                decision = analysis.analyze()
 
             results_analysis.append(analysis)
             results_summary.append({ticker: analysis.analysis_results})
@@ -178,6 +317,32 @@ def run_analysis(ticker_input: list = None):
             analysis = None
             result = None
 
+    context.close()
+
+    # --------------------------------------------------------------------------
+    #   Collects the results from the pool, in the order of the symbols.
+    # --------------------------------------------------------------------------
+    if executor is not None:
+        for ticker, future in futures:
+            try:
+                results_summary.append({ticker: future.result()})
+            except Exception:
+                logger.exception("Analysis of %s failed", ticker)
+        executor.shutdown()
+
+    # --------------------------------------------------------------------------
+    #   Perform the analysis of all the symbols at once.
+    # --------------------------------------------------------------------------
+    if panel and len(panel_data) > 0:
+        panel_analysis = PanelAnalysis(ohlc_data=panel_data,
+                                       logger_name=LOGGER_NAME,
+                                       context=context)
+        panel_analysis.analyze()
+
+        for analysis in panel_analysis.analyses:
+            results_analysis.append(analysis)
+            results_summary.append({analysis.symbol: analysis.analysis_results})
+
     # --------------------------------------------------------------------------
     #   Terminate the execution since there were only empty results. This is an
     #   error to be catched.
@@ -197,7 +362,7 @@ def run_analysis(ticker_input: list = None):
     # --------------------------------------------------------------------------
     today_string = datetime.today().strftime('%Y-%m-%d')
     file_export_summary = f"Export_Summary_{today_string}.xlsx"
-    folder = Path(config.local_config["paths"]["data_storage"])
+    folder = context.data_storage
     if not folder.exists():
         folder.mkdir(parents=True, exist_ok=True)
     file_export_summary = folder / file_export_summary
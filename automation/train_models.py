@@ -0,0 +1,147 @@
+"""Script for training / refreshing the LSTM models of a list of symbols /
+tickers, decoupled from the analysis. The models are stored in the model store
+(``models`` folder), from where the analysis only loads them for the
+prediction.
+
+The script is intended to run on a schedule (e.g. nightly, before the analysis
+run). For each symbol, a model is trained from scratch only if it doesn't
+exist yet or the analysis parameters changed, while a model older than
+``lstm_model_age`` is fine-tuned with the new data. With ``lstm_shared_model``
+enabled, a single model is trained with the pooled sequences of all the
+symbols, once all of them are fetched.
+
+The training runs as its own job, out of the web server, so it doesn't block
+the requests of the server::
+
+    python -m automation.train_models
+    python -m automation.train_models AMZN GOOG
+
+"""
+import logging
+import sys
+from datetime import datetime
+from src.lib import constants as C
+from src.run_context import RunContext
+from src.async_data_access import AsyncDataAccess
+from src.analysis import Analysis
+from src.panel_analysis import PanelAnalysis
+from src.lib.analysis.model_registry import SHARED_SYMBOL
+from automation.run_analysis import SYMBOLS, configure_logging
+
+LOGGER_NAME = "invst.train_models"
+
+
+def train_models(ticker_input: list = None):
+    """Trains or refreshes the models for a list of symbols / tickers.
+
+    Parameters
+    ----------
+        ticker_input: list, optional
+            List of symbols for the training. If not passed, the default list
+            of symbols from the analysis is used.
+
+    Returns
+    -------
+        results: `dictionary`
+            Dictionary with the symbol as key (``SHARED_SYMBOL`` for the
+            shared model) and the origin of each model, epochs trained and
+            duration of the training as value.
+
+    """
+
+    # --------------------------------------------------------------------------
+    #   Defines the logger configuration and start the logger.
+    # --------------------------------------------------------------------------
+    configure_logging()
+
+    logformat = logging.Formatter(
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y.%m.%d %I:%M:%S %p",)
+
+    logger_console = logging.StreamHandler()
+    logger_console.setLevel(logging.INFO)
+    logger_console.setFormatter(logformat)
+
+    logging.getLogger(LOGGER_NAME).addHandler(logger_console)
+
+    logger = logging.getLogger(LOGGER_NAME)
+
+    logger.info("")
+    logger.info("======================= NEW TRAINING ========================")
+
+    # --------------------------------------------------------------------------
+    #   Context of the run, with the configuration shared by all the symbols.
+    # --------------------------------------------------------------------------
+    context = RunContext(logger_name=LOGGER_NAME)
+    config = context.config
+
+    if not context.config_loaded:
+        return "Error loading files"
+
+    if ticker_input is not None:
+        tickers = list(ticker_input)
+    else:
+        tickers = [symbol["symbol"] for symbol in SYMBOLS]
+
+    # --------------------------------------------------------------------------
+    #   Fetch of the data, the same way as for the analysis.
+    # --------------------------------------------------------------------------
+    fetcher = AsyncDataAccess.from_context(context=context,
+                                           logger_name=LOGGER_NAME)
+
+    results = {}
+    shared_data = {}
+    time_start = datetime.now()
+
+    for ticker, result, fetch_result in fetcher.iterate(
+            tickers=tickers, type_series="TIMESERIES", period="DAILY"):
+
+        if fetch_result is None:
+            continue
+
+        result_values, flag, level, message = fetch_result
+        if flag != C.SUCCESS:
+            continue
+
+        if config.lstm_shared_model:
+            shared_data[ticker] = result_values
+            continue
+
+        # ----------------------------------------------------------------------
+        #   A failure in the training of a symbol doesn't stop the others.
+        # ----------------------------------------------------------------------
+        try:
+            analysis = Analysis(symbol=ticker,
+                                ohlc_data=result_values,
+                                logger_name=LOGGER_NAME,
+                                context=context)
+            results[ticker] = analysis.train_models()
+        except Exception:
+            logger.exception("Training of %s failed", ticker)
+
+    context.close()
+
+    # --------------------------------------------------------------------------
+    #   Single model for all the symbols.
+    # --------------------------------------------------------------------------
+    if shared_data:
+        panel = PanelAnalysis(ohlc_data=shared_data, logger_name=LOGGER_NAME,
+                              context=context)
+        results[SHARED_SYMBOL] = panel.train_models()
+
+    for ticker, training_columns in results.items():
+        for column, training in training_columns.items():
+            logger.info("%s %s: %s model, %s epochs in %.1f s", ticker, column,
+                        training["LSTM Model"], training["LSTM Epochs"],
+                        training["LSTM Fit Duration"])
+
+    logger.info("Trained %s models for %s symbols in %.1f min", len(results),
+                len(tickers), (datetime.now() - time_start).seconds / 60.0)
+    logger.info(
+        "==================== COMPLETED TRAINING =====================")
+
+    return results
+
+
+if __name__ == "__main__":
+    train_models(ticker_input=sys.argv[1:] or None)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+def random_walk_df(seed: int, length_real: int = 750, length_prediction: int = 25,
+                   columns=None, dates: bool = True):
+    """Creates a dataframe similar to the one used in the analysis: a random
+    walk for the closing values, followed by a tail of prediction entries (no
+    closing values).
+
+    Parameters
+    ----------
+        seed: int
+            Seed of the random generator.
+        length_real: int, optional
+            Number of entries with real data.
+        length_prediction: int, optional
+            Number of prediction entries.
+        columns: function, optional
+            Function called with the random generator (after the random walk)
+            which returns the additional columns, as a dictionary. The values
+            only for the real data are completed with ``NaN`` for the
+            prediction entries.
+        dates: bool, optional
+            If ``True``, the index are business days. Otherwise, a range.
+
+    Returns
+    -------
+        dataframe: pd.DataFrame
+            Dataframe with the ``Close Final``, the additional columns and the
+            ``Data Type``.
+
+    """
+    rng = np.random.default_rng(seed)
+    length = length_real + length_prediction
+
+    data = {"Close Final": 100 * np.cumprod(1 + rng.normal(0, 0.02, length_real))}
+    if columns is not None:
+        data.update(columns(rng))
+
+    for column, values in data.items():
+        if len(values) == length_real:
+            data[column] = np.concatenate((values, [np.nan] * length_prediction))
+
+    data["Data Type"] = ["Real data"] * length_real + ["Prediction data"] * length_prediction
+
+    index = pd.date_range("2020-01-01", periods=length, freq="B") if dates else None
+
+    return pd.DataFrame(data, index=index)
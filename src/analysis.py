@@ -5,9 +5,9 @@ import logging
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
-from src.lib.config import Config
-from src.storage import Storage
+from src.run_context import RunContext
 from src.lib.analysis.preprocessing import PreProcessing
+from src.lib.analysis.incremental import Incremental
 from src.lib.analysis.methods.crash import Crash
 from src.lib.analysis.methods.macd import MACD
 from src.lib.analysis.methods.rsi_sma import RSI_SMA
@@ -18,7 +18,7 @@ from src.lib.analysis.methods.combined import CombinedStrategy
 LOGGER_NAME = "invst.analysis"
 
 
-class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy, PreProcessing):
+class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy, PreProcessing, Incremental):
     """Data analysis class.
 
     Attributes
@@ -35,6 +35,13 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
             * ``SELL`` = -1
             * ``HOLD`` = 0
 
+        lstm_train: `bool`
+            Defines if the LSTM models are trained during the analysis. If
+            ``False``, only the models from the training worker are used.
+        lstm_training: `dictionary`
+            Origin of the LSTM model, epochs trained and duration of the
+            training for each predicted column, also added to the summary of
+            the strategy using it.
         analysis_length_pre: `int`
             Number of samples to be used for the analysis. This number is the
             one applied on the initial steps of the analysis, when truncating
@@ -58,6 +65,8 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
             Number of samples to be used as sequence for output in the RNN /
             LSTM.
 
+        context: `RunContext`
+            Configuration and storage shared by all the symbols of the run.
         logger_name: `string`
             Name of the logger.
         display_analysis: `bool`
@@ -71,7 +80,8 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
     def __init__(self,
                  symbol: str,
                  ohlc_data: pd.DataFrame,
-                 logger_name: str):
+                 logger_name: str,
+                 context: RunContext = None):
 
         # ----------------------------------------------------------------------
         #   Results and data management related attributes.
@@ -80,27 +90,17 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
         self.ohlc_dataset = ohlc_data
         self.ohlc_dataset_prediction = None
         self.analysis_results = {}
+        self.lstm_training = {}
         self.decision = None
 
         # ----------------------------------------------------------------------
-        #   Defines the location of the files with configurations and load them.
+        #   Configuration and storage shared by the symbols of the run. Without
+        #   a context, a new one is created only for this analysis.
         # ----------------------------------------------------------------------
-        config_base_path = Path.cwd().resolve() / "cfg"
-        config_access_file = config_base_path / "api-cfg.json"
-        config_access_userdata_file = config_base_path / "user" / "api-cfg-access.json"
-        config_local_file = config_base_path / "local" / "local.json"
-        config_parameters_file = config_base_path / "parameters.json"
-
-        self.config = Config(logger_name=LOGGER_NAME)
-        self.config.load_config(filename=config_access_file)
-        self.config.load_config(filename=config_access_userdata_file)
-        self.config.load_config(filename=config_local_file)
-        self.config.load_config(filename=config_parameters_file)
-
-        # ----------------------------------------------------------------------
-        #   Add Storage support
-        # ----------------------------------------------------------------------
-        self.storage = Storage(config=self.config, logger_name=LOGGER_NAME)
+        if context is None:
+            context = RunContext(logger_name=LOGGER_NAME)
+        self.context = context
+        self.config = context.config
 
         # ----------------------------------------------------------------------
         #   Analysis related attributes.
@@ -117,6 +117,7 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
         # ----------------------------------------------------------------------
         self.sequence_length = self.config.lstm_sequence_length
         self.prediction_length = self.config.lstm_prediction_length
+        self.lstm_train = self.config.lstm_train_in_analysis
 
         # ----------------------------------------------------------------------
         #   Simulation related attributes.
@@ -144,6 +145,12 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
         self.logger = logging.getLogger(self.logger_name)
         self.logger.info("Initializing analysis.")
 
+    @property
+    def storage(self):
+        """Storage of the run, created on the first use (see
+        ``RunContext``)."""
+        return self.context.storage
+
     def analyze(self):
         """Performs the complete analysis of the data for a determined symbol / 
         ticker.
@@ -175,6 +182,16 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
 
         """
 
+        self.prepare_analysis()
+
+        return self.evaluate_analysis()
+
+    def prepare_analysis(self):
+        """Executes the steps of the analysis which are previous to the
+        strategies: data adequation, parameters calculation and extension of the
+        dataframe to the prediction dates (steps 1 and 2 from ``analyze``).
+
+        """
         # ----------------------------------------------------------------------
         #   Data adequation
         # ----------------------------------------------------------------------
@@ -192,14 +209,54 @@ class Analysis(Crash, MACD, RSI_SMA, RSI_EMA, BOLLINGER_BANDS, CombinedStrategy,
         # ----------------------------------------------------------------------
         self.extend_time_range(length=self.prediction_length)
 
+    def train_models(self):
+        """Trains or refreshes the LSTM models used by the strategies, without
+        the rest of the analysis. Used by the training worker
+        (``automation/train_models.py``).
+
+        Returns
+        -------
+            lstm_training: `dictionary`
+                Origin of each model, epochs trained and duration.
+
+        """
+        self.lstm_train = True
+
+        self.prepare_analysis()
+        self.calc_MACD_indicators()
+        self.calc_MACD_prediction()
+
+        return self.lstm_training
+
+    def evaluate_analysis(self, precalculated: bool = False):
+        """Executes the strategies and the arbitration (steps 3 and 4 from
+        ``analyze``), followed by the export of the dataframe.
+
+        Parameters
+        ----------
+            precalculated: bool, optional
+                If ``True``, the indicators and recommendations from the
+                strategies are already available in the dataframe, as done by
+                the ``PanelAnalysis`` for several symbols at once.
+
+        Returns
+        -------
+            decision: `int`
+                Final outcome of the analysis.
+            analysis_results: `dictionary`
+                Summary from the results from the ticker.
+            ohlc_dataset: `Pandas Dataframe`
+                Complete dataframe from the analysis from ticker.
+
+        """
         # ----------------------------------------------------------------------
         #   Individual strategies calculations
         # ----------------------------------------------------------------------
         self.calc_Crash()
-        self.calc_MACD()
-        self.calc_RSI_SMA()
-        self.calc_RSI_EMA()
-        self.calc_BBANDS()
+        self.calc_MACD(precalculated=precalculated)
+        self.calc_RSI_SMA(precalculated=precalculated)
+        self.calc_RSI_EMA(precalculated=precalculated)
+        self.calc_BBANDS(precalculated=precalculated)
 
         # ----------------------------------------------------------------------
         #   Final decision based on the previous BSH (Buy-Sell-Hold)
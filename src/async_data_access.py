@@ -0,0 +1,183 @@
+"""Asynchronous fetch of the OHLC data for a list of tickers."""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from src.data_access import DataAccess
+from src.lib.data_access.rate_limit import TokenBucket
+from src.lib.http_session import HttpSessions
+
+
+class AsyncDataAccess:
+    """Fetches the data for a list of tickers in the background, respecting
+    the rate limit of the provider, while the tickers already fetched are
+    processed (e.g. analyzed) by the caller.
+
+    Each fetch is a regular ``DataAccess.update_values``, executed in a thread
+    by an ``asyncio`` event loop, after taking a token from the
+    ``TokenBucket`` of the provider.
+
+    Attributes
+    ----------
+        source: `string`
+            Name of the provider, for example, YahooFinance.
+        access_config: `dictionary`
+            Configuration for accessing the provider.
+        access_userdata: `dictionary`
+            User configuration for accessing the provider (e.g. API key).
+        store: `dictionary`
+            Configuration of the local store of the OHLC data (see
+            ``LocalStore``), or ``None`` to always fetch the complete history.
+        http: `HttpSessions`
+            Pooled sessions shared by all the fetches, or ``None`` for the
+            sessions shared by the process.
+        bucket: `TokenBucket`
+            Rate limiter for the provider.
+        logger_name: `string`
+            Name of the logger.
+
+    Examples
+    --------
+
+    The rate limit is defined for each provider in the ``api-cfg.json`` file:
+
+    .. code-block:: json
+
+        {
+            "api": {
+                "fetching": {
+                    "AlphaVantage": {
+                        "rate_limit": {
+                            "requests": 5,
+                            "period": 60
+                        }
+                    }
+                }
+            }
+        }
+
+    """
+
+    def __init__(self, source: str, access_config: dict, access_userdata: dict,
+                 rate_limit: dict, logger_name: str, store: dict = None,
+                 http: HttpSessions = None):
+
+        self.source = source
+        self.access_config = access_config
+        self.access_userdata = access_userdata
+        self.store = store
+        self.http = http
+        self.bucket = TokenBucket(requests=rate_limit["requests"],
+                                  period=rate_limit["period"])
+
+        self.logger_name = logger_name
+        self.logger = logging.getLogger(logger_name + ".async_data_access")
+
+    @classmethod
+    def from_context(cls, context, logger_name: str):
+        """Creates the fetcher with the provider, rate limit, local store and
+        HTTP sessions from the context of the run.
+
+        Parameters
+        ----------
+            context: `RunContext`
+                Context of the run.
+            logger_name: `string`
+                Name of the logger.
+
+        """
+        config = context.config
+
+        return cls(source=config.data_source_fetch_name,
+                   access_config=config.data_source_fetch_access_data,
+                   access_userdata=config.data_source_fetch_user_data,
+                   rate_limit=context.rate_limit,
+                   logger_name=logger_name,
+                   store=context.ohlc_store,
+                   http=context.http)
+
+    async def fetch(self, ticker: str, type_series: str, period: str):
+        """Fetches the data for a single ticker, after the rate limiter allows
+        it (unless the data is taken from the local store).
+
+        Returns
+        -------
+            data_access: `DataAccess`
+                Object used to fetch the data.
+            result: `tuple`
+                Outcome from ``DataAccess.update_values``.
+
+        """
+        data_access = DataAccess(ticker=ticker,
+                                 source=self.source,
+                                 access_config=self.access_config,
+                                 access_userdata=self.access_userdata,
+                                 logger_name=self.logger_name,
+                                 store=self.store,
+                                 http=self.http)
+
+        # ----------------------------------------------------------------------
+        #   A ticker served from the local store doesn't use the rate limit.
+        # ----------------------------------------------------------------------
+        if not data_access.store_is_current():
+            await self.bucket.acquire()
+
+        result = await asyncio.to_thread(data_access.update_values,
+                                         type_series=type_series,
+                                         period=period)
+
+        return data_access, result
+
+    async def fetch_all(self, tickers: list, futures: list, type_series: str, period: str):
+        """Fetches the data for all the tickers, storing each outcome in the
+        future with the same position in ``futures``.
+        """
+
+        async def fetch_into(ticker, future):
+            try:
+                future.set_result(await self.fetch(ticker=ticker,
+                                                   type_series=type_series,
+                                                   period=period))
+            except Exception as error:
+                self.logger.exception("Fetch of %s failed", ticker)
+                future.set_exception(error)
+
+        await asyncio.gather(*[fetch_into(ticker, future)
+                               for ticker, future in zip(tickers, futures)])
+
+    def iterate(self, tickers: list, type_series: str = "TIMESERIES", period: str = "DAILY"):
+        """Starts the fetch of all the tickers in a background thread and
+        returns the outcomes in the order of ``tickers``, as soon as each one
+        is available.
+
+        Yields
+        ------
+            ticker: `string`
+                Ticker of the outcome.
+            data_access: `DataAccess`
+                Object used to fetch the data, or ``None`` in case of an error.
+            result: `tuple`
+                Outcome from ``DataAccess.update_values``, or ``None`` in case
+                of an error.
+
+        """
+        futures = [Future() for ticker in tickers]
+
+        thread = threading.Thread(
+            target=asyncio.run,
+            args=(self.fetch_all(tickers=tickers,
+                                 futures=futures,
+                                 type_series=type_series,
+                                 period=period),),
+            daemon=True)
+        thread.start()
+
+        for ticker, future in zip(tickers, futures):
+            if future.exception() is not None:
+                yield ticker, None, None
+            else:
+                data_access, result = future.result()
+                yield ticker, data_access, result
+
+        thread.join()
@@ -3,12 +3,12 @@
 from datetime import datetime
 import json
 import logging
-import requests
 import pandas as pd
-import matplotlib.dates as mdates
 
 from src.lib.data_access.alphavantage import AlphaVantage
 from src.lib.data_access.yahoofinance import YahooFinance
+from src.lib.data_access.local_store import LocalStore
+from src.lib.http_session import get_http_sessions
 
 
 # ------------------------------------------------------------------------------
@@ -26,7 +26,7 @@ from src.lib import constants as C
 from src.lib import messages as M
 
 
-class DataAccess (AlphaVantage, YahooFinance):
+class DataAccess (AlphaVantage, YahooFinance, LocalStore):
     """Data Access class.
 
     Attributes
@@ -57,6 +57,18 @@ class DataAccess (AlphaVantage, YahooFinance):
         data_pandas: `Pandas data frame`
             A pandas dataframe which stores the results of the fetch of the
             OHLC data for the given ticker.
+        store: `dictionary`
+            Configuration of the local store of the OHLC data (see
+            ``LocalStore``). If ``None``, the complete history is fetched
+            every time.
+        http: `HttpSessions`
+            Pooled sessions for the requests to the API. If not passed, the
+            sessions shared by the process are used.
+        fetch_range: `string`
+            Range of the history requested to Yahoo Finance.
+        fetch_compact: bool
+            If ``True``, only the compact history (last 100 entries) is
+            requested to AlphaVantage.
 
     Examples
     --------
@@ -112,8 +124,11 @@ class DataAccess (AlphaVantage, YahooFinance):
 
     """
 
+    FETCH_RANGE_FULL = "10y"
+
     def __init__(
-            self, ticker, source, access_config, access_userdata, logger_name):
+            self, ticker, source, access_config, access_userdata, logger_name,
+            store=None, http=None):
         """Initialization method."""
 
         # ----------------------------------------------------------------------
@@ -133,6 +148,11 @@ class DataAccess (AlphaVantage, YahooFinance):
         self.data_json = None
         self.data_pandas = None
 
+        self.http = http if http is not None else get_http_sessions()
+        self.store = store
+        self.fetch_range = self.FETCH_RANGE_FULL
+        self.fetch_compact = False
+
         # ----------------------------------------------------------------------
         #   Defines the logger to output the information and also
         #   add an entry for the start of the class
@@ -147,6 +167,11 @@ class DataAccess (AlphaVantage, YahooFinance):
     ):
         """Updates the OHLC values for given ticker.
 
+        With the local store (attribute ``store``), the stored values are
+        returned while they are younger than its ``max_age``. After that, only
+        the latest entries are fetched and appended to the stored ones, unless
+        the provider revised the history, when it is fetched completely again.
+
         Parameters
         ----------
             type_series: string, optional
@@ -221,6 +246,70 @@ class DataAccess (AlphaVantage, YahooFinance):
         self.start = start
         self.end = end
 
+        # ----------------------------------------------------------------------
+        #   Without the local store, the complete history is always fetched.
+        # ----------------------------------------------------------------------
+        if self.store is None:
+            return self.fetch_values()
+
+        # ----------------------------------------------------------------------
+        #   With the local store, only the entries since the last update are
+        #   fetched (if the store is not recent enough) and appended.
+        # ----------------------------------------------------------------------
+        stored, metadata = self.load_store()
+
+        if stored is not None and self.store_is_fresh(metadata):
+            self.data_pandas = stored
+            flag, level, message = M.get_status(self.logger_name,
+                                                "Store_Up_To_Date", (self.ticker,))
+            return self.data_pandas, flag, level, message
+
+        delta = stored is not None and self.set_delta_range(metadata)
+        result, flag, level, message = self.fetch_values()
+
+        if flag != C.SUCCESS:
+            return result, flag, level, message
+
+        if delta:
+            merged = self.merge_store(stored=stored, delta=result)
+
+            if merged is not None:
+                self.data_pandas = merged
+                self.save_store(data=merged, full=False, metadata=metadata)
+                flag, level, message = M.get_status(self.logger_name,
+                                                    "Store_Delta_Success",
+                                                    (self.ticker, len(merged) - len(stored)))
+                return self.data_pandas, flag, level, message
+
+            # ------------------------------------------------------------------
+            #   History revised by the provider (e.g. split or dividend), so
+            #   the complete history is fetched again.
+            # ------------------------------------------------------------------
+            M.get_status(self.logger_name, "Store_History_Revised",
+                         (self.ticker,))
+            self.fetch_range = self.FETCH_RANGE_FULL
+            self.fetch_compact = False
+            result, flag, level, message = self.fetch_values()
+
+            if flag != C.SUCCESS:
+                return result, flag, level, message
+
+        self.save_store(data=result, full=True)
+
+        return result, flag, level, message
+
+    def fetch_values(self):
+        """Fetches the OHLC values from the API and converts them into a Pandas
+        dataframe, for the parameters set by ``update_values``.
+
+        Returns
+        -------
+            Pandas dataframe
+                Same dataframe as from ``update_values``.
+
+        """
+        result = None
+
         # ----------------------------------------------------------------------
         #   Access the webpage
         # ----------------------------------------------------------------------
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-#from src.lib import constants as C
+from src.lib import constants as C
 
 
 class Arbitration:
@@ -49,13 +49,6 @@ class Arbitration:
         if result_column == "":
             result_column = f"Recommendation {source_column} {threshold_upper} {threshold_lower}"
 
-        # --------------------------------------------------------------------------
-        #   Populate the default value as HOLD
-        # --------------------------------------------------------------------------
-        value_default = values_upper_mid_lower[1]
-        value_high = values_upper_mid_lower[0]
-        value_low = values_upper_mid_lower[2]
-
         if mode == "norm":
             threshold_upper = self.ohlc_dataset[source_column].max(
             ) * threshold_upper
@@ -63,91 +56,153 @@ class Arbitration:
             ) * threshold_lower
 
         # ----------------------------------------------------------------------
-        #   Fill in the default value and calculate the crossing of the thrshold
-        #   applying histeresys.
+        #   Calculate the crossing of the thrshold applying histeresys and
+        #   translate the states into the recommendation values.
         # ----------------------------------------------------------------------
-        self.ohlc_dataset.loc[:, result_column] = value_default
-
-        i = 0
-        for index, row in self.ohlc_dataset.iterrows():
-
-            if i > 1:
+        states = self.threshold_states(
+            values=self.ohlc_dataset[source_column].to_numpy(dtype=float),
+            threshold_upper=threshold_upper,
+            threshold_lower=threshold_lower,
+            hysteresis=hysteresis)
 
-                if self.ohlc_dataset.iloc[i][source_column] > threshold_upper:
-                    value = value_high
-                elif self.ohlc_dataset.iloc[i][source_column] < threshold_lower:
-                    value = value_low
-                elif self.ohlc_dataset.iloc[i-1][result_column] == value_high and hysteresis:
-                    value = value_high
-                elif self.ohlc_dataset.iloc[i-1][result_column] == value_low and hysteresis:
-                    value = value_low
-                else:
-                    value = value_default
-
-                self.ohlc_dataset.iloc[i, self.ohlc_dataset.columns.get_loc(
-                    result_column)] = value
-
-            i = i + 1
+        self.ohlc_dataset.loc[:, result_column] = self.label_states(
+            states=states, values_upper_mid_lower=values_upper_mid_lower)
 
     def recommend_threshold_curve(self, source_column: str, reference_column_upper: str,  reference_column_lower: str, hysteresis: bool = True, values_upper_mid_lower: tuple = ("BUY", "HOLD", "SELL"),  result_column: str = "", result_dataframe: pd.DataFrame = None):
+        """Calculate a recommendation to buy or sell based on the crossing of
+        2 curves (columns) used as upper and lower thresholds, for example the
+        bands from the Bollinger Bands strategy. The logic is the same from
+        ``recommend_threshold_cross``, just with a threshold per entry.
+        """
 
         if result_column == "":
             result_column = f"Recommendation {source_column} {reference_column_upper} {reference_column_lower}"
 
-        value_default = values_upper_mid_lower[1]
-        value_high = values_upper_mid_lower[0]
-        value_low = values_upper_mid_lower[2]
+        states = self.threshold_states(
+            values=self.ohlc_dataset[source_column].to_numpy(dtype=float),
+            threshold_upper=self.ohlc_dataset[reference_column_upper].to_numpy(
+                dtype=float),
+            threshold_lower=self.ohlc_dataset[reference_column_lower].to_numpy(
+                dtype=float),
+            hysteresis=hysteresis)
+
+        self.ohlc_dataset.loc[:, result_column] = self.label_states(
+            states=states, values_upper_mid_lower=values_upper_mid_lower)
+
+    @staticmethod
+    def threshold_states(values: np.ndarray,
+                         threshold_upper,
+                         threshold_lower,
+                         hysteresis: bool = True,
+                         start: int = 2):
+        """Calculates the state of a series in relation to an upper and a lower
+        threshold, working only on Numpy arrays. The states are coded as:
+
+        * Above the upper threshold = 1
+        * Between thresholds = 0
+        * Below the lower threshold = -1
+
+        With hysteresis, an entry between the thresholds keeps the state from
+        the previous entry, which means the state is the last crossing carried
+        forward (and 0 before the first crossing). This is calculated at once
+        for the complete series by accumulating the position of the last
+        crossing, instead of iterating over the entries. For a 2-D array, each
+        column is treated as an independent series (e.g. one per symbol).
 
-        self.ohlc_dataset.loc[:, result_column] = value_default
-
-        i = 0
-        for index, row in self.ohlc_dataset.iterrows():
-
-            if i > 1:
-
-                threshold_upper = self.ohlc_dataset.iloc[i][reference_column_upper]
-                threshold_lower = self.ohlc_dataset.iloc[i][reference_column_lower]
-
-                if self.ohlc_dataset.iloc[i][source_column] > threshold_upper:
-                    value = value_high
-                elif self.ohlc_dataset.iloc[i][source_column] < threshold_lower:
-                    value = value_low
-                elif self.ohlc_dataset.iloc[i-1][result_column] == value_high and hysteresis:
-                    value = value_high
-                elif self.ohlc_dataset.iloc[i-1][result_column] == value_low and hysteresis:
-                    value = value_low
-                else:
-                    value = value_default
+        Parameters
+        ----------
+            values: Numpy array
+                Series to be compared to the thresholds, with the entries along
+                the first axis. ``NaN`` values are considered between the
+                thresholds.
+            threshold_upper: float or Numpy array
+                Upper threshold, as a single value or any array which
+                broadcasts against ``values``.
+            threshold_lower: float or Numpy array
+                Lower threshold, as a single value or any array which
+                broadcasts against ``values``.
+            hysteresis: bool, optional
+                Defines if the hysteresis is applied.
+            start: int, optional
+                Number of initial entries which are kept as 0, regardless of
+                the values.
+
+        Returns
+        -------
+            states: Numpy array
+                Array of ``int8`` with the states for each entry.
 
-                self.ohlc_dataset.iloc[i, self.ohlc_dataset.columns.get_loc(
-                    result_column)] = value
+        """
+        values = np.asarray(values, dtype=float)
+
+        states = np.select([values > threshold_upper, values < threshold_lower],
+                           [1, -1], 0).astype(np.int8)
+        states[:start] = 0
+
+        if hysteresis and states.size > 0:
+            positions = np.arange(states.shape[0]).reshape(
+                (-1,) + (1,) * (states.ndim - 1))
+            positions = np.where(states != 0, positions, 0)
+            np.maximum.accumulate(positions, axis=0, out=positions)
+            states = np.take_along_axis(states, positions, axis=0)
+
+        return states
+
+    @staticmethod
+    def label_states(states: np.ndarray, values_upper_mid_lower: tuple = ("BUY", "HOLD", "SELL")):
+        """Translates the states calculated by ``threshold_states`` into the
+        values from ``values_upper_mid_lower`` (for example ``BUY``, ``HOLD``
+        and ``SELL``).
+        """
+        labels = np.array(values_upper_mid_lower, dtype=object)
 
-            i = i + 1
+        return labels[1 - np.asarray(states, dtype=np.intp)]
 
     def define_actions(self, source_column: str, result_column: str = "", result_dataframe: pd.DataFrame = None):
+        """Converts a column of recommendations into events, so a ``BUY`` or
+        ``SELL`` event is only present on the entry where the recommendation
+        changes to that value. All the other entries are ``HOLD``, including
+        the first one, since there is no previous entry to compare to.
+        """
 
         if result_column == "":
             result_column = f"Recommended Events {source_column}"
 
-        self.ohlc_dataset.loc[:, result_column] = "HOLD"
+        codes = self.convert_codes(dataframe=self.ohlc_dataset,
+                                   source_column=source_column)
 
-        i = 0
-        for index, row in self.ohlc_dataset.iterrows():
+        self.ohlc_dataset.loc[:, result_column] = self.convert_labels(
+            codes=self.transition_events(codes=codes))
 
-            current_value = self.ohlc_dataset.iloc[i][source_column]
-            previous_value = self.ohlc_dataset.iloc[i - 1][source_column]
+    @staticmethod
+    def transition_events(codes: np.ndarray):
+        """Detects the transitions in an array of recommendation codes (see
+        ``Basic.convert_codes``), by comparing each entry to the previous one.
+        The result has the code ``BUY`` or ``SELL`` where the recommendation
+        changes into it, and ``HOLD`` otherwise. The first entry is always
+        ``HOLD``.
 
-            if (current_value == "BUY" and previous_value != "BUY"):
-                event = "BUY"
-            elif (current_value == "SELL" and previous_value != "SELL"):
-                event = "SELL"
-            else:
-                event = "HOLD"
+        Parameters
+        ----------
+            codes: Numpy array
+                Codes of the recommendation.
+
+        Returns
+        -------
+            events: Numpy array
+                Array of ``int8`` with the codes of the events.
+
+        """
+        codes = np.asarray(codes)
+
+        events = np.full(codes.shape, C.HOLD, dtype=np.int8)
 
-            self.ohlc_dataset.iloc[i, self.ohlc_dataset.columns.get_loc(
-                result_column)] = event
+        current_codes = codes[1:]
+        changed = current_codes != codes[:-1]
+        events[1:][changed & (current_codes == C.BUY)] = C.BUY
+        events[1:][changed & (current_codes == C.SELL)] = C.SELL
 
-            i = i + 1
+        return events
 
     def arbitrate(self):
         """Calculate the arbitration (combined strategy) which is a complex
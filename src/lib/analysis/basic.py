@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from src.lib import constants as C
 pd.options.mode.chained_assignment = None
 
 
@@ -426,6 +427,78 @@ class Basic:
             dataframe.loc[dataframe['Data Type']
                           == "Prediction data", result_column] = value_prediction
 
+    def calc_wilder(self,
+                    dataframe: pd.DataFrame,
+                    source_column: str,
+                    length: int,
+                    result_column: str = "",
+                    value_prediction=np.nan):
+        """Calculate the Wilder's smoothing (also known as smoothed moving
+        average, used for example in the RSI) for the specified column and
+        length in a Pandas dataframe. The first value is the simple moving
+        average of the first `N` samples (from the second sample on), and the
+        following ones are given by the recurrence:
+
+        .. math::
+
+            W_{X}^{(N)}(k) = \\frac{(N - 1).W_{X}^{(N)}(k-1) + X(k)}{N}
+
+        which is an exponential moving average with :math:`\\alpha = 1/N`,
+        seeded by the simple moving average. The recurrence is calculated by
+        the Pandas exponential weighted functions. Once an invalid value
+        (``NaN``) is found after the seed, the following results are also
+        invalid.
+
+        Parameters
+        ----------
+            source_column: string
+                Name of the column in the Pandas Dataframe to be used for the
+                calculation of the moving average.
+            length: int
+                Number of samples to be used for the seed and as smoothing
+                factor.
+            result_column: string, optional
+                Name of the column in the Pandas Dataframe to be used as the
+                result of the operation. If no information is
+                passed, then the name will be in the format: `Wilder length
+                source_column`.
+
+        """
+        if result_column == "":
+            result_column = f"Wilder {length} {source_column}"
+
+        result = self.wilder_smoothing(source=dataframe[source_column],
+                                       length=length)
+
+        dataframe.loc[:, result_column] = result
+
+        if value_prediction is not None:
+            dataframe.loc[dataframe['Data Type']
+                          == "Prediction data", result_column] = value_prediction
+
+    @staticmethod
+    def wilder_smoothing(source, length: int):
+        """Calculates the Wilder's smoothing (see ``calc_wilder``) for a Pandas
+        Series, or for every column of a Pandas Dataframe at once.
+        """
+        source = source.astype(float)
+        average = source.rolling(window=length, min_periods=length).mean()
+
+        seeded = source.copy()
+        seeded.iloc[:length] = np.nan
+        if length < len(seeded):
+            seeded.iloc[length] = average.iloc[length]
+
+        result = seeded.ewm(alpha=1 / length, adjust=False,
+                            ignore_na=False).mean()
+
+        invalid = np.logical_or.accumulate(
+            np.isnan(seeded.to_numpy()[length:]), axis=0)
+        result.iloc[length:] = result.iloc[length:].mask(invalid)
+        result.iloc[:length + 1] = average.iloc[:length + 1]
+
+        return result
+
     def calc_integration(self,
                          dataframe: pd.DataFrame,
                          source_column: str,
@@ -497,6 +570,51 @@ class Basic:
 
         return numpy_data
 
+    def convert_codes(self,
+                      dataframe: pd.DataFrame,
+                      source_column: str):
+        """Converts a column of recommendations or events (``BUY``, ``SELL``
+        and ``HOLD``) into a Numpy array of integer codes, so the strategies
+        can be evaluated on arrays instead of strings. The codes are the ones
+        defined in the constants module:
+
+        * ``BUY`` = 1
+        * ``SELL`` = -1
+        * ``HOLD`` = 0
+
+        Any other content (e.g. ``NaN``) is converted into ``UNKNOWN`` = 2.
+
+        Parameters
+        ----------
+            source_column: string
+                Name of the column in the Pandas Dataframe to be converted.
+
+        Returns
+        -------
+            codes: Numpy array
+                Array of ``int8`` with the same length as the dataframe.
+
+        """
+        values = dataframe[source_column].to_numpy()
+
+        codes = np.full(values.shape, C.UNKNOWN, dtype=np.int8)
+        codes[values == "BUY"] = C.BUY
+        codes[values == "SELL"] = C.SELL
+        codes[values == "HOLD"] = C.HOLD
+
+        return codes
+
+    def convert_labels(self, codes: np.ndarray):
+        """Converts an array of integer codes back into the values ``BUY``,
+        ``SELL`` and ``HOLD``. It's the reverse operation from
+        ``convert_codes``, where any code different from ``BUY`` and ``SELL``
+        is converted into ``HOLD``.
+        """
+        labels = np.select([codes == C.BUY, codes == C.SELL],
+                           ["BUY", "SELL"], "HOLD")
+
+        return labels.astype(object)
+
     def split_data(self, data, percetage_learning: float = -1, sequence_length: int = 0):
 
         length = data.size
@@ -0,0 +1,24 @@
+"""Keras callbacks used in the training of the LSTM models. The module imports
+TensorFlow, so it is only imported when a model is trained (see
+``LSTM.fit_lstm_model``).
+
+"""
+import time
+from tensorflow import keras
+
+
+class TrainingBudget (keras.callbacks.Callback):
+    """Stops the training at the end of the epoch which exceeds the time
+    budget (in seconds)."""
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+        self.start = None
+
+    def on_train_begin(self, logs=None):
+        self.start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        if time.perf_counter() - self.start > self.seconds:
+            self.model.stop_training = True
@@ -0,0 +1,124 @@
+"""Statistical forecasters, as faster alternatives to the LSTM for the
+prediction done by ``LSTM.calc_LSTM`` (selected by the ``forecaster``
+parameter). They are fitted and evaluated with Numpy only, for all the
+sequences at once.
+
+The forecasters receive the same sequences prepared for the LSTM and return
+the prediction in the same shape as the Keras models, so the rest of the
+prediction (squashing and normalization) doesn't depend on the forecaster.
+
+"""
+import numpy as np
+
+
+class Forecaster:
+    """Interface of the forecasters. The sequences have the shape ``(samples,
+    steps, features)``, as for the LSTM, and the labels ``(samples, 1)`` or
+    ``(samples, prediction_length, 1)``.
+
+    Attributes
+    ----------
+        name: str
+            Name of the forecaster, as used in the ``forecaster`` parameter.
+        output_shape: tuple
+            Shape of each label (without the samples), as seen in the fit.
+    """
+    name = ""
+
+    def __init__(self):
+        self.output_shape = None
+
+    def fit(self, X: np.ndarray, Y: np.ndarray):
+        """Fits the forecaster to the sequences and labels.
+
+        Returns
+        -------
+            forecaster: Forecaster
+                The forecaster itself.
+
+        """
+        self.output_shape = Y.shape[1:]
+
+        return self
+
+    def predict(self, X: np.ndarray, **kwargs):
+        """Predicts the labels of the sequences, with the same shape from the
+        labels used in the fit."""
+        raise NotImplementedError
+
+
+class AutoRegressive (Forecaster):
+    """Linear autoregressive model: each predicted value is a linear
+    combination of the values of the sequence plus a constant. The
+    coefficients for all the predicted steps are fitted at once by least
+    squares.
+
+    Attributes
+    ----------
+        coefficients: np.ndarray
+            Coefficients with shape ``(steps + 1, prediction_length)``, with
+            the constant in the last row.
+    """
+    name = "ar"
+
+    def __init__(self):
+        super().__init__()
+        self.coefficients = None
+
+    @staticmethod
+    def design(X: np.ndarray):
+        """Design matrix: the values of each sequence and a constant."""
+        X = np.asarray(X, dtype=np.float64).reshape(len(X), -1)
+
+        return np.hstack([X, np.ones((len(X), 1))])
+
+    def fit(self, X: np.ndarray, Y: np.ndarray):
+        super().fit(X, Y)
+
+        targets = np.asarray(Y, dtype=np.float64).reshape(len(Y), -1)
+        self.coefficients = np.linalg.lstsq(self.design(X), targets, rcond=None)[0]
+
+        return self
+
+    def predict(self, X: np.ndarray, **kwargs):
+        prediction = self.design(X) @ self.coefficients
+
+        return prediction.reshape((len(X),) + self.output_shape).astype(np.float32)
+
+
+class LinearExtrapolation (Forecaster):
+    """Extrapolation of the trend of each sequence: a straight line is fitted
+    (least squares) to the values of the sequence and prolonged for the
+    predicted steps. There are no parameters learned in the fit, besides the
+    shape of the prediction."""
+    name = "linear"
+
+    def predict(self, X: np.ndarray, **kwargs):
+        X = np.asarray(X, dtype=np.float64).reshape(len(X), -1)
+        steps = X.shape[1]
+        length = int(np.prod(self.output_shape)) if self.output_shape else 1
+
+        # ----------------------------------------------------------------------
+        #   Closed form of the slope and intercept for all the sequences, with
+        #   the time centered on the middle of the sequence.
+        # ----------------------------------------------------------------------
+        time = np.arange(steps) - (steps - 1) / 2.0
+        slope = X @ time / (time @ time) if steps > 1 else np.zeros(len(X))
+        intercept = X.mean(axis=1)
+
+        future = time[-1] + np.arange(1, length + 1)
+        prediction = intercept[:, np.newaxis] + slope[:, np.newaxis] * future
+
+        return prediction.reshape((len(X),) + self.output_shape).astype(np.float32)
+
+
+FORECASTERS = {forecaster.name: forecaster
+               for forecaster in [AutoRegressive, LinearExtrapolation]}
+
+
+def get_forecaster(name: str):
+    """New forecaster, given by its name (see ``FORECASTERS``)."""
+    if name not in FORECASTERS:
+        raise ValueError(f"Forecaster {name} not available.")
+
+    return FORECASTERS[name]()
@@ -0,0 +1,497 @@
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.lib import constants as C
+
+
+class Incremental:
+    """Incremental update of the analysis, so a new entry (e.g. a new daily
+    bar) is processed in constant time, instead of recalculating the complete
+    series.
+
+    After a complete analysis, the variables which are carried from one entry
+    to the next are extracted into a state: the values of the exponential
+    averages (EMA and Wilder's smoothing), the last entries of the closing
+    value (for the moving windows), the recommendations and events, and the
+    variables of the simulations. For each new entry, the state is updated by
+    the same recurrences used by the complete calculation.
+
+    The indicators are causal, so the result for the entries of real data is
+    the same as a complete calculation starting at the same first entry. The
+    differences are:
+
+    * The range of the analysis is not truncated again, so it grows with each
+      new entry (``Analysis length`` in the results).
+    * The prediction (e.g. of the MACD Histogram by the LSTM) is not
+      recalculated. The events predicted by the last complete analysis are
+      used, until the new entries reach the end of the predicted range.
+
+    A complete analysis is done when there is no state, the parameters changed,
+    the prediction range is exhausted or the history was revised (e.g. after
+    a split adjustment of the closing values).
+    """
+
+    INCREMENTAL_STATE_VERSION = 1
+    INCREMENTAL_METHODS = ["Crash", "MACD", "RSI SMA", "RSI EMA", "BBANDS"]
+    INCREMENTAL_WINDOW = C.BBANDS_LENGTH
+
+    # --------------------------------------------------------------------------
+    #   Recurrences for a single entry
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def ema_step(previous: float, value: float, alpha: float):
+        """Updates an exponential average with a new value, with the same
+        operations from Pandas ``ewm`` (``adjust=False``).
+        """
+        return ((1 - alpha) * previous + alpha * value) / ((1 - alpha) + alpha)
+
+    @staticmethod
+    def threshold_step(previous: int, value: float, threshold_upper: float, threshold_lower: float):
+        """Updates the state of a threshold crossing with hysteresis (see
+        ``Arbitration.threshold_states``) with a new value.
+        """
+        if value > threshold_upper:
+            return 1
+        if value < threshold_lower:
+            return -1
+        return previous
+
+    @staticmethod
+    def state_code(state: int, values_upper_mid_lower: tuple):
+        """Translates a threshold state into the code of the recommendation
+        (see ``Basic.convert_codes``).
+        """
+        codes = {"BUY": C.BUY, "SELL": C.SELL, "HOLD": C.HOLD}
+
+        return codes[values_upper_mid_lower[1 - state]]
+
+    # --------------------------------------------------------------------------
+    #   State management
+    # --------------------------------------------------------------------------
+    def incremental_parameters(self):
+        """Parameters which, if changed, invalidate the state."""
+        return {
+            "analysis_length_pre": self.analysis_length_pre,
+            "sequence_length": self.sequence_length,
+            "prediction_length": self.prediction_length,
+            "initial_value": self.initial_value,
+            "stopgain": self.stopgain,
+            "stoploss": self.stoploss,
+            "operation_cost_fix": self.operation_cost_fix,
+            "operation_cost_proportional": self.operation_cost_proportional,
+            "operation_cost_min": self.operation_cost_min,
+            "operation_cost_max": self.operation_cost_max,
+            "tax_percentage": self.tax_percentage,
+        }
+
+    def incremental_state_path(self):
+        """Location of the file with the state of the symbol."""
+        folder = Path(self.config.local_config["paths"]["data_storage"])
+
+        return folder / "state" / f"{self.symbol}.json"
+
+    def load_incremental_state(self):
+        """Loads the state of the symbol. Returns ``None`` if there is no
+        state, or if it was created by another version or other parameters.
+        """
+        path = self.incremental_state_path()
+        if not path.exists():
+            return None
+
+        with open(path, "r") as json_file:
+            state = json.load(json_file)
+
+        if (state.get("version") != self.INCREMENTAL_STATE_VERSION or
+                state.get("parameters") != self.incremental_parameters()):
+            self.logger.info("Incremental state for %s is outdated",
+                             self.symbol)
+            return None
+
+        return state
+
+    def save_incremental_state(self, state: dict):
+        """Stores the state of the symbol in a JSON file."""
+        path = self.incremental_state_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as json_file:
+            json.dump(state, json_file, indent=4)
+
+    def build_incremental_state(self):
+        """Extracts the state from the dataframe of a complete analysis.
+
+        Returns
+        -------
+            state: dict
+                Dictionary (serializable to JSON) with the variables at the
+                last entry of real data.
+
+        """
+        real = self.ohlc_dataset[self.ohlc_dataset["Data Type"] == "Real data"]
+        prediction = self.ohlc_dataset[self.ohlc_dataset["Data Type"]
+                                       == "Prediction data"]
+        last = real.iloc[-1]
+        window = real.tail(self.INCREMENTAL_WINDOW)
+
+        state = {
+            "version": self.INCREMENTAL_STATE_VERSION,
+            "parameters": self.incremental_parameters(),
+            "data_length": int(self.data_length),
+            "history": {
+                "dates": [str(date) for date in window.index],
+                "close": [float(value) for value in window["Close Final"]],
+            },
+            "movement": {
+                "up": float(real["Close Final Change"].clip(lower=0).sum()),
+                "down": float(real["Close Final Change"].clip(upper=0).abs().sum()),
+            },
+            "volume": {
+                "sum": float(real["Volume"].sum()),
+                "count": int(real["Volume"].count()),
+            },
+            "averages": {},
+            "recommendation": {},
+            "events": {},
+            "simulation": {},
+            "reference": float(last["MACD Simulation Reference"]),
+            "forecast": {"dates": [str(date) for date in prediction.index]},
+        }
+
+        for column in ["MACD EMA 12", "MACD EMA 26", "MACD Signal",
+                       "RSI SMA Gain Average", "RSI SMA Loss Average",
+                       "RSI EMA Gain Average", "RSI EMA Loss Average"]:
+            state["averages"][column] = float(last[column])
+
+        close = real["Close Final"].to_numpy(dtype=float)
+
+        for method in self.INCREMENTAL_METHODS:
+            decision = self.convert_codes(dataframe=real,
+                                          source_column=f"{method} Recommendation")
+            events = self.convert_codes(dataframe=real,
+                                        source_column=f"{method} Recommended Events")
+
+            state["recommendation"][method] = int(decision[-1])
+            state["events"][method] = [int(events[-2]), int(events[-1])]
+            state["forecast"][method] = list(
+                prediction[f"{method} Recommended Events"])
+
+            # ------------------------------------------------------------------
+            #   The variables of the simulation aren't part of the dataframe,
+            #   so the simulation of the real data is repeated to collect them.
+            # ------------------------------------------------------------------
+            simulation = {}
+            self.simulate_performance_array(
+                close=close,
+                decision=decision,
+                events=events,
+                initial_value=self.initial_value,
+                stopgain=self.stopgain,
+                stoploss=self.stoploss,
+                operation_cost_fix=self.operation_cost_fix,
+                operation_cost_proportional=self.operation_cost_proportional,
+                operation_cost_min=self.operation_cost_min,
+                operation_cost_max=self.operation_cost_max,
+                tax_percentage=self.tax_percentage,
+                state=simulation)
+            state["simulation"][method] = simulation
+
+        return state
+
+    def select_new_entries(self, dataframe: pd.DataFrame, state: dict):
+        """Selects the entries after the last one in the state, checking if the
+        entries already in the state were revised.
+
+        Returns
+        -------
+            new_entries: Pandas dataframe
+                Entries after the last entry in the state, or ``None`` if the
+                history was revised.
+
+        """
+        dates = pd.to_datetime(state["history"]["dates"])
+        stored = pd.Series(state["history"]["close"], index=dates)
+
+        overlap = dataframe.index.intersection(stored.index)
+        if not np.allclose(dataframe.loc[overlap, "Close Final"].to_numpy(dtype=float),
+                           stored.loc[overlap].to_numpy(dtype=float),
+                           rtol=1e-9, equal_nan=True):
+            return None
+
+        return dataframe[dataframe.index > dates[-1]]
+
+    def update_incremental_state(self, state: dict, date, close: float, volume: float):
+        """Updates the state with a new entry.
+
+        Parameters
+        ----------
+            state: dict
+                State to be updated (see ``build_incremental_state``).
+            date: Timestamp
+                Date of the new entry.
+            close: float
+                Closing value of the new entry.
+            volume: float
+                Volume of the new entry.
+
+        Returns
+        -------
+            entry: dict
+                Values of the indicators, recommendations, events and
+                simulations for the new entry, with the same column names from
+                the complete analysis.
+
+        """
+        averages = state["averages"]
+        close_previous = state["history"]["close"][-1]
+        change = close - close_previous
+
+        entry = {"Close Final": close,
+                 "Volume": volume,
+                 "Close Final Change": change}
+
+        # ----------------------------------------------------------------------
+        #   MACD
+        # ----------------------------------------------------------------------
+        for column, length in [("MACD EMA 12", C.MACD_LENGTH_FAST),
+                               ("MACD EMA 26", C.MACD_LENGTH_SLOW)]:
+            averages[column] = self.ema_step(averages[column], close,
+                                             alpha=2 / (length + 1))
+            entry[column] = averages[column]
+        entry["MACD Line"] = averages["MACD EMA 12"] - averages["MACD EMA 26"]
+        averages["MACD Signal"] = self.ema_step(averages["MACD Signal"],
+                                                entry["MACD Line"],
+                                                alpha=2 / (C.MACD_LENGTH_SIGNAL + 1))
+        entry["MACD Signal"] = averages["MACD Signal"]
+        entry["MACD Histogram"] = entry["MACD Line"] - entry["MACD Signal"]
+
+        # ----------------------------------------------------------------------
+        #   RSI (Wilder's smoothing and EMA of the same gains and losses)
+        # ----------------------------------------------------------------------
+        gain = max(change, 0.0)
+        loss = abs(min(change, 0.0))
+        for method, alpha in [("RSI SMA", 1 / C.RSI_LENGTH),
+                              ("RSI EMA", 2 / (C.RSI_LENGTH + 1))]:
+            averages[f"{method} Gain Average"] = self.ema_step(
+                averages[f"{method} Gain Average"], gain, alpha=alpha)
+            averages[f"{method} Loss Average"] = self.ema_step(
+                averages[f"{method} Loss Average"], loss, alpha=alpha)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rs = np.float64(averages[f"{method} Gain Average"]) / \
+                    np.float64(averages[f"{method} Loss Average"])
+            entry[f"{method} Gain Average"] = averages[f"{method} Gain Average"]
+            entry[f"{method} Loss Average"] = averages[f"{method} Loss Average"]
+            entry[f"{method} RS"] = float(rs)
+            entry[f"{method} RSI"] = float(100 - (100 / (1 + rs)))
+
+        # ----------------------------------------------------------------------
+        #   Bollinger Bands, over the last entries of the closing value.
+        # ----------------------------------------------------------------------
+        window = (state["history"]["close"] +
+                  [close])[-self.INCREMENTAL_WINDOW:]
+        entry["BBANDS SMA 20"] = float(np.mean(window))
+        entry["BBANDS StdDev 20"] = float(np.std(window, ddof=1))
+        entry["BBANDS Upper"] = entry["BBANDS SMA 20"] + \
+            (C.BBANDS_WIDTH * entry["BBANDS StdDev 20"])
+        entry["BBANDS Lower"] = entry["BBANDS SMA 20"] - \
+            (C.BBANDS_WIDTH * entry["BBANDS StdDev 20"])
+
+        # ----------------------------------------------------------------------
+        #   Recommendations. The Crash recommendation is defined for the
+        #   complete range by the complete analysis, so it is kept.
+        # ----------------------------------------------------------------------
+        criteria = {
+            "MACD": (entry["MACD Histogram"], C.MACD_THRESHOLD, C.MACD_THRESHOLD,
+                     ("BUY", "HOLD", "SELL")),
+            "RSI SMA": (entry["RSI SMA RSI"], C.RSI_THRESHOLD_UPPER, C.RSI_THRESHOLD_LOWER,
+                        ("SELL", "HOLD", "BUY")),
+            "RSI EMA": (entry["RSI EMA RSI"], C.RSI_THRESHOLD_UPPER, C.RSI_THRESHOLD_LOWER,
+                        ("SELL", "HOLD", "BUY")),
+            "BBANDS": (close, entry["BBANDS Upper"], entry["BBANDS Lower"],
+                       ("BUY", "HOLD", "SELL")),
+        }
+
+        codes = dict(state["recommendation"])
+        for method, (value, upper, lower, values) in criteria.items():
+            labels = {self.state_code(s, values): s for s in [1, 0, -1]}
+            threshold_state = self.threshold_step(labels[codes[method]],
+                                                  value, upper, lower)
+            codes[method] = self.state_code(threshold_state, values)
+
+        # ----------------------------------------------------------------------
+        #   Events and simulations
+        # ----------------------------------------------------------------------
+        state["reference"] = state["reference"] * \
+            (1 + ((close - close_previous) / close_previous))
+        if state["reference"] <= 0:
+            state["reference"] = 0
+
+        for method in self.INCREMENTAL_METHODS:
+            decision = [state["recommendation"][method], codes[method]]
+            event = int(self.transition_events(codes=decision)[-1])
+
+            balance = self.simulate_performance_array(
+                close=[close_previous, close],
+                decision=decision,
+                events=[state["events"][method][-1], event],
+                initial_value=self.initial_value,
+                stopgain=self.stopgain,
+                stoploss=self.stoploss,
+                operation_cost_fix=self.operation_cost_fix,
+                operation_cost_proportional=self.operation_cost_proportional,
+                operation_cost_min=self.operation_cost_min,
+                operation_cost_max=self.operation_cost_max,
+                tax_percentage=self.tax_percentage,
+                state=state["simulation"][method])
+
+            state["recommendation"][method] = codes[method]
+            state["events"][method] = [state["events"][method][-1], event]
+
+            entry[f"{method} Recommendation"] = self.convert_labels(
+                codes=np.array([codes[method]]))[0]
+            entry[f"{method} Recommended Events"] = self.convert_labels(
+                codes=np.array([event]))[0]
+            entry[f"{method} Simulation"] = balance[-1]
+            entry[f"{method} Simulation Reference"] = state["reference"]
+
+        # ----------------------------------------------------------------------
+        #   General parameters
+        # ----------------------------------------------------------------------
+        state["history"]["close"] = window
+        state["history"]["dates"] = (state["history"]["dates"] +
+                                     [str(date)])[-self.INCREMENTAL_WINDOW:]
+        state["data_length"] = state["data_length"] + 1
+        state["movement"]["up"] = state["movement"]["up"] + max(change, 0.0)
+        state["movement"]["down"] = state["movement"]["down"] + \
+            abs(min(change, 0.0))
+        if not np.isnan(volume):
+            state["volume"]["sum"] = state["volume"]["sum"] + volume
+            state["volume"]["count"] = state["volume"]["count"] + 1
+
+        return entry
+
+    def get_incremental_summary(self, state: dict):
+        """Fills the ``analysis_results`` from the state, with the same
+        information from ``Summary.get_summary``.
+        """
+        self.data_length = state["data_length"]
+        self.up_movement = state["movement"]["up"] / self.data_length
+        self.down_movement = state["movement"]["down"] / self.data_length
+        self.ratio_up_down = self.up_movement / self.down_movement
+
+        last_date = pd.Timestamp(state["history"]["dates"][-1])
+        forecast_dates = pd.to_datetime(state["forecast"]["dates"])
+        remaining = forecast_dates > last_date
+
+        for method in self.INCREMENTAL_METHODS:
+            previous_event, last_event = self.convert_labels(
+                codes=np.array(state["events"][method]))
+
+            forecast = pd.DataFrame(
+                {f"{method} Recommended Events": state["forecast"][method]},
+                index=forecast_dates)[remaining]
+            day_next_event, next_event = self.day_next_event(
+                dataframe=forecast, method_name=method, last_event=last_event)
+
+            last_value = state["simulation"][method]["total_balance"]
+            last_value_ref = state["reference"]
+            start_value = self.initial_value
+
+            self.analysis_results[method] = {}
+            self.analysis_results[method]["Last Day Event"] = last_event
+            self.analysis_results[method]["Previous Day Event"] = previous_event
+            self.analysis_results[method]["Next Event"] = next_event
+            self.analysis_results[method]["Day Next Event"] = day_next_event
+            self.analysis_results[method]["Analysis length"] = self.data_length
+            self.analysis_results[method]["Average Volume"] = state["volume"]["sum"] / \
+                state["volume"]["count"]
+            self.analysis_results[method]["Up Movement"] = self.up_movement
+            self.analysis_results[method]["Down Movement"] = self.down_movement
+            self.analysis_results[method]["Ratio Movement"] = self.ratio_up_down
+            self.analysis_results[method]["Relative gain"] = (
+                last_value - start_value) / start_value
+            self.analysis_results[method]["Relative gain reference"] = (
+                last_value_ref - start_value) / start_value
+            self.analysis_results[method]["Relative gain comparison"] = (
+                last_value - last_value_ref) / last_value_ref
+
+    def analyze_incremental(self, new_rows: pd.DataFrame = None):
+        """Performs the analysis updating the stored state with the new entries
+        only. A complete analysis (``analyze``) is done instead if the state
+        can't be used, so the dataframe passed to the ``Analysis`` must still
+        contain the complete history.
+
+        Parameters
+        ----------
+            new_rows: Pandas dataframe, optional
+                New entries for the symbol. If not passed, the entries from
+                ``ohlc_dataset`` after the last entry in the state are used.
+
+        Returns
+        -------
+            decision: `string`
+                Final outcome of the analysis.
+            analysis_results: `dictionary`
+                Summary from the results from the ticker.
+            ohlc_dataset: `Pandas Dataframe`
+                Dataframe with the analysis of the new entries only, or the
+                complete one in case of a complete analysis.
+
+        """
+        state = self.load_incremental_state()
+
+        new_entries = None
+        if state is not None:
+            if new_rows is None:
+                new_rows = self.ohlc_dataset
+            new_entries = self.select_new_entries(dataframe=new_rows,
+                                                  state=state)
+            if new_entries is None:
+                self.logger.info("History of %s was revised", self.symbol)
+
+        if new_entries is not None and len(new_entries) > 0:
+            forecast_end = pd.Timestamp(state["forecast"]["dates"][-1])
+            if new_entries.index[-1] >= forecast_end:
+                self.logger.info("Prediction range for %s is exhausted",
+                                 self.symbol)
+                new_entries = None
+
+        # ----------------------------------------------------------------------
+        #   Complete analysis, storing the new state.
+        # ----------------------------------------------------------------------
+        if new_entries is None:
+            result = self.analyze()
+            self.save_incremental_state(state=self.build_incremental_state())
+            return result
+
+        # ----------------------------------------------------------------------
+        #   Incremental update
+        # ----------------------------------------------------------------------
+        self.logger.info("Performing incremental analysis for %s with %s new entries",
+                         self.symbol, len(new_entries))
+
+        entries = []
+        for index, row in new_entries.iterrows():
+            entries.append(self.update_incremental_state(
+                state=state,
+                date=index,
+                close=float(row["Close Final"]),
+                volume=float(row.get("Volume", np.nan))))
+
+        if len(entries) > 0:
+            self.ohlc_dataset = pd.DataFrame(entries, index=new_entries.index)
+        else:
+            self.ohlc_dataset = pd.DataFrame(
+                {f"{method} Recommendation": self.convert_labels(
+                    codes=np.array([state["recommendation"][method]]))
+                 for method in self.INCREMENTAL_METHODS},
+                index=pd.to_datetime(state["history"]["dates"][-1:]))
+        self.ohlc_dataset["Data Type"] = "Real data"
+
+        self.get_incremental_summary(state=state)
+        self.decision = self.arbitrate()
+
+        self.save_incremental_state(state=state)
+
+        return (self.decision, self.analysis_results, self.ohlc_dataset)
@@ -1,6 +1,7 @@
 """Calculates the recommendation for buy/sell based on the Bollinger Bands
 strategy.
 """
+from src.lib import constants as C
 from src.lib.analysis.basic import Basic
 from src.lib.analysis.arbitration import Arbitration
 from src.lib.analysis.report_analysis import ReportAnalysis
@@ -10,7 +11,7 @@ from src.lib.analysis.summary import Summary
 
 class BOLLINGER_BANDS (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summary):
 
-    def calc_BBANDS(self):
+    def calc_BBANDS(self, precalculated: bool = False):
         """Calculate de Bollinger Bands indicator, which is based on first
         taking the closure value and calculating the 20 last entries moving
         average (simple):
@@ -49,12 +50,11 @@ class BOLLINGER_BANDS (Basic, Arbitration, PerformanceSimulation, ReportAnalysis
 
         Parameters
         ----------
-            None
-                The input for the calculation is based on the Pandas dataframe
-                data which is already available. The expected column for
-                this operation is:
-
-                #. `Close Final`
+            precalculated: bool, optional
+                If ``True``, the bands and the recommendation are already
+                available in the dataframe (e.g. calculated by the
+                ``PanelAnalysis``), so only the events, simulation and summary
+                are calculated.
 
         Returns
         -------
@@ -84,28 +84,29 @@ class BOLLINGER_BANDS (Basic, Arbitration, PerformanceSimulation, ReportAnalysis
         self.logger.info(
             "Performing Bollinger Bands analysis for %s", self.symbol)
 
-        self.calc_SMA(dataframe=self.ohlc_dataset,
-                      source_column="Close Final",
-                      length=20,
-                      result_column="BBANDS SMA 20")
-
-        self.calc_MovingStdDev(dataframe=self.ohlc_dataset,
-                               source_column="Close Final",
-                               length=20,
-                               result_column="BBANDS StdDev 20")
-
-        self.ohlc_dataset.loc[:,
-                              "BBANDS Upper"] = self.ohlc_dataset["BBANDS SMA 20"] + (2 * self.ohlc_dataset["BBANDS StdDev 20"])
-
-        self.ohlc_dataset.loc[:,
-                              "BBANDS Lower"] = self.ohlc_dataset["BBANDS SMA 20"] - (2 * self.ohlc_dataset["BBANDS StdDev 20"])
-
-        self.recommend_threshold_curve(source_column="Close Final",
-                                       reference_column_upper="BBANDS Upper",
-                                       reference_column_lower="BBANDS Lower",
-                                       values_upper_mid_lower=(
-                                           "BUY", "HOLD", "SELL"),
-                                       result_column="BBANDS Recommendation")
+        if not precalculated:
+            self.calc_SMA(dataframe=self.ohlc_dataset,
+                          source_column="Close Final",
+                          length=C.BBANDS_LENGTH,
+                          result_column="BBANDS SMA 20")
+
+            self.calc_MovingStdDev(dataframe=self.ohlc_dataset,
+                                   source_column="Close Final",
+                                   length=C.BBANDS_LENGTH,
+                                   result_column="BBANDS StdDev 20")
+
+            self.ohlc_dataset.loc[:,
+                                  "BBANDS Upper"] = self.ohlc_dataset["BBANDS SMA 20"] + (C.BBANDS_WIDTH * self.ohlc_dataset["BBANDS StdDev 20"])
+
+            self.ohlc_dataset.loc[:,
+                                  "BBANDS Lower"] = self.ohlc_dataset["BBANDS SMA 20"] - (C.BBANDS_WIDTH * self.ohlc_dataset["BBANDS StdDev 20"])
+
+            self.recommend_threshold_curve(source_column="Close Final",
+                                           reference_column_upper="BBANDS Upper",
+                                           reference_column_lower="BBANDS Lower",
+                                           values_upper_mid_lower=(
+                                               "BUY", "HOLD", "SELL"),
+                                           result_column="BBANDS Recommendation")
 
         self.define_actions(source_column="BBANDS Recommendation",
                             result_column="BBANDS Recommended Events")
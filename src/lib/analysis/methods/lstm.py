@@ -7,29 +7,24 @@
 
 """
 from datetime import datetime, timezone
-from deepdiff import DeepDiff
 from src.lib.analysis.basic import Basic
+from src.lib.analysis.sequences import Sequences
+from src.lib.analysis.model_registry import get_model_registry, SHARED_SYMBOL
+from src.lib.analysis.numpy_lstm import NumpyLSTM, export_keras_model
+from src.lib.analysis.windows import Windows
+from src.lib.analysis.forecasters import get_forecaster
 import json
-import matplotlib.pyplot as plt
 from pathlib import Path
+import time
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow import keras
-from keras.models import Sequential
-from keras.layers import LSTM as KerasLSTM
-from keras.layers import Dropout
-from keras.layers import Dense
-from keras.layers import RepeatVector
-from keras.layers import TimeDistributed
-from keras.layers import Activation
 # import os
 # os.environ["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
 # os.environ["CUDA_VISIBLE_DEVICES"] = ""
 # os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
 
-class LSTM (Basic):
+class LSTM (Basic, Sequences):
 
     def calc_LSTM(self,
                   dataframe: pd.DataFrame,
@@ -62,6 +57,13 @@ class LSTM (Basic):
            tensor will be (N-L-1, L, 1). Note that the `N-L-1` is due to the
            previous operation of structuring the data.
 
+        With ``lstm_shared_model`` enabled, the prediction comes from the model
+        shared by all the symbols (see ``SharedLSTM``), which is only trained
+        by the training worker. With the ``forecaster`` parameter different
+        from ``lstm``, the LSTM is replaced by one of the statistical
+        forecasters (see ``create_forecaster``), with the same steps for the
+        data.
+
         Parameters
         ----------
             sequence_length: int
@@ -80,19 +82,91 @@ class LSTM (Basic):
                 for training.
 
         """
-        number_blocks = self.config.lstm_number_blocks
-        number_features = self.config.lstm_number_features
-        hidden_neurons = self.config.lstm_hidden_neurons
-        epochs = self.config.lstm_epochs
-        normalization_range = (
-            self.config.lstm_normalization_lower, self.config.lstm_normalization_upper)
-
         self.logger.info(
             "Performing LSTM analysis for %s for source %s", self.symbol, source_column)
 
         if result_column == "":
             result_column = f"LSTM {sequence_length} {prediction_length} {source_column}"
 
+        lstm_data = self.prepare_LSTM(dataframe=dataframe,
+                                      source_column=source_column,
+                                      sequence_length=sequence_length,
+                                      prediction_length=prediction_length,
+                                      ratio_train=ratio_train)
+
+        # ----------------------------------------------------------------------
+        #   Makes the model: the LSTM or one of the statistical forecasters.
+        # ----------------------------------------------------------------------
+        shared = self.config.lstm_shared_model
+        if self.config.forecaster != "lstm":
+            model = self.create_forecaster(X=lstm_data["x_train"],
+                                           Y=lstm_data["y_train"],
+                                           source_column=source_column)
+        else:
+            model = self.create_lstm_model(
+                X=lstm_data["x_train"],
+                Y=lstm_data["y_train"],
+                number_blocks=self.config.lstm_number_blocks,
+                epochs=self.config.lstm_epochs,
+                sequence_length=sequence_length,
+                prediction_length=prediction_length,
+                number_features=self.config.lstm_number_features,
+                hidden_neurons=self.config.lstm_hidden_neurons,
+                save_model=True,
+                source_column=source_column,
+                sample_dates=lstm_data["sample_dates"],
+                train=self.lstm_train and not shared,
+                symbol=SHARED_SYMBOL if shared else None
+            )
+
+        # ----------------------------------------------------------------------
+        #   Without a model (not trained yet by the training worker), there is
+        #   no prediction: the prediction entries are kept empty.
+        # ----------------------------------------------------------------------
+        if model is None:
+            self.clear_LSTM(dataframe=dataframe,
+                            source_column=source_column,
+                            result_column=result_column)
+            return
+
+        train_predict = model.predict(lstm_data["x_train"])
+        test_predict = model.predict(lstm_data["x_test"])
+
+        self.store_LSTM(dataframe=dataframe,
+                        lstm_data=lstm_data,
+                        train_predict=train_predict,
+                        test_predict=test_predict,
+                        source_column=source_column,
+                        extend_original_data=extend_original_data,
+                        result_column=result_column,
+                        verbose=verbose)
+
+    def prepare_LSTM(self,
+                     dataframe: pd.DataFrame,
+                     source_column: str,
+                     sequence_length: int,
+                     prediction_length: int = 1,
+                     ratio_train: float = -1.0):
+        """Prepares the data of the symbol for the LSTM (steps 1 to 5 from
+        ``calc_LSTM``): normalization with its own scaler, split and
+        sequences for the training and the prediction.
+
+        Returns
+        -------
+            lstm_data: dict
+                Dictionary with the sequences (``x_train``, ``y_train``,
+                ``x_test`` and ``y_test``, already reshaped for the LSTM), the
+                date of the last label of each training sample
+                (``sample_dates``), the scaler and the data used to write the
+                results back (see ``store_LSTM``).
+
+        """
+        from sklearn.preprocessing import MinMaxScaler
+
+        number_features = self.config.lstm_number_features
+        normalization_range = (
+            self.config.lstm_normalization_lower, self.config.lstm_normalization_upper)
+
         # ----------------------------------------------------------------------
         #   Get the data for analysis and adapt to the proper format.
         # ----------------------------------------------------------------------
@@ -142,35 +216,64 @@ class LSTM (Basic):
             output_sequence_length=prediction_length)
 
         if x_train is not None:
-            x_train_reshaped = x_train.reshape(
+            x_train = x_train.reshape(
                 x_train.shape[0], x_train.shape[1], number_features)
-        else:
-            x_train_reshaped = None
 
         if x_test is not None:
-            x_test_reshaped = x_test.reshape(
+            x_test = x_test.reshape(
                 x_test.shape[0], x_test.shape[1], number_features)
-        else:
-            x_test_reshaped = None
 
-        # ----------------------------------------------------------------------
-        #   Makes the model
-        # ----------------------------------------------------------------------
-        model = self.create_lstm_model(
-            X=x_train_reshaped,
-            Y=y_train,
-            number_blocks=number_blocks,
-            epochs=epochs,
-            sequence_length=sequence_length,
-            prediction_length=prediction_length,
-            number_features=number_features,
-            hidden_neurons=hidden_neurons,
-            save_model=True,
-            source_column=source_column
-        )
+        return {"x_train": x_train,
+                "y_train": y_train,
+                "x_test": x_test,
+                "y_test": y_test,
+                "sample_dates": train_data_index[
+                    sequence_length + prediction_length - 1:][:len(x_train)],
+                "scaler": scaler,
+                "sequence_length": sequence_length,
+                "prediction_length": prediction_length,
+                "ratio_train": ratio_train,
+                "index": index,
+                "new_index": new_index,
+                "data_vector": data_vector,
+                "train_data_normalized": train_data_normalized,
+                "test_data_normalized": test_data_normalized,
+                "train_data_absolute": train_data_absolute,
+                "test_data_absolute": test_data_absolute,
+                "train_data_index": train_data_index,
+                "test_data_index": test_data_index}
+
+    def clear_LSTM(self, dataframe: pd.DataFrame, source_column: str, result_column: str):
+        """Keeps the prediction entries empty, when no model is available."""
+        dataframe.loc[dataframe["Data Type"]
+                      == "Prediction data", source_column] = np.nan
+        dataframe.loc[:, result_column] = np.nan
+        self.ohlc_dataset_prediction[source_column] = np.nan
+
+    def store_LSTM(self,
+                   dataframe: pd.DataFrame,
+                   lstm_data: dict,
+                   train_predict: np.ndarray,
+                   test_predict: np.ndarray,
+                   source_column: str,
+                   extend_original_data: bool = True,
+                   result_column: str = "",
+                   verbose: bool = False):
+        """Squashes the output from the model, reverts the normalization and
+        writes the results into the dataframe.
 
-        train_predict = model.predict(x_train_reshaped)
-        test_predict = model.predict(x_test_reshaped)
+        Parameters
+        ----------
+            lstm_data: dict
+                Data of the symbol, from ``prepare_LSTM``.
+            train_predict: np.ndarray
+                Output from the model for the training sequences.
+            test_predict: np.ndarray
+                Output from the model for the prediction sequences.
+
+        """
+        scaler = lstm_data["scaler"]
+        sequence_length = lstm_data["sequence_length"]
 
         train_predict = self.squash_output(data=train_predict, mode="last")
         test_predict = self.squash_output(data=test_predict, mode="last")
@@ -204,6 +307,16 @@ class LSTM (Basic):
         #   Plot and print some data for debugging reasons.
         # ----------------------------------------------------------------------
         if verbose:
+            import matplotlib.pyplot as plt
+
+            index = lstm_data["index"]
+            new_index = lstm_data["new_index"]
+            data_vector = lstm_data["data_vector"]
+            train_data_index = lstm_data["train_data_index"]
+            test_data_index = lstm_data["test_data_index"]
+            train_data_absolute = lstm_data["train_data_absolute"]
+            test_data_absolute = lstm_data["test_data_absolute"]
+
             train_data_index_redux = train_data_index[(
                 sequence_length):]
             test_data_index_redux = test_data_index[(
@@ -225,7 +338,7 @@ class LSTM (Basic):
                      # marker=".",
                      # markersize=8,
                      linewidth=2, label='Predicted Train')
-            if 0 <= ratio_train <= 1:
+            if 0 <= lstm_data["ratio_train"] <= 1:
                 plt.plot(test_data_index_redux[0], test_predict[0],
                          "-r", linewidth=2,
                          label='Predicted Test')
@@ -239,21 +352,21 @@ class LSTM (Basic):
             plt.show()
 
             print("===============================================================")
-            print(f"Size original data:      {len(data)}")
+            print(f"Size original data:      {len(data_vector)}")
             print(f"Size original index:     {len(index)}")
             print(f"Size added index:        {len(new_index)}")
             print(f"Sequence length:         {sequence_length}")
-            print(f"Prediction length:       {prediction_length}")
-            print(f"Shape normalized train:  {train_data_normalized.shape}")
-            print(f"Shape normalized test:   {test_data_normalized.shape}")
+            print(f"Prediction length:       {lstm_data['prediction_length']}")
+            print(f"Shape normalized train:  {lstm_data['train_data_normalized'].shape}")
+            print(f"Shape normalized test:   {lstm_data['test_data_normalized'].shape}")
             print(f"Shape absolute train:    {train_data_absolute.shape}")
             print(f"Shape absolute test:     {test_data_absolute.shape}")
             print(f"Shape index train:       {train_data_index.shape}")
             print(f"Shape index train:       {test_data_index.shape}")
-            print(f"Shape X train:           {x_train.shape}")
-            print(f"Shape Y train:           {y_train.shape}")
-            print(f"Shape X test:            {x_test.shape}")
-            print(f"Shape Y test:            {y_test.shape}")
+            print(f"Shape X train:           {lstm_data['x_train'].shape}")
+            print(f"Shape Y train:           {lstm_data['y_train'].shape}")
+            print(f"Shape X test:            {lstm_data['x_test'].shape}")
+            print(f"Shape Y test:            {lstm_data['y_test'].shape}")
             print(f"Shape index test:        {test_data_index.shape}")
             print(f"Shape predicted train:   {train_predict.shape}")
             print(f"Shape predicted test:    {test_predict.shape}")
@@ -261,115 +374,6 @@ class LSTM (Basic):
             print(f"Plot Y:                  {len(train_predict[0])}")
             print("===============================================================")
 
-    def create_dataset(self, dataset, input_sequence_length: int = 1, output_sequence_length: int = 1, shift_future: int = 0):
-        """Structures the data into sequences and labels for the learning. It's
-        done by breaking the data into sub-sequences and pairing to the
-        respective label (sequence or single value).
-
-        For example, in the case the predicted sequence has length one, a
-        dataset of `N` entries:
-
-        .. math::
-
-            \\text{Seq}_{N} = [x_{1}, x_{2}, x_{3}, x_{4}, \\ldots, x_{N}]
-
-        a sub-sequence of size `L` (where :math:`L < N`) to predict the next
-        point after the sequence, it would be defined as:
-
-        .. math::
-
-            \\text{SubSeq}_{i, L} = [x_{i}, x_{i+1}, x_{i+2}, \\ldots, x_{i+L}] \\rightarrow \\text{Predict: } x_{i+L+1}
-
-        As a numeric example, given :math:`\\text{Seq}` with 6 samples:
-
-        .. math::
-
-            \\text{Seq}_{6} = [x_{1}, x_{2}, x_{3}, x_{4}, x_{5}, x_{6}]
-
-        and using 3 samples to predict the next one, so the parameter
-        ``time_step`` is equal to 3:
-
-        .. math::
-
-            \\text{SubSeq}_{1, 3} = \\left[ x_{1}, x_{2}, x_{3} \\right] \\rightarrow \\text{Predict: } x_{4}
-
-            \\text{SubSeq}_{2, 3} = \\left[ x_{2}, x_{3}, x_{4} \\right] \\rightarrow \\text{Predict: } x_{5}
-
-            \\text{SubSeq}_{3, 3} = \\left[ x_{3}, x_{4}, x_{5} \\right] \\rightarrow \\text{Predict: } x_{6}
-
-        Example (predicted length greater than one):
-
-        .. image:: _static/images/drawing_lstm_structure.png
-            :width: 600
-            :align: center
-            :alt: Example of data structure
-
-        Parameters
-        ----------
-            dataset: data
-                Name of the column in the Pandas Dataframe to be used for the
-                calculation of the moving average.
-            input_sequence_length: integer, optional
-                Length of the sequences.
-            output_sequence_length: integer, optional
-                Length of the sequences.
-            shift_future: integer, optional
-                Length of the sequences.
-
-        Returns
-        -------
-            sequences: Numpy array
-                Array of sequence arrays paired to the labels.
-            labels: Numpy array
-                Array of labels paired to the sequence arrays.
-
-        """
-        dataX = []
-        dataY = []
-
-        # input_sequence_length = 5
-        # output_sequence_length = 5
-        # dataset = dataset[:11]
-
-        # print("---------------------------------------------------------------")
-        # print(f"Input length:        {dataset.shape}")
-        # print(f"Input seq length:    {input_sequence_length}")
-        # print(f"Output seq length:   {output_sequence_length}")
-        # print(f"Shift future:        {shift_future}")
-
-        if input_sequence_length == len(dataset):
-            # print("Same size")
-            dataX = dataset
-            dataY = []
-            dataX = [dataX]
-        else:
-            # print("Different size")
-            # print(dataset.flatten())
-            for i in range(len(dataset)-input_sequence_length-output_sequence_length + 1):
-
-                subsequence = dataset[
-                    (i): (i + input_sequence_length)]
-
-                start_label = i + input_sequence_length + shift_future
-                label = dataset[
-                    (start_label): (start_label + output_sequence_length)]
-
-                if output_sequence_length == 1:
-                    label = label[0]
-
-                # print(
-                #     f"SEQ: {i} {'        ' * i} {subsequence.flatten()}  --> {label.flatten()}")
-                # # print(f"LAB  {'      ' * i} {label.flatten()}")
-
-                dataX.append(subsequence)
-                dataY.append(label)
-
-        # print(f"Data X length:        {len(dataX)}")
-        # print(f"Data Y length:        {len(dataY)}")
-        # print("---------------------------------------------------------------")
-
-        return np.array(dataX), np.array(dataY)
-
     def create_lstm_model(self, X, Y,
                           number_blocks: int,
                           epochs: int,
@@ -378,7 +382,10 @@ class LSTM (Basic):
                           number_features: int,
                           hidden_neurons: int = 100,
                           save_model: bool = True,
-                          source_column: str = ""):
+                          source_column: str = "",
+                          sample_dates: np.ndarray = None,
+                          train: bool = True,
+                          symbol: str = None):
         """Creates the LSTM model. The architecture can be different, depending
         on the inputs from the method. Basically 3 designs are possible:
 
@@ -400,40 +407,141 @@ class LSTM (Basic):
         To optimize operation, the method will store the model after calculation
         in case the parameter ``save_model`` is enabled (``true``). Also in
         case this parameter is enabled, before starting a new run, it tries to
-        load the stored model.
+        use the model kept in memory (see ``ModelRegistry``) or to load the
+        stored model. A model is only reused if the hash of the analysis
+        parameters matches the one used to create it.
+
+        A stored model older than ``lstm_model_age`` is not trained from
+        scratch: its weights are fine-tuned with the samples added since the
+        last fit (see ``finetune_lstm_model``). The complete training is only
+        done when the parameters change, or when the loss over the most recent
+        samples, which are held out of the training and of the fine-tuning,
+        degrades after the fine-tuning.
+
+        Together with the Keras model, its weights are exported to
+        ``model.npz``. When a stored model is only used for the prediction, it
+        is loaded from this file as a ``NumpyLSTM`` (if ``lstm_numpy_inference``
+        is enabled), so TensorFlow is only imported to train the models.
+
+        Parameters
+        ----------
+            X: np.ndarray or Windows
+                Training sequences, or the samples as ``Windows`` (e.g. pooled
+                from several symbols), with ``Y`` as ``None``.
+            sample_dates: np.ndarray, optional
+                Date of the last label of each sample in ``X``, used to select
+                the samples added since the last fit. Without it, the stored
+                model is not fine-tuned.
+            train: bool, optional
+                If ``False``, only a model in memory or stored (created with the
+                same parameters, regardless of its age) is used, and ``None``
+                is returned when there is none. The models are then trained by
+                the training worker (``automation/train_models.py``).
+            symbol: str, optional
+                Symbol used to name the model, if different from the one of
+                the analysis (e.g. ``SHARED_SYMBOL`` for the model shared by
+                all the symbols).
+
+        Returns
+        -------
+            model: Keras model or NumpyLSTM
+                Model for the prediction, or ``None``.
 
         """
-        model_name = f"{source_column}_{self.symbol}"
+        symbol = symbol or self.symbol
+        model_name = f"{source_column}_{symbol}"
         model_path = Path(f"models/lstm_{model_name}/model/")
+        weights_path = Path(f"models/lstm_{model_name}/model.npz")
         parameters_path = Path(f"models/lstm_{model_name}/parameters.json")
+        hash_path = Path(f"models/lstm_{model_name}/parameters.hash")
+        training_path = Path(f"models/lstm_{model_name}/training.json")
 
-        if model_path.exists() and parameters_path.exists() and save_model:
+        registry = get_model_registry(capacity=self.config.lstm_model_cache_size)
+        model_hash = registry.parameters_hash(symbol=symbol,
+                                              source_column=source_column,
+                                              parameters=self.config.parameters["analysis"])
 
-            last_change = parameters_path.stat().st_mtime
+        if save_model:
 
-            last_change = datetime.fromtimestamp(
-                last_change)  # , tz=timezone.utc)
+            # ------------------------------------------------------------------
+            #   Model already in memory.
+            # ------------------------------------------------------------------
+            model = registry.get(name=model_name,
+                                 model_hash=model_hash,
+                                 max_age=self.config.lstm_model_age if train else None)
+            if model is not None:
+                self.logger.info("Using the model in memory for LSTM.")
+                self.record_lstm_training(source_column, "Memory")
+                return model
 
-            time_difference = (datetime.today() - last_change).days
+            # ------------------------------------------------------------------
+            #   Model stored in the disk, created with the same parameters.
+            # ------------------------------------------------------------------
+            if model_path.exists() and hash_path.exists():
 
-            if time_difference < self.config.lstm_model_age:
+                last_change = datetime.fromtimestamp(
+                    hash_path.stat().st_mtime)  # , tz=timezone.utc)
 
-                with open(parameters_path) as json_file:
-                    stored_parameters = json.load(json_file)
+                time_difference = (datetime.today() - last_change).days
 
-                diff_param = DeepDiff(stored_parameters,
-                                      self.config.parameters["analysis"],
-                                      ignore_string_case=True)
+                same_parameters = hash_path.read_text().strip() == model_hash
 
-                if len(diff_param) == 0:
+                if same_parameters and (time_difference < self.config.lstm_model_age
+                                        or not train):
 
                     self.logger.info("Using the stored model for LSTM.")
-                    model = keras.models.load_model(model_path)
+                    model = self.load_lstm_model(model_path=model_path,
+                                                 weights_path=weights_path)
+                    registry.put(name=model_name, model_hash=model_hash,
+                                 model=model, created=last_change)
+                    self.record_lstm_training(source_column, "Stored")
 
                     return model
 
+                # --------------------------------------------------------------
+                #   Model too old, but created with the same parameters: the
+                #   weights are fine-tuned with the new samples.
+                # --------------------------------------------------------------
+                if (same_parameters and train and self.config.lstm_finetune and
+                        sample_dates is not None and training_path.exists()):
+
+                    from tensorflow import keras
+
+                    with open(training_path) as json_file:
+                        training = json.load(json_file)
+
+                    model = self.finetune_lstm_model(
+                        model=keras.models.load_model(model_path),
+                        X=X, Y=Y, sample_dates=sample_dates, training=training,
+                        source_column=source_column)
+
+                    if model is not None:
+                        model.save(model_path)
+                        export_keras_model(model=model, path=weights_path)
+                        with open(training_path, 'w') as fp:
+                            json.dump(training, fp, indent=4)
+                        hash_path.write_text(model_hash)
+                        registry.put(name=model_name, model_hash=model_hash,
+                                     model=model)
+
+                        return model
+
+        if not train:
+            self.logger.info("No model available for LSTM.")
+            self.record_lstm_training(source_column, "Missing")
+            return None
+
         self.logger.info("Creating a new model for LSTM.")
 
+        from tensorflow import keras
+        from keras.models import Sequential
+        from keras.layers import LSTM as KerasLSTM
+        from keras.layers import Dropout
+        from keras.layers import Dense
+        from keras.layers import RepeatVector
+        from keras.layers import TimeDistributed
+        from keras.layers import Activation
+
         # ------------------------------------------------------------------
         #   LSTM many to many with different sizes.
         # ------------------------------------------------------------------
@@ -504,107 +612,330 @@ class LSTM (Basic):
             model.add(Dense(units=1))
 
         model.compile(loss='mean_squared_error', optimizer='adam')
-        model.fit(X, Y, epochs=epochs, verbose=0)
+
+        # ----------------------------------------------------------------------
+        #   Early stopping based on the loss of the most recent samples, which
+        #   are held for validation (or on the training loss, without them).
+        # ----------------------------------------------------------------------
+        validation_split = self.config.lstm_validation_split
+        callbacks = []
+        # ----------------------------------------------------------------------
+        #   When the model is stored, the most recent samples are held out of
+        #   the training, and their loss is kept as the reference for the
+        #   fine-tuning (see ``finetune_lstm_model``).
+        # ----------------------------------------------------------------------
+        fit_X, fit_Y = X, Y
+        if save_model:
+            windows = self.lstm_windows(X, Y)
+            recent = self.recent_samples(len(windows))
+            fit_X, fit_Y = windows.subset(~recent), None
+
+        if self.config.lstm_early_stopping_patience > 0:
+            callbacks.append(keras.callbacks.EarlyStopping(
+                monitor="val_loss" if validation_split > 0 else "loss",
+                patience=self.config.lstm_early_stopping_patience,
+                min_delta=self.config.lstm_early_stopping_min_delta,
+                restore_best_weights=True))
+
+        epochs_used, duration = self.fit_lstm_model(model=model, X=fit_X, Y=fit_Y,
+                                                    epochs=epochs,
+                                                    callbacks=callbacks,
+                                                    validation_split=validation_split)
+        self.record_lstm_training(source_column, "New", epochs_used, duration)
 
         if save_model:
             self.logger.info("Saving the model for LSTM.")
             model.save(model_path)
+            export_keras_model(model=model, path=weights_path)
 
             with open(parameters_path, 'w') as fp:
                 json.dump(self.config.parameters["analysis"], fp,  indent=4)
+            hash_path.write_text(model_hash)
+
+            training = {"full_fit": datetime.today().isoformat(),
+                        "fine_tunes": 0,
+                        "recent_loss": self.recent_loss(model=model,
+                                                        windows=windows.subset(recent))}
+            if sample_dates is not None and (~recent).any():
+                training["last_date"] = str(np.max(sample_dates[~recent]))
+            with open(training_path, 'w') as fp:
+                json.dump(training, fp, indent=4)
+
+            registry.put(name=model_name, model_hash=model_hash, model=model)
 
         return model
 
-    def squash_output(self, data, mode: str = "average"):
-        """Combines the overlapping results from the steps into a single
-        sequence of values. The combination can be done by different methods:
+    def load_lstm_model(self, model_path: Path, weights_path: Path):
+        """Loads a stored model for the prediction: from the exported weights
+        as a ``NumpyLSTM``, without importing TensorFlow, or as a Keras model
+        if the weights weren't exported yet (models from previous versions) or
+        ``lstm_numpy_inference`` is disabled.
+
+        Parameters
+        ----------
+            model_path: Path
+                Location of the Keras model.
+            weights_path: Path
+                Location of the exported weights (``.npz``).
+
+        Returns
+        -------
+            model: NumpyLSTM or Keras model
+                Model for the prediction.
 
-        1. Average.
-        2. Last.
-        3. First.
-        4. Weighted average (linear weigths, with highest weight to the last
-           value).
+        """
+        if self.config.lstm_numpy_inference and weights_path.exists():
+            return NumpyLSTM.from_npz(weights_path)
 
-        The squashing is the reverse operation from the ``create_dataset``
-        method. To illustrate it, an example of a 7 elements is presented below:
+        from tensorflow import keras
 
-        .. image:: _static/images/drawing_lstm_squash.png
-            :width: 600
-            :align: center
-            :alt: Example of data squashing
+        model = keras.models.load_model(model_path)
+        if self.config.lstm_numpy_inference:
+            export_keras_model(model=model, path=weights_path)
 
-        Incide each cell (value), the index is written, so first the data
-        element index and then the index inside this vector. The last value is
-        always 0, since we have here only 2 dimensions.
+        return model
 
-        The operation is done by a more simple iteration. To represent it, the
-        same data is represented below, just rearranging it. The colors are used
-        to indicate the tracking of the "movement":
+    def create_forecaster(self, X, Y, source_column: str = ""):
+        """Fits the statistical forecaster selected by the ``forecaster``
+        parameter (see ``src.lib.analysis.forecasters``), which is used as the
+        model in ``calc_LSTM``. The fit is done for every analysis, since it
+        takes only milliseconds.
 
-        .. image:: _static/images/drawing_lstm_rearrange.png
-            :width: 600
-            :align: center
-            :alt: Example of rearrangement
+        Returns
+        -------
+            model: Forecaster
+                Fitted forecaster, with the same ``predict`` from the Keras
+                models.
 
-        The important point is to note that **each level has an unique sum of
-        the indexes**, so the first anti-diagonal cut is denoted by sum 0,
-        the second anti-diagonal cut by sum equal to 1, and so one.
+        """
+        self.logger.info("Fitting the %s forecaster.", self.config.forecaster)
 
-        A second note is that the initial part and final part of the squashing
-        have less elements to be used.
+        start = time.perf_counter()
+        model = get_forecaster(self.config.forecaster).fit(X, Y)
+        self.record_lstm_training(source_column, model.name.upper(), 0,
+                                  time.perf_counter() - start)
+
+        return model
+
+    def fit_lstm_model(self, model, X, Y, epochs: int, callbacks: list = None,
+                       validation_split: float = 0.0):
+        """Trains the model with the batch size from the parameters, limited
+        by the training budget (``lstm_training_budget`` seconds).
+
+        With ``lstm_stream_training`` enabled, the batches are built on the fly
+        from the samples (see ``stream_dataset``), so the memory used by the
+        training is bounded by the batch size. Otherwise all the samples are
+        copied into the arrays passed to Keras.
 
         Parameters
         ----------
-            data: np.array
-                Data to be squashed.
-            mode: string, optional
-                The method to be used for the combination of the values. The
-                possible methods are:
+            X: np.ndarray or Windows
+                Training sequences, or the samples as ``Windows`` (and ``Y``
+                is not used).
+            Y: np.ndarray
+                Training labels.
 
-                * ``average``
-                * ``last``
-                * ``first``
-                * ``weighted-average``
+        Returns
+        -------
+            epochs_used: int
+                Number of epochs effectively trained.
+            duration: float
+                Duration of the training, in seconds.
+
+        """
+        from src.lib.analysis.callbacks import TrainingBudget
+
+        callbacks = list(callbacks) if callbacks is not None else []
+        if self.config.lstm_training_budget > 0:
+            callbacks.append(TrainingBudget(self.config.lstm_training_budget))
+
+        start = time.perf_counter()
+        if self.config.lstm_stream_training:
+            windows = self.lstm_windows(X, Y)
+            validation = None
+            if validation_split > 0:
+                windows, validation = windows.split(validation_split)
+
+            history = model.fit(self.stream_dataset(windows, shuffle=True),
+                                validation_data=(self.stream_dataset(validation)
+                                                 if validation else None),
+                                epochs=epochs,
+                                callbacks=callbacks,
+                                verbose=0)
+        else:
+            if isinstance(X, Windows):
+                X, Y = X.take()
+
+            history = model.fit(X, Y,
+                                epochs=epochs,
+                                batch_size=self.config.lstm_batch_size,
+                                validation_split=validation_split,
+                                callbacks=callbacks,
+                                verbose=0)
+        duration = time.perf_counter() - start
+        epochs_used = len(history.history["loss"])
+
+        self.logger.info("LSTM trained for %s epochs in %.1f s.",
+                         epochs_used, duration)
+
+        return epochs_used, duration
+
+    @staticmethod
+    def lstm_windows(X, Y):
+        """Training samples as ``Windows``, if passed as arrays."""
+        if isinstance(X, Windows):
+            return X
+
+        return Windows(sequences=[X], labels=[Y])
+
+    def stream_dataset(self, windows: Windows, shuffle: bool = False):
+        """Pipeline (``tf.data``) which builds the batches of the samples on
+        the fly, prefetching the next batches while the model is trained.
+
+        Parameters
+        ----------
+            windows: Windows
+                Samples for the training or validation.
+            shuffle: bool, optional
+                If ``True``, the samples are shuffled for each epoch.
 
         Returns
         -------
-            results: np.array
-                List of values from ``data`` squashed into a single dimension
-                vector. The size of the output is given by the first dimension
-                of data added to its second dimension.
+            dataset: tf.data.Dataset
+                Dataset with the batches (sequences and labels).
 
         """
+        import tensorflow as tf
+
+        x, y = windows.take(slice(0, 1))
+        signature = (tf.TensorSpec(shape=(None,) + x.shape[1:], dtype=tf.float32),
+                     tf.TensorSpec(shape=(None,) + y.shape[1:], dtype=tf.float32))
+
+        dataset = tf.data.Dataset.from_generator(
+            lambda: windows.batches(batch_size=self.config.lstm_batch_size,
+                                    shuffle=shuffle),
+            output_signature=signature)
+
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def record_lstm_training(self, source_column: str, origin: str,
+                             epochs: int = 0, duration: float = 0.0):
+        """Keeps the origin of the model (``New``, ``Fine-tuned``, ``Stored``
+        or ``Memory``, or the name of the forecaster), the epochs trained and the duration of the training
+        for the column, to be added to the summary of the strategy."""
+        self.lstm_training[source_column] = {"LSTM Model": origin,
+                                             "LSTM Epochs": epochs,
+                                             "LSTM Fit Duration": duration}
+
+    def finetune_lstm_model(self, model, X, Y, sample_dates: np.ndarray, training: dict,
+                            source_column: str = ""):
+        """Continues the training of a stored model only with the samples
+        added since its last fit, for a few epochs (``lstm_finetune_epochs``)
+        and stopping early when the loss doesn't improve.
 
-        results = []
+        Parameters
+        ----------
+            model: Keras model
+                Stored model, created with the same parameters.
+            X: np.ndarray or Windows
+                All the training sequences, or the samples as ``Windows``.
+            Y: np.ndarray
+                All the training labels.
+            sample_dates: np.ndarray
+                Date of the last label of each sample.
+            training: dict
+                Information from the last fit of the model (date of the last
+                sample trained and loss over the held-out most recent samples,
+                see ``recent_samples``). It is updated after the fine-tuning.
 
-        if data.shape[0] == 1 or (len(data.shape) == 2 and data.shape[1] == 1):
-            results = data.flatten()
+        Returns
+        -------
+            model: Keras model
+                Fine-tuned model, or ``None`` if the model must be trained from
+                scratch (unknown last fit or degraded loss).
+
+        """
+        if "last_date" not in training or "recent_loss" not in training:
+            return None
 
+        # ----------------------------------------------------------------------
+        #   The most recent samples are held out of the fine-tuning (as in the
+        #   complete training), so their loss measures the model on samples
+        #   it wasn't trained with. They are only trained once they are no
+        #   longer the most recent ones.
+        # ----------------------------------------------------------------------
+        windows = self.lstm_windows(X, Y)
+        recent = self.recent_samples(len(windows))
+        new_samples = (sample_dates > np.datetime64(training["last_date"])) & ~recent
+
+        loss_before = self.recent_loss(model=model, windows=windows.subset(recent))
+
+        if new_samples.any():
+            from tensorflow import keras
+
+            self.logger.info("Fine-tuning the stored model for LSTM with %s new samples.",
+                             int(new_samples.sum()))
+            early_stopping = keras.callbacks.EarlyStopping(
+                monitor="loss",
+                patience=self.config.lstm_finetune_patience,
+                restore_best_weights=True)
+            epochs_used, duration = self.fit_lstm_model(
+                model=model, X=windows.subset(new_samples), Y=None,
+                epochs=self.config.lstm_finetune_epochs,
+                callbacks=[early_stopping])
         else:
-            results = [[] for Null in range(data.shape[0] + data.shape[1] - 1)]
-            for i in range(data.shape[0]):
-                for j in range(data.shape[1]):
-                    results[i+j].append(data[i][j][0])
-
-            for k in range(data.shape[0] + data.shape[1] - 1):
-                if mode == "average":
-                    results[k] = sum(results[k]) / len(results[k])
-                elif mode == "last":
-                    # The new list is inverted
-                    results[k] = results[k][0]
-                elif mode == "first":
-                    # The new list is inverted
-                    results[k] = results[k][-1]
-                elif mode == "weighted-average":
-                    weights = np.linspace(1, len(results[k]))
-                    values = np.array(results[k])
-                    results[k] = sum(np.multiply(
-                        weights, values)) / sum(weights)
-
-        results = np.array(results)
-        results = results.reshape(-1, 1)
-
-        return results
+            epochs_used, duration = 0, 0.0
+
+        # ----------------------------------------------------------------------
+        #   The model is retrained from scratch if the fine-tuning made it
+        #   worse for the held-out samples, or if it got worse for them than
+        #   after its complete training.
+        # ----------------------------------------------------------------------
+        loss_after = self.recent_loss(model=model, windows=windows.subset(recent))
+        tolerance = 1 + self.config.lstm_finetune_tolerance
+        if loss_after > loss_before * tolerance or loss_after > training["recent_loss"] * tolerance:
+            self.logger.info("Loss of the fine-tuned model for LSTM degraded "
+                             "from %s (%s before the fine-tuning) to %s.",
+                             training["recent_loss"], loss_before, loss_after)
+            return None
+
+        if new_samples.any():
+            training["last_date"] = str(np.max(sample_dates[new_samples]))
+        training["fine_tunes"] = training.get("fine_tunes", 0) + 1
+        self.record_lstm_training(source_column, "Fine-tuned", epochs_used, duration)
+
+        return model
+
+    @staticmethod
+    def recent_samples(samples: int, ratio: float = 0.1):
+        """Mask of the most recent samples (last 10%, at least one), held out
+        of the training to evaluate the model.
+
+        Parameters
+        ----------
+            samples: int
+                Number of samples, ordered by date.
+            ratio: float, optional
+                Fraction of the samples held out.
+
+        Returns
+        -------
+            recent: np.ndarray
+                ``True`` for the held-out samples.
+
+        """
+        length = min(max(1, int(samples * ratio)), max(samples - 1, 0))
+        recent = np.zeros(samples, dtype=bool)
+        recent[samples - length:] = True
+
+        return recent
+
+    def recent_loss(self, model, windows: Windows):
+        """Loss of the model over the held-out samples (see
+        ``recent_samples``)."""
+        x, y = windows.take()
+
+        return float(model.evaluate(x, y, verbose=0))
 
     def create_future_index(self, steps: int, previous_day: np.timedelta64):
         """Creates an array of dates following the Numpy timedelta type to be
@@ -1,3 +1,4 @@
+from src.lib import constants as C
 from src.lib.analysis.basic import Basic
 from src.lib.analysis.arbitration import Arbitration
 from src.lib.analysis.report_analysis import ReportAnalysis
@@ -8,7 +9,7 @@ from src.lib.analysis.methods.lstm import LSTM
 
 class MACD (LSTM, Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summary):
 
-    def calc_MACD(self):
+    def calc_MACD(self, precalculated: bool = False):
         """Calculate de MACD indicator. The MACD is based on the following
         steps:
 
@@ -52,18 +53,70 @@ class MACD (LSTM, Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Sum
         values indicate a buy recommendation, while negative indicate a sell
         position.
 
+        Parameters
+        ----------
+            precalculated: bool, optional
+                If ``True``, the indicator, its prediction and the
+                recommendation are already available in the dataframe (e.g.
+                calculated by the ``PanelAnalysis``), so only the events,
+                simulation and summary are calculated.
+
         """
 
         self.logger.info("Performing MACD analysis for %s", self.symbol)
 
+        if not precalculated:
+            self.calc_MACD_indicators()
+            self.calc_MACD_prediction()
+
+            self.recommend_threshold_cross(
+                source_column="MACD Histogram",
+                threshold_upper=C.MACD_THRESHOLD,  # 0.15
+                threshold_lower=C.MACD_THRESHOLD,  # 0.15
+                mode="norm",
+                values_upper_mid_lower=(
+                    "BUY", "HOLD", "SELL"),
+                result_column="MACD Recommendation")
+
+        self.define_actions(source_column="MACD Recommendation",
+                            result_column="MACD Recommended Events")
+
+        self.simulate_performance(source_column_close="Close Final",
+                                  source_column_decision="MACD Recommendation",
+                                  source_column_events="MACD Recommended Events",
+                                  initial_value=self.initial_value,
+                                  stopgain=self.stopgain,
+                                  stoploss=self.stoploss,
+                                  operation_cost_fix=self.operation_cost_fix,
+                                  operation_cost_proportional=self.operation_cost_proportional,
+                                  operation_cost_min=self.operation_cost_min,
+                                  operation_cost_max=self.operation_cost_max,
+                                  tax_percentage=self.tax_percentage,
+                                  result_column="MACD Simulation")
+        self.calculate_reference(source_column_close="Close Final",
+                                 initial_value=10000,
+                                 result_column="MACD Simulation Reference")
+
+        if self.display_analysis or self.save_analysis:
+            self.present_analysis()
+
+        self.get_summary(method_name="MACD")
+        self.analysis_results["MACD"].update(
+            self.lstm_training.get("MACD Histogram", {}))
+
+    def calc_MACD_indicators(self):
+        """Calculates the columns of the indicator (EMAs, `MACD Line`, `MACD
+        Signal` and `MACD Histogram`), without the prediction.
+
+        """
         self.calc_EMA(dataframe=self.ohlc_dataset,
                       source_column="Close Final",
-                      length=12,
+                      length=C.MACD_LENGTH_FAST,
                       result_column="MACD EMA 12")
 
         self.calc_EMA(dataframe=self.ohlc_dataset,
                       source_column="Close Final",
-                      length=26,
+                      length=C.MACD_LENGTH_SLOW,
                       result_column="MACD EMA 26")
 
         self.calc_difference(dataframe=self.ohlc_dataset,
@@ -73,7 +126,7 @@ class MACD (LSTM, Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Sum
 
         self.calc_EMA(dataframe=self.ohlc_dataset,
                       source_column="MACD Line",
-                      length=9,
+                      length=C.MACD_LENGTH_SIGNAL,
                       result_column="MACD Signal")
 
         self.calc_difference(dataframe=self.ohlc_dataset,
@@ -81,42 +134,16 @@ class MACD (LSTM, Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Sum
                              subtrahend_column="MACD Signal",
                              result_column="MACD Histogram")
 
+    def calc_MACD_prediction(self):
+        """Predicts the next values of the `MACD Histogram` with the LSTM,
+        extending the column into the prediction entries and adding the column
+        `MACD Histogram Fit`. This step is also called directly by the
+        ``PanelAnalysis``, since it can't be done for several symbols at once.
+
+        """
         self.calc_LSTM(dataframe=self.ohlc_dataset,
                        source_column="MACD Histogram",
                        sequence_length=self.sequence_length,
                        prediction_length=self.prediction_length,
                        extend_original_data=True,
                        result_column="MACD Histogram Fit")
-
-        self.recommend_threshold_cross(
-            source_column="MACD Histogram",
-            threshold_upper=0.0,  # 0.15
-            threshold_lower=0.0,  # 0.15
-            mode="norm",
-            values_upper_mid_lower=(
-                "BUY", "HOLD", "SELL"),
-            result_column="MACD Recommendation")
-
-        self.define_actions(source_column="MACD Recommendation",
-                            result_column="MACD Recommended Events")
-
-        self.simulate_performance(source_column_close="Close Final",
-                                  source_column_decision="MACD Recommendation",
-                                  source_column_events="MACD Recommended Events",
-                                  initial_value=self.initial_value,
-                                  stopgain=self.stopgain,
-                                  stoploss=self.stoploss,
-                                  operation_cost_fix=self.operation_cost_fix,
-                                  operation_cost_proportional=self.operation_cost_proportional,
-                                  operation_cost_min=self.operation_cost_min,
-                                  operation_cost_max=self.operation_cost_max,
-                                  tax_percentage=self.tax_percentage,
-                                  result_column="MACD Simulation")
-        self.calculate_reference(source_column_close="Close Final",
-                                 initial_value=10000,
-                                 result_column="MACD Simulation Reference")
-
-        if self.display_analysis or self.save_analysis:
-            self.present_analysis()
-
-        self.get_summary(method_name="MACD")
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from src.lib import constants as C
 from src.lib.analysis.basic import Basic
 from src.lib.analysis.arbitration import Arbitration
 from src.lib.analysis.report_analysis import ReportAnalysis
@@ -9,7 +10,7 @@ from src.lib.analysis.summary import Summary
 
 class RSI_EMA (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summary):
 
-    def calc_RSI_EMA(self):
+    def calc_RSI_EMA(self, precalculated: bool = False):
         """Calculate de RSI (Relative Strength Index) indicator based on
         Exponential Moving Average. The RSI is based on the following steps:
 
@@ -62,72 +63,81 @@ class RSI_EMA (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summar
         This analysis could be improved by the application of the histeresis in
         the method.
 
+        Parameters
+        ----------
+            precalculated: bool, optional
+                If ``True``, the indicator and the recommendations are already
+                available in the dataframe (e.g. calculated by the
+                ``PanelAnalysis``), so only the events, simulation and summary
+                are calculated.
+
         """
 
         self.logger.info("Performing RSI EMA analysis for %s", self.symbol)
 
-        N = 14
-
-        # self.calc_change(source_column="Close Final",
-        #                  shift=1,
-        #                  result_column="RSI EMA Close Final Difference")
-
-        self.calc_threshold(dataframe=self.ohlc_dataset,
-                            source_column="Close Final Change",
-                            threshold=0,
-                            comparison="<",
-                            replace_value=0,
-                            result_column="RSI EMA Gain")
-
-        self.calc_threshold(dataframe=self.ohlc_dataset,
-                            source_column="Close Final Change",
-                            threshold=0,
-                            comparison=">",
-                            replace_value=0,
-                            result_column="RSI EMA Loss")
-
-        self.calc_scalar_multiplication(dataframe=self.ohlc_dataset,
-                                        factor1_column="RSI EMA Loss",
-                                        factor2=-1,
-                                        result_column="RSI EMA Loss Positive")
-
-        self.calc_EMA(dataframe=self.ohlc_dataset,
-                      source_column="RSI EMA Gain",
-                      length=N,
-                      result_column="RSI EMA Gain Average")
-
-        self.calc_EMA(dataframe=self.ohlc_dataset,
-                      source_column="RSI EMA Loss Positive",
-                      length=N,
-                      result_column="RSI EMA Loss Average")
-
-        self.calc_division(dataframe=self.ohlc_dataset,
-                           dividend_column="RSI EMA Gain Average",
-                           divisor_column="RSI EMA Loss Average",
-                           result_column="RSI EMA RS")
-
-        self.ohlc_dataset.loc[:, "RSI EMA RSI"] = 100 - \
-            (100 / (1 + self.ohlc_dataset["RSI EMA RS"]))
-
-        self.recommend_threshold_cross(source_column="RSI EMA RSI",
-                                       threshold_upper=70,
-                                       threshold_lower=30,
-                                       mode="abs",
-                                       hysteresis=False,
-                                       values_upper_mid_lower=(
-                                           # C.SELL, C.HOLD, C.BUY),
-                                           "SELL", "HOLD", "BUY"),
-                                       result_column="RSI EMA Recommendation Pure")
-
-        self.recommend_threshold_cross(source_column="RSI EMA RSI",
-                                       threshold_upper=70,
-                                       threshold_lower=30,
-                                       mode="abs",
-                                       hysteresis=True,
-                                       values_upper_mid_lower=(
-                                           # C.SELL, C.HOLD, C.BUY),
-                                           "SELL", "HOLD", "BUY"),
-                                       result_column="RSI EMA Recommendation")
+        if not precalculated:
+            N = C.RSI_LENGTH
+
+            # self.calc_change(source_column="Close Final",
+            #                  shift=1,
+            #                  result_column="RSI EMA Close Final Difference")
+
+            self.calc_threshold(dataframe=self.ohlc_dataset,
+                                source_column="Close Final Change",
+                                threshold=0,
+                                comparison="<",
+                                replace_value=0,
+                                result_column="RSI EMA Gain")
+
+            self.calc_threshold(dataframe=self.ohlc_dataset,
+                                source_column="Close Final Change",
+                                threshold=0,
+                                comparison=">",
+                                replace_value=0,
+                                result_column="RSI EMA Loss")
+
+            self.calc_scalar_multiplication(dataframe=self.ohlc_dataset,
+                                            factor1_column="RSI EMA Loss",
+                                            factor2=-1,
+                                            result_column="RSI EMA Loss Positive")
+
+            self.calc_EMA(dataframe=self.ohlc_dataset,
+                          source_column="RSI EMA Gain",
+                          length=N,
+                          result_column="RSI EMA Gain Average")
+
+            self.calc_EMA(dataframe=self.ohlc_dataset,
+                          source_column="RSI EMA Loss Positive",
+                          length=N,
+                          result_column="RSI EMA Loss Average")
+
+            self.calc_division(dataframe=self.ohlc_dataset,
+                               dividend_column="RSI EMA Gain Average",
+                               divisor_column="RSI EMA Loss Average",
+                               result_column="RSI EMA RS")
+
+            self.ohlc_dataset.loc[:, "RSI EMA RSI"] = 100 - \
+                (100 / (1 + self.ohlc_dataset["RSI EMA RS"]))
+
+            self.recommend_threshold_cross(source_column="RSI EMA RSI",
+                                           threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                           threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                           mode="abs",
+                                           hysteresis=False,
+                                           values_upper_mid_lower=(
+                                               # C.SELL, C.HOLD, C.BUY),
+                                               "SELL", "HOLD", "BUY"),
+                                           result_column="RSI EMA Recommendation Pure")
+
+            self.recommend_threshold_cross(source_column="RSI EMA RSI",
+                                           threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                           threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                           mode="abs",
+                                           hysteresis=True,
+                                           values_upper_mid_lower=(
+                                               # C.SELL, C.HOLD, C.BUY),
+                                               "SELL", "HOLD", "BUY"),
+                                           result_column="RSI EMA Recommendation")
 
         self.define_actions(source_column="RSI EMA Recommendation",
                             result_column="RSI EMA Recommended Events")
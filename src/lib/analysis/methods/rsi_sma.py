@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from src.lib import constants as C
 from src.lib.analysis.basic import Basic
 from src.lib.analysis.arbitration import Arbitration
 from src.lib.analysis.report_analysis import ReportAnalysis
@@ -9,7 +10,7 @@ from src.lib.analysis.summary import Summary
 
 class RSI_SMA (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summary):
 
-    def calc_RSI_SMA(self):
+    def calc_RSI_SMA(self, precalculated: bool = False):
         """Calculate de RSI (Relative Strength Index) indicator. The RSI is
         based on the following steps:
 
@@ -34,7 +35,9 @@ class RSI_SMA (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summar
 
         This result is averaged over the last 14 entries (e.g. days), where both
         Exponential or Simple moving averages can be used. For this application
-        the Simple Moving Average is used.
+        the Simple Moving Average is used for the first average, and the
+        following ones are smoothed by the Wilder's method (see
+        ``calc_wilder``).
 
         The result from the RSI is to be interpreted as:
 
@@ -62,94 +65,93 @@ class RSI_SMA (Basic, Arbitration, PerformanceSimulation, ReportAnalysis, Summar
         This analysis could be improved by the application of the histeresis in
         the method.
 
+        Parameters
+        ----------
+            precalculated: bool, optional
+                If ``True``, the indicator and the recommendations are already
+                available in the dataframe (e.g. calculated by the
+                ``PanelAnalysis``), so only the events, simulation and summary
+                are calculated.
+
         """
 
         self.logger.info("Performing RSI SMA analysis for %s", self.symbol)
 
-        N = 14
-
-        # self.calc_change(source_column="Close Final",
-        #                  shift=1,
-        #                  result_column="RSI SMA Close Final Difference")
-
-        self.calc_threshold(dataframe=self.ohlc_dataset,
-                            source_column="Close Final Change",
-                            threshold=0,
-                            comparison="<",
-                            replace_value=0,
-                            result_column="RSI SMA Gain")
-
-        self.calc_threshold(dataframe=self.ohlc_dataset,
-                            source_column="Close Final Change",
-                            threshold=0,
-                            comparison=">",
-                            replace_value=0,
-                            result_column="RSI SMA Loss")
-
-        self.calc_absolute(dataframe=self.ohlc_dataset,
-                           source_column="RSI SMA Loss",
-                           result_column="RSI SMA Loss Absolute")
-
-        # self.calc_SMA(source_column="RSI SMA Gain",
-        #               length=N,
-        #               minimum_length=N,
-        #               result_column="RSI SMA Gain Average")
-
-        # self.calc_SMA(source_column="RSI SMA Loss Positive",
-        #               length=N,
-        #               minimum_length=N,
-        #               result_column="RSI SMA Loss Average")
-
-        # Get initial Averages
-        self.ohlc_dataset['RSI SMA Gain Average'] = self.ohlc_dataset['RSI SMA Gain'].rolling(
-            window=N, min_periods=N).mean()[:N+1]
-        self.ohlc_dataset['RSI SMA Loss Average'] = self.ohlc_dataset['RSI SMA Loss Absolute'].rolling(
-            window=N, min_periods=N).mean()[:N+1]
-
-        for i, row in enumerate(self.ohlc_dataset['RSI SMA Gain Average'].iloc[N+1:]):
-            self.ohlc_dataset['RSI SMA Gain Average'].iloc[i + N + 1] =\
-                (self.ohlc_dataset['RSI SMA Gain Average'].iloc[i + N] *
-                 (N - 1) +
-                 self.ohlc_dataset['RSI SMA Gain'].iloc[i + N + 1])\
-                / N
-        # Average Losses
-        for i, row in enumerate(self.ohlc_dataset['RSI SMA Loss Average'].iloc[N+1:]):
-            self.ohlc_dataset['RSI SMA Loss Average'].iloc[i + N + 1] =\
-                (self.ohlc_dataset['RSI SMA Loss Average'].iloc[i + N] *
-                 (N - 1) +
-                 self.ohlc_dataset['RSI SMA Loss Absolute'].iloc[i + N + 1])\
-                / N
-
-        self.calc_division(dataframe=self.ohlc_dataset,
-                           dividend_column="RSI SMA Gain Average",
-                           divisor_column="RSI SMA Loss Average",
-                           result_column="RSI SMA RS")
-
-        self.ohlc_dataset.loc[:, "RSI SMA RSI"] = 100 - \
-            (100 / (1 + self.ohlc_dataset["RSI SMA RS"]))
-
-        # print(self.ohlc_dataset[["Close Final", "RSI SMA Close Final Difference", "RSI SMA Gain", "RSI SMA Loss Absolute",
-        #       "RSI SMA RS", "RSI SMA RSI"]].tail(50))
-
-        self.recommend_threshold_cross(source_column="RSI SMA RSI",
-                                       threshold_upper=70,
-                                       threshold_lower=30,
-                                       mode="abs",
-                                       hysteresis=False,
-                                       values_upper_mid_lower=(
-                                           # C.SELL, C.HOLD, C.BUY),
-                                           "SELL", "HOLD", "BUY"),
-                                       result_column="RSI SMA Recommendation Pure")
-
-        self.recommend_threshold_cross(source_column="RSI SMA RSI",
-                                       threshold_upper=70,
-                                       threshold_lower=30,
-                                       mode="abs",
-                                       hysteresis=True,
-                                       values_upper_mid_lower=(
-                                           # C.SELL, C.HOLD, C.BUY),
-                                           "SELL", "HOLD", "BUY"),
-                                       result_column="RSI SMA Recommendation")
+        if not precalculated:
+            N = C.RSI_LENGTH
+
+            # self.calc_change(source_column="Close Final",
+            #                  shift=1,
+            #                  result_column="RSI SMA Close Final Difference")
+
+            self.calc_threshold(dataframe=self.ohlc_dataset,
+                                source_column="Close Final Change",
+                                threshold=0,
+                                comparison="<",
+                                replace_value=0,
+                                result_column="RSI SMA Gain")
+
+            self.calc_threshold(dataframe=self.ohlc_dataset,
+                                source_column="Close Final Change",
+                                threshold=0,
+                                comparison=">",
+                                replace_value=0,
+                                result_column="RSI SMA Loss")
+
+            self.calc_absolute(dataframe=self.ohlc_dataset,
+                               source_column="RSI SMA Loss",
+                               result_column="RSI SMA Loss Absolute")
+
+            # self.calc_SMA(source_column="RSI SMA Gain",
+            #               length=N,
+            #               minimum_length=N,
+            #               result_column="RSI SMA Gain Average")
+
+            # self.calc_SMA(source_column="RSI SMA Loss Positive",
+            #               length=N,
+            #               minimum_length=N,
+            #               result_column="RSI SMA Loss Average")
+
+            self.calc_wilder(dataframe=self.ohlc_dataset,
+                             source_column="RSI SMA Gain",
+                             length=N,
+                             result_column="RSI SMA Gain Average")
+
+            self.calc_wilder(dataframe=self.ohlc_dataset,
+                             source_column="RSI SMA Loss Absolute",
+                             length=N,
+                             result_column="RSI SMA Loss Average")
+
+            self.calc_division(dataframe=self.ohlc_dataset,
+                               dividend_column="RSI SMA Gain Average",
+                               divisor_column="RSI SMA Loss Average",
+                               result_column="RSI SMA RS")
+
+            self.ohlc_dataset.loc[:, "RSI SMA RSI"] = 100 - \
+                (100 / (1 + self.ohlc_dataset["RSI SMA RS"]))
+
+            # print(self.ohlc_dataset[["Close Final", "RSI SMA Close Final Difference", "RSI SMA Gain", "RSI SMA Loss Absolute",
+            #       "RSI SMA RS", "RSI SMA RSI"]].tail(50))
+
+            self.recommend_threshold_cross(source_column="RSI SMA RSI",
+                                           threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                           threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                           mode="abs",
+                                           hysteresis=False,
+                                           values_upper_mid_lower=(
+                                               # C.SELL, C.HOLD, C.BUY),
+                                               "SELL", "HOLD", "BUY"),
+                                           result_column="RSI SMA Recommendation Pure")
+
+            self.recommend_threshold_cross(source_column="RSI SMA RSI",
+                                           threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                           threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                           mode="abs",
+                                           hysteresis=True,
+                                           values_upper_mid_lower=(
+                                               # C.SELL, C.HOLD, C.BUY),
+                                               "SELL", "HOLD", "BUY"),
+                                           result_column="RSI SMA Recommendation")
 
         self.define_actions(source_column="RSI SMA Recommendation",
                             result_column="RSI SMA Recommended Events")
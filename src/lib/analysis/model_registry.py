@@ -0,0 +1,120 @@
+"""In-memory registry of the LSTM models already loaded or trained."""
+
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import json
+import threading
+
+# Symbol used to name the LSTM model shared by all the symbols.
+SHARED_SYMBOL = "SHARED"
+
+
+class ModelRegistry:
+    """Keeps the most recently used models in memory, so the analysis of the
+    same symbol and column (e.g. repeated requests to the server, or a worker
+    from the pool analyzing several symbols) doesn't load the model from the
+    disk again.
+
+    Each model is identified by the symbol and the source column, and it is
+    valid while the hash of the analysis parameters used to create it is the
+    same as the current one (see ``parameters_hash``) and it is not older than
+    the maximum age. When the registry is full, the least recently used model
+    is evicted.
+
+    Attributes
+    ----------
+        capacity: int
+            Maximum number of models kept in memory.
+        models: `OrderedDict`
+            Entries of the registry, from the least to the most recently used.
+            Each entry is a tuple with the hash, the model and its creation
+            date.
+    """
+
+    def __init__(self, capacity: int = 8):
+
+        self.capacity = capacity
+        self.models = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def parameters_hash(symbol: str, source_column: str, parameters: dict):
+        """Stable hash of the model identification and the parameters used to
+        create it. The strings are compared without case, as done before by
+        the comparison of the stored parameters.
+
+        Returns
+        -------
+            hash: string
+                Hexadecimal SHA-256 digest.
+
+        """
+        def normalize(value):
+            if isinstance(value, dict):
+                return {str(key).lower(): normalize(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [normalize(item) for item in value]
+            if isinstance(value, str):
+                return value.lower()
+            return value
+
+        content = json.dumps({"symbol": symbol,
+                              "source_column": source_column,
+                              "parameters": normalize(parameters)},
+                             sort_keys=True, default=str)
+
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, name: str, model_hash: str, max_age: float = None):
+        """Returns the model from the registry, or ``None`` if it is not in
+        memory, was created with other parameters or is older than
+        ``max_age`` days."""
+        with self.lock:
+            entry = self.models.get(name)
+            if entry is None:
+                return None
+
+            stored_hash, model, created = entry
+            if stored_hash != model_hash or (
+                    max_age is not None and
+                    (datetime.today() - created).days >= max_age):
+                del self.models[name]
+                return None
+
+            self.models.move_to_end(name)
+
+            return model
+
+    def put(self, name: str, model_hash: str, model, created: datetime = None):
+        """Adds the model to the registry, evicting the least recently used
+        model if the capacity is exceeded."""
+        if self.capacity <= 0:
+            return
+
+        if created is None:
+            created = datetime.today()
+
+        with self.lock:
+            self.models[name] = (model_hash, model, created)
+            self.models.move_to_end(name)
+
+            while len(self.models) > self.capacity:
+                self.models.popitem(last=False)
+
+    def clear(self):
+        """Removes all the models from memory."""
+        with self.lock:
+            self.models.clear()
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def get_model_registry(capacity: int = None):
+    """Registry shared by all the analyses in the process. The capacity is
+    updated when passed."""
+    if capacity is not None:
+        MODEL_REGISTRY.capacity = capacity
+
+    return MODEL_REGISTRY
@@ -0,0 +1,193 @@
+"""Inference of the LSTM models with Numpy only, so the processes which only
+predict (e.g. the analysis, see ``lstm_train_in_analysis``) don't need to
+import TensorFlow.
+
+The weights of a trained Keras model are exported to a ``.npz`` file by
+``export_keras_model`` and loaded by ``NumpyLSTM.from_npz``. The layers used by
+the architectures from ``LSTM.create_lstm_model`` are supported: ``LSTM``,
+``RepeatVector``, ``TimeDistributed(Dense)``, ``Dense``, ``Activation`` and
+``Dropout`` (which does nothing for the inference).
+
+"""
+import json
+import numpy as np
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "hard_sigmoid": lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+}
+
+
+def get_activation(name: str):
+    """Numpy version of a Keras activation function, given by its name."""
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Activation {name} not supported by NumpyLSTM.")
+
+    return ACTIVATIONS[name]
+
+
+def export_keras_model(model, path):
+    """Exports the architecture and the weights of a Keras ``Sequential``
+    model to a ``.npz`` file.
+
+    Parameters
+    ----------
+        model: Keras model
+            Trained model, built by ``LSTM.create_lstm_model``.
+        path: Path
+            Location of the ``.npz`` file.
+
+    """
+    layers = []
+    arrays = {}
+
+    for i, layer in enumerate(model.layers):
+        layer_type = layer.__class__.__name__
+        config = layer.get_config()
+        weights = layer.get_weights()
+
+        description = {"type": layer_type, "weights": len(weights)}
+
+        if layer_type == "LSTM":
+            description.update({
+                "units": config["units"],
+                "activation": config.get("activation", "tanh"),
+                "recurrent_activation": config.get("recurrent_activation", "sigmoid"),
+                "return_sequences": config.get("return_sequences", False),
+                "use_bias": config.get("use_bias", True),
+            })
+        elif layer_type == "RepeatVector":
+            description["n"] = config["n"]
+        elif layer_type == "TimeDistributed":
+            description["activation"] = layer.layer.get_config().get(
+                "activation", "linear")
+        elif layer_type in ["Dense", "Activation"]:
+            description["activation"] = config.get("activation", "linear")
+        elif layer_type != "Dropout":
+            raise ValueError(f"Layer {layer_type} not supported by NumpyLSTM.")
+
+        layers.append(description)
+        for j, weight in enumerate(weights):
+            arrays[f"layer{i}_weight{j}"] = np.asarray(weight)
+
+    np.savez(path, architecture=np.array(json.dumps(layers)), **arrays)
+
+
+class NumpyLSTM:
+    """Forward pass of an exported model, with the same interface for the
+    prediction as a Keras model (``predict``).
+
+    Attributes
+    ----------
+        layers: list
+            Description of each layer (type and configuration).
+        weights: list
+            List with the weights of each layer, in the same order as from
+            Keras (e.g. kernel, recurrent kernel and bias for the ``LSTM``).
+    """
+
+    def __init__(self, layers: list, weights: list):
+
+        self.layers = layers
+        self.weights = weights
+
+    @classmethod
+    def from_npz(cls, path):
+        """Loads a model exported by ``export_keras_model``."""
+        with np.load(path) as content:
+            layers = json.loads(str(content["architecture"]))
+            weights = [[content[f"layer{i}_weight{j}"]
+                        for j in range(layer["weights"])]
+                       for i, layer in enumerate(layers)]
+
+        return cls(layers=layers, weights=weights)
+
+    @staticmethod
+    def lstm_forward(x: np.ndarray, weights: list, layer: dict):
+        """Forward pass of a Keras ``LSTM`` layer, for all the samples at once.
+        The gates are stacked in the Keras order: input, forget, cell and
+        output.
+
+        Parameters
+        ----------
+            x: np.ndarray
+                Input with shape ``(samples, steps, features)``.
+
+        Returns
+        -------
+            output: np.ndarray
+                Hidden state of the last step ``(samples, units)``, or of all
+                the steps ``(samples, steps, units)`` if the layer returns the
+                sequences.
+
+        """
+        kernel, recurrent_kernel = weights[0], weights[1]
+        bias = weights[2] if layer.get("use_bias", True) else 0.0
+        units = layer["units"]
+        activation = get_activation(layer["activation"])
+        recurrent_activation = get_activation(layer["recurrent_activation"])
+
+        samples, steps = x.shape[0], x.shape[1]
+        h = np.zeros((samples, units))
+        c = np.zeros((samples, units))
+
+        # ----------------------------------------------------------------------
+        #   The contribution of the input doesn't depend on the previous state,
+        #   so it is calculated for all the steps at once.
+        # ----------------------------------------------------------------------
+        x_projected = x @ kernel + bias
+        outputs = []
+
+        for step in range(steps):
+            z = x_projected[:, step, :] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+
+            c = f * c + i * g
+            h = o * activation(c)
+
+            if layer["return_sequences"]:
+                outputs.append(h)
+
+        if layer["return_sequences"]:
+            return np.stack(outputs, axis=1)
+
+        return h
+
+    def predict(self, x: np.ndarray, **kwargs):
+        """Prediction for the input sequences, as done by Keras.
+
+        Parameters
+        ----------
+            x: np.ndarray
+                Input with shape ``(samples, steps, features)``.
+
+        Returns
+        -------
+            prediction: np.ndarray
+                Output of the model, as ``float32`` (same as from Keras).
+
+        """
+        output = np.asarray(x, dtype=np.float64)
+
+        for layer, weights in zip(self.layers, self.weights):
+            layer_type = layer["type"]
+
+            if layer_type == "LSTM":
+                output = self.lstm_forward(output, weights, layer)
+            elif layer_type == "RepeatVector":
+                output = np.repeat(output[:, np.newaxis, :], layer["n"], axis=1)
+            elif layer_type in ["Dense", "TimeDistributed"]:
+                output = output @ weights[0]
+                if len(weights) > 1:
+                    output = output + weights[1]
+                output = get_activation(layer["activation"])(output)
+            elif layer_type == "Activation":
+                output = get_activation(layer["activation"])(output)
+
+        return output.astype(np.float32)
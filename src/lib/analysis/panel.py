@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+from src.lib import constants as C
+from src.lib.analysis.basic import Basic
+from src.lib.analysis.arbitration import Arbitration
+
+
+class Panel (Basic, Arbitration):
+    """Calculation of the indicators and recommendations from the strategies
+    for several symbols at once. The series from all the symbols are stacked as
+    columns of a 2-D panel (entries x symbols), so every indicator is a single
+    operation over the complete panel, instead of one operation per symbol.
+
+    The symbols in a panel are aligned by the position of the entries (the
+    last ``analysis_length_pre`` trading days of each symbol, followed by the
+    prediction entries) and not by the calendar date. Aligning by date would
+    introduce gaps for the holidays of each exchange, which would change the
+    results of the recursive averages. Due to this, all the symbols in a panel
+    must have the same number of entries (see ``PanelAnalysis``).
+
+    The calculations follow exactly the same steps from the strategies (e.g.
+    ``calc_MACD``), with the same parameters (from the ``constants`` module),
+    including setting the prediction entries to ``NaN`` after each step, so the
+    results are identical to the ones for a single symbol.
+    """
+
+    def stack_panel(self, datasets: list, source_column: str):
+        """Stacks the same column from a list of dataframes into a panel, with
+        one column per dataframe.
+
+        Parameters
+        ----------
+            datasets: list
+                List of Pandas dataframes, all with the same number of entries.
+            source_column: string
+                Name of the column to be taken from each dataframe.
+
+        Returns
+        -------
+            panel: Pandas dataframe
+                Dataframe with the entries as rows (positional index) and the
+                dataframes as columns.
+
+        """
+        return pd.DataFrame(np.column_stack(
+            [dataset[source_column].to_numpy(dtype=float) for dataset in datasets]))
+
+    def unstack_panel(self, datasets: list, panel: dict):
+        """Writes back the columns from the panel into each dataframe. This is
+        the opposite operation from ``stack_panel``.
+
+        Parameters
+        ----------
+            datasets: list
+                List of Pandas dataframes, in the same order used for stacking.
+            panel: dict
+                Dictionary with the name of the column as key and the panel
+                (Pandas dataframe or 2-D Numpy array) as value.
+
+        """
+        for name, values in panel.items():
+            values = np.asarray(values)
+            for i, dataset in enumerate(datasets):
+                dataset.loc[:, name] = values[:, i]
+
+    @staticmethod
+    def mask_prediction(panel: pd.DataFrame, prediction: np.ndarray, value_prediction=np.nan):
+        """Replaces the prediction entries from the panel, as done for a single
+        symbol by the ``value_prediction`` parameter from the ``Basic``
+        methods.
+        """
+        panel.loc[prediction, :] = value_prediction
+
+        return panel
+
+    def calc_panel_indicators(self, close: pd.DataFrame, change: pd.DataFrame, prediction: np.ndarray):
+        """Calculates the indicators from the strategies MACD, RSI (SMA and
+        EMA) and Bollinger Bands for all the symbols in the panel.
+
+        Parameters
+        ----------
+            close: Pandas dataframe
+                Panel with the closing values (``Close Final``).
+            change: Pandas dataframe
+                Panel with the daily change of the closing values (``Close
+                Final Change``).
+            prediction: Numpy array
+                Boolean array indicating the prediction entries.
+
+        Returns
+        -------
+            panel: dict
+                Dictionary with the name of the columns (same as used by the
+                strategies) as keys and the panels as values.
+
+        """
+        mask = self.mask_prediction
+        panel = {}
+
+        # ----------------------------------------------------------------------
+        #   MACD
+        # ----------------------------------------------------------------------
+        panel["MACD EMA 12"] = mask(close.ewm(
+            span=C.MACD_LENGTH_FAST, min_periods=0, adjust=False, ignore_na=False).mean(),
+            prediction)
+        panel["MACD EMA 26"] = mask(close.ewm(
+            span=C.MACD_LENGTH_SLOW, min_periods=0, adjust=False, ignore_na=False).mean(),
+            prediction)
+        panel["MACD Line"] = mask(
+            panel["MACD EMA 12"] - panel["MACD EMA 26"], prediction)
+        panel["MACD Signal"] = mask(panel["MACD Line"].ewm(
+            span=C.MACD_LENGTH_SIGNAL, min_periods=0, adjust=False, ignore_na=False).mean(),
+            prediction)
+        panel["MACD Histogram"] = mask(
+            panel["MACD Line"] - panel["MACD Signal"], prediction)
+
+        # ----------------------------------------------------------------------
+        #   RSI based on the simple moving average (and Wilder's smoothing)
+        # ----------------------------------------------------------------------
+        gain = mask(change.mask(change < 0, 0), prediction)
+        loss = mask(change.mask(change > 0, 0), prediction)
+
+        panel["RSI SMA Gain"] = gain
+        panel["RSI SMA Loss"] = loss
+        panel["RSI SMA Loss Absolute"] = mask(loss.abs(), prediction)
+        panel["RSI SMA Gain Average"] = mask(self.wilder_smoothing(
+            source=panel["RSI SMA Gain"], length=C.RSI_LENGTH), prediction)
+        panel["RSI SMA Loss Average"] = mask(self.wilder_smoothing(
+            source=panel["RSI SMA Loss Absolute"], length=C.RSI_LENGTH), prediction)
+        panel["RSI SMA RS"] = mask(
+            panel["RSI SMA Gain Average"] / panel["RSI SMA Loss Average"], prediction)
+        panel["RSI SMA RSI"] = 100 - (100 / (1 + panel["RSI SMA RS"]))
+
+        # ----------------------------------------------------------------------
+        #   RSI based on the exponential moving average
+        # ----------------------------------------------------------------------
+        panel["RSI EMA Gain"] = gain.copy()
+        panel["RSI EMA Loss"] = loss.copy()
+        panel["RSI EMA Loss Positive"] = mask(loss * -1, prediction)
+        panel["RSI EMA Gain Average"] = mask(panel["RSI EMA Gain"].ewm(
+            span=C.RSI_LENGTH, min_periods=0, adjust=False, ignore_na=False).mean(),
+            prediction)
+        panel["RSI EMA Loss Average"] = mask(panel["RSI EMA Loss Positive"].ewm(
+            span=C.RSI_LENGTH, min_periods=0, adjust=False, ignore_na=False).mean(),
+            prediction)
+        panel["RSI EMA RS"] = mask(
+            panel["RSI EMA Gain Average"] / panel["RSI EMA Loss Average"], prediction)
+        panel["RSI EMA RSI"] = 100 - (100 / (1 + panel["RSI EMA RS"]))
+
+        # ----------------------------------------------------------------------
+        #   Bollinger Bands
+        # ----------------------------------------------------------------------
+        panel["BBANDS SMA 20"] = mask(
+            close.rolling(window=C.BBANDS_LENGTH).mean(), prediction)
+        panel["BBANDS StdDev 20"] = mask(
+            close.rolling(window=C.BBANDS_LENGTH).std(), prediction)
+        panel["BBANDS Upper"] = panel["BBANDS SMA 20"] + \
+            (C.BBANDS_WIDTH * panel["BBANDS StdDev 20"])
+        panel["BBANDS Lower"] = panel["BBANDS SMA 20"] - \
+            (C.BBANDS_WIDTH * panel["BBANDS StdDev 20"])
+
+        return panel
+
+    def recommend_panel(self, close: pd.DataFrame, panel: dict):
+        """Calculates the recommendations from the strategies RSI (SMA and EMA)
+        and Bollinger Bands for all the symbols in the panel, based on the
+        indicators from ``calc_panel_indicators``. The recommendation from the
+        MACD depends on the prediction of the histogram, so it is done
+        separately by ``recommend_panel_MACD``.
+
+        Returns
+        -------
+            recommendations: dict
+                Dictionary with the name of the columns as keys and 2-D Numpy
+                arrays with the recommendations as values.
+
+        """
+        recommendations = {}
+
+        for method in ["RSI SMA", "RSI EMA"]:
+            rsi = panel[f"{method} RSI"].to_numpy(dtype=float)
+
+            recommendations[f"{method} Recommendation Pure"] = self.label_states(
+                states=self.threshold_states(values=rsi,
+                                             threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                             threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                             hysteresis=False),
+                values_upper_mid_lower=("SELL", "HOLD", "BUY"))
+
+            recommendations[f"{method} Recommendation"] = self.label_states(
+                states=self.threshold_states(values=rsi,
+                                             threshold_upper=C.RSI_THRESHOLD_UPPER,
+                                             threshold_lower=C.RSI_THRESHOLD_LOWER,
+                                             hysteresis=True),
+                values_upper_mid_lower=("SELL", "HOLD", "BUY"))
+
+        recommendations["BBANDS Recommendation"] = self.label_states(
+            states=self.threshold_states(
+                values=close.to_numpy(dtype=float),
+                threshold_upper=panel["BBANDS Upper"].to_numpy(dtype=float),
+                threshold_lower=panel["BBANDS Lower"].to_numpy(dtype=float)),
+            values_upper_mid_lower=("BUY", "HOLD", "SELL"))
+
+        return recommendations
+
+    def recommend_panel_MACD(self, histogram: pd.DataFrame):
+        """Calculates the recommendation from the MACD strategy for all the
+        symbols in the panel. The thresholds are normalized by the peaks of
+        each symbol, as done by ``recommend_threshold_cross`` in the ``norm``
+        mode.
+
+        Returns
+        -------
+            recommendations: dict
+                Dictionary with the column ``MACD Recommendation`` as key and a
+                2-D Numpy array with the recommendations as value.
+
+        """
+        states = self.threshold_states(
+            values=histogram.to_numpy(dtype=float),
+            threshold_upper=histogram.max().to_numpy() * C.MACD_THRESHOLD,
+            threshold_lower=histogram.min().to_numpy() * C.MACD_THRESHOLD)
+
+        return {"MACD Recommendation": self.label_states(
+            states=states, values_upper_mid_lower=("BUY", "HOLD", "SELL"))}
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from src.lib import constants as C
 
 
 class PerformanceSimulation:
@@ -18,211 +20,215 @@ class PerformanceSimulation:
                              result_column: str = "",
                              result_dataframe: pd.DataFrame = None):
         """Perfoms the simulation of the results for a given strategy.
+
+        The columns from the dataframe are converted once into Numpy arrays
+        (closing values and codes for the decisions and events) and the
+        simulation itself is done by ``simulate_performance_array``. The result
+        is written back in a single assignment into ``result_column``.
         """
 
-        # ----------------------------------------------------------------------
-        #   Start of a initial value and create the new column.
-        # ----------------------------------------------------------------------
-        self.ohlc_dataset.loc[:, result_column] = initial_value
-
-        # ----------------------------------------------------------------------
-        #   Loop thru the moments the ticker was bought, so the results are
-        #   calculated. For each new Buy event, a fixed amount is taken, to
-        #   account for the cost of operation. At the end of an operation
-        #   (sell), a percentage of the gain is removed, to account for taxes.
-        # ----------------------------------------------------------------------
-        i = 0
-        pre_first_buy = True
-        cycle_profit = 0
-        cycle_balance = initial_value
-        total_balance = initial_value
-        tax_value = 0
-        operation_cost_value = 0
-        takegain_value = 0
-        stoploss_value = 0
-
-        for index, row in self.ohlc_dataset.iterrows():
-
-            if i > 0:
-                # --------------------------------------------------------------
-                #   Get the values for calculation and also calculate the
-                #   percentage factor.
-                # --------------------------------------------------------------
-                decision = self.ohlc_dataset.iloc[i][source_column_decision]
-                event = self.ohlc_dataset.iloc[i][source_column_events]
-                close_prev = self.ohlc_dataset.iloc[i - 1][source_column_close]
-                close_today = self.ohlc_dataset.iloc[i][source_column_close]
-
-                perc_day = 1 + ((close_today - close_prev) / close_prev)
-
-                # --------------------------------------------------------------
-                #   On the first SELL or HOLD, release the first buy flag. This
-                #   is done so in case the strategy starts with a BUY situation,
-                #   it won't be added in the calcualtion.
-                # --------------------------------------------------------------
-                if event == "SELL" or event == "HOLD":
-                    pre_first_buy = False
-
-                # --------------------------------------------------------------
-                #   Reduce the current position (balance) by a constant to
-                #   account for the cost of operation. Also resets the cycle
-                #   gain.
-                # --------------------------------------------------------------
-                if (event == "BUY" or event == "SELL") and pre_first_buy == False:
-                    operation_cost_value = operation_cost_fix + \
-                        total_balance * operation_cost_proportional
-                    if operation_cost_value < operation_cost_min:
-                        operation_cost_value = operation_cost_min
-                    if operation_cost_value > operation_cost_max:
-                        operation_cost_value = operation_cost_max
-                    cycle_balance = total_balance
-                else:
-                    operation_cost_value = 0
-
-                # --------------------------------------------------------------
-                #   Trigger the Stop loss and Gain loss
-                # --------------------------------------------------------------
-                if event == "BUY" and pre_first_buy == False and stoploss < 1:
-                    if stoploss_value == 0:
-                        stoploss_value = close_prev * stoploss
-
-                if event == "BUY" and pre_first_buy == False and stopgain > 1:
-                    if takegain_value == 0:
-                        takegain_value = close_prev * stopgain
-
-                # --------------------------------------------------------------
-                #   Apply stoploss or takegain limits
-                # --------------------------------------------------------------
-                # stoploss_latch = False
-                if stoploss_value > 0 and close_prev < stoploss_value and stoploss < 1:
-                    # print("")
-                    # print("STOPLOSS")
-                    # print(stoploss)
-                    # print(stoploss_value)
-                    # print(close_prev)
-                    # print(close_today)
-                    # stoploss_latch = True
-                    takegain_value = 0
-                    stoploss_value = 0
-
-                    # if stoploss_latch:
-                    # print("RRRRRRRR")
-                    decision = "SELL"
-                    event = "SELL"
-                    # stoploss_latch = False
-
-                # takegain_latch = False
-                if takegain_value > 0 and close_prev > takegain_value and stopgain > 1:
-                    # print("")
-                    # print("TAKEGAIN")
-                    # print(takegain)
-                    # print(takegain_value)
-                    # print(close_prev)
-                    # print(close_today)
-                    # takegain_latch = True
-                    takegain_value = 0
-                    stoploss_value = 0
-
-                    # if takegain_latch:
-                    # print("AQUI")
-                    # print(row)
-                    decision = "SELL"
-                    event = "SELL"
-                    # takegain_latch = False
-                    # print(decision)
-
-                # --------------------------------------------------------------
-                #   De-Trigger the Stoploss and Takegain strategies in case of
-                #   a sell action
-                # --------------------------------------------------------------
-                if event == "SELL":
-                    stoploss_value = 0
-                    takegain_value = 0
-
-                # --------------------------------------------------------------
-                #   Calculate the tax
-                # --------------------------------------------------------------
-                if event == "SELL":  # and cycle_profit > 0:
-                    cycle_profit = total_balance - cycle_balance
-                    # gainloss_latch = False
-                    if cycle_profit < 0:
-                        cycle_profit = 0
-                    tax_value = cycle_profit * tax_percentage
-                    # print(tax_total)
-                else:
-                    tax_value = 0
-
-                # --------------------------------------------------------------
-                #   Calculate the gain / balance
-                # --------------------------------------------------------------
-                if decision == "BUY" and pre_first_buy == False:
-                    total_balance = total_balance * perc_day
-                    # cycle_profit = cycle_profit + (close_today - close_prev) / close_prev
-
-                # --------------------------------------------------------------
-                #   Apply the tax and operation costs
-                # --------------------------------------------------------------
-                total_balance = total_balance - operation_cost_value - tax_value
-
-                # --------------------------------------------------------------
-                #   Doesn't let the value go below 0
-                # --------------------------------------------------------------
-                if total_balance <= 0:
-                    total_balance = 0
-
-                self.ohlc_dataset.iloc[i, self.ohlc_dataset.columns.get_loc(
-                    result_column)] = total_balance
-
-            i = i + 1
+        close = self.ohlc_dataset[source_column_close].to_numpy(dtype=float)
+        decision = self.convert_codes(dataframe=self.ohlc_dataset,
+                                      source_column=source_column_decision)
+        events = self.convert_codes(dataframe=self.ohlc_dataset,
+                                    source_column=source_column_events)
+
+        self.ohlc_dataset.loc[:, result_column] = self.simulate_performance_array(
+            close=close,
+            decision=decision,
+            events=events,
+            initial_value=initial_value,
+            stopgain=stopgain,
+            stoploss=stoploss,
+            operation_cost_fix=operation_cost_fix,
+            operation_cost_proportional=operation_cost_proportional,
+            operation_cost_min=operation_cost_min,
+            operation_cost_max=operation_cost_max,
+            tax_percentage=tax_percentage)
+
+    @staticmethod
+    def simulate_performance_array(close: np.ndarray,
+                                   decision: np.ndarray,
+                                   events: np.ndarray,
+                                   initial_value: float,
+                                   stopgain: float,
+                                   stoploss: float,
+                                   operation_cost_fix: float,
+                                   operation_cost_proportional: float,
+                                   operation_cost_min: float,
+                                   operation_cost_max: float,
+                                   tax_percentage: float,
+                                   state: dict = None):
+        """Simulation kernel for a strategy, working only on Numpy arrays.
+
+        For each new Buy event, a fixed amount is taken, to account for the
+        cost of operation (limited by a minimum and a maximum value). At the end
+        of an operation (sell), a percentage of the gain is removed, to account
+        for taxes. Stop loss and take gain limits are latched at the buy event
+        and force a sell once crossed.
+
+        The daily variation is calculated for the complete series at once. The
+        balance itself is a path dependent recurrence (the operation cost
+        depends on the current balance, and the latches on the previous
+        events), so it is iterated over native Python values, producing the
+        same results as the row by row calculation on the dataframe.
+
+        The variables carried between entries (balances, latches and the first
+        buy flag) can be passed and returned by ``state``, so a simulation can
+        be continued later with new entries (see ``Incremental``). In this
+        case, the first entry of the arrays is the last one already simulated.
+
+        Parameters
+        ----------
+            close: Numpy array
+                Closing values of the symbol.
+            decision: Numpy array
+                Codes of the recommendation (see ``Basic.convert_codes``).
+            events: Numpy array
+                Codes of the recommended events (see ``Basic.convert_codes``).
+            state: dict, optional
+                Variables of the simulation at the first entry. If not passed,
+                the simulation starts from ``initial_value``. If passed, the
+                dictionary is updated with the variables at the last entry.
+
+        Returns
+        -------
+            balance: Numpy array
+                Simulated balance for each entry of the series.
+
+        """
+        length = len(close)
+        balance = np.empty(length, dtype=float)
+        if length == 0:
+            return balance
+
+        if state is None:
+            variables = {}
+        else:
+            variables = state
+
+        pre_first_buy = variables.get("pre_first_buy", True)
+        cycle_balance = variables.get("cycle_balance", initial_value)
+        total_balance = variables.get("total_balance", initial_value)
+        takegain_value = variables.get("takegain_value", 0)
+        stoploss_value = variables.get("stoploss_value", 0)
+
+        balance[0] = total_balance
+
+        close = np.asarray(close, dtype=float)
+        perc_day = (1 + ((close[1:] - close[:-1]) / close[:-1])).tolist()
+        close = close.tolist()
+        decision_buy = (np.asarray(decision) == C.BUY).tolist()
+        events = np.asarray(events).tolist()
+
+        for i in range(1, length):
+
+            event = events[i]
+            buy = decision_buy[i]
+            close_prev = close[i - 1]
+
+            # ------------------------------------------------------------------
+            #   On the first SELL or HOLD, release the first buy flag. This is
+            #   done so in case the strategy starts with a BUY situation, it
+            #   won't be added in the calcualtion.
+            # ------------------------------------------------------------------
+            if event == C.SELL or event == C.HOLD:
+                pre_first_buy = False
+
+            # ------------------------------------------------------------------
+            #   Reduce the current position (balance) by a constant to account
+            #   for the cost of operation. Also resets the cycle gain.
+            # ------------------------------------------------------------------
+            if (event == C.BUY or event == C.SELL) and not pre_first_buy:
+                operation_cost_value = operation_cost_fix + \
+                    total_balance * operation_cost_proportional
+                if operation_cost_value < operation_cost_min:
+                    operation_cost_value = operation_cost_min
+                if operation_cost_value > operation_cost_max:
+                    operation_cost_value = operation_cost_max
+                cycle_balance = total_balance
+            else:
+                operation_cost_value = 0
+
+            # ------------------------------------------------------------------
+            #   Trigger the Stop loss and Take gain
+            # ------------------------------------------------------------------
+            if event == C.BUY and not pre_first_buy:
+                if stoploss < 1 and stoploss_value == 0:
+                    stoploss_value = close_prev * stoploss
+                if stopgain > 1 and takegain_value == 0:
+                    takegain_value = close_prev * stopgain
+
+            # ------------------------------------------------------------------
+            #   Apply stoploss or takegain limits
+            # ------------------------------------------------------------------
+            if stoploss_value > 0 and close_prev < stoploss_value and stoploss < 1:
+                takegain_value = 0
+                stoploss_value = 0
+                buy = False
+                event = C.SELL
+
+            if takegain_value > 0 and close_prev > takegain_value and stopgain > 1:
+                takegain_value = 0
+                stoploss_value = 0
+                buy = False
+                event = C.SELL
+
+            # ------------------------------------------------------------------
+            #   De-Trigger the Stoploss and Takegain strategies in case of a
+            #   sell action and calculate the tax
+            # ------------------------------------------------------------------
+            if event == C.SELL:
+                stoploss_value = 0
+                takegain_value = 0
+
+                cycle_profit = total_balance - cycle_balance
+                if cycle_profit < 0:
+                    cycle_profit = 0
+                tax_value = cycle_profit * tax_percentage
+            else:
+                tax_value = 0
+
+            # ------------------------------------------------------------------
+            #   Calculate the gain / balance and apply the tax and operation
+            #   costs. Doesn't let the value go below 0.
+            # ------------------------------------------------------------------
+            if buy and not pre_first_buy:
+                total_balance = total_balance * perc_day[i - 1]
+
+            total_balance = total_balance - operation_cost_value - tax_value
+
+            if total_balance <= 0:
+                total_balance = 0
+
+            balance[i] = total_balance
+
+        if state is not None:
+            state.update({"pre_first_buy": pre_first_buy,
+                          "cycle_balance": cycle_balance,
+                          "total_balance": total_balance,
+                          "takegain_value": takegain_value,
+                          "stoploss_value": stoploss_value})
+
+        return balance
 
     def calculate_reference(self,
                             source_column_close: str,
                             initial_value: float,
                             result_column: str = "",
                             result_dataframe: pd.DataFrame = None):
-        """Perfoms the simulation of the results for a given strategy.
+        """Perfoms the simulation of the buy-hold strategy, to be used as
+        reference for the other strategies.
+
+        The balance is the cumulative product of the daily variation, starting
+        from ``initial_value``, and is not allowed to go below 0.
         """
 
-        # ----------------------------------------------------------------------
-        #   Start of a initial value and create the new column.
-        # ----------------------------------------------------------------------
-        self.ohlc_dataset.loc[:, result_column] = initial_value
-
-        # ----------------------------------------------------------------------
-        #   Loop thru the moments the ticker was bought, so the results are
-        #   calculated. For each new Buy event, a fixed amount is taken, to
-        #   account for the cost of operation. At the end of an operation
-        #   (sell), a percentage of the gain is removed, to account for taxes.
-        # ----------------------------------------------------------------------
-        i = 0
-        total_balance = initial_value
-
-        for index, row in self.ohlc_dataset.iterrows():
-
-            if i > 0:
-                # --------------------------------------------------------------
-                #   Get the values for calculation and also calculate the
-                #   percentage factor.
-                # --------------------------------------------------------------
-                # decision = data_input.iloc[i][input_column_decision]
-                # event = data_input.iloc[i][input_column_decision_signal]
-                close_prev = self.ohlc_dataset.iloc[i - 1][source_column_close]
-                close_today = self.ohlc_dataset.iloc[i][source_column_close]
-
-                perc_day = 1 + ((close_today - close_prev) / close_prev)
-
-                # --------------------------------------------------------------
-                #   Calculate the gain / balance
-                # --------------------------------------------------------------
-                total_balance = total_balance * perc_day
-
-                # --------------------------------------------------------------
-                #   Doesn't let the value go below 0
-                # --------------------------------------------------------------
-                if total_balance <= 0:
-                    total_balance = 0
-
-                self.ohlc_dataset.iloc[i, self.ohlc_dataset.columns.get_loc(
-                    result_column)] = total_balance
-
-            i = i + 1
+        close = self.ohlc_dataset[source_column_close].to_numpy(dtype=float)
+
+        perc_day = 1 + ((close[1:] - close[:-1]) / close[:-1])
+        balance = np.cumprod(np.concatenate(([initial_value], perc_day)))
+        balance = balance[:len(close)]
+        balance[np.logical_or.accumulate(balance <= 0)] = 0
+
+        self.ohlc_dataset.loc[:, result_column] = balance
@@ -4,11 +4,13 @@ import pathlib
 import json
 from datetime import datetime
 from pathlib import Path
-from plotly.subplots import make_subplots
 from src.lib.config import Config
 
 LOGGER_NAME = "invst.report_analysis"
 
+# Display configuration of each method, loaded once per process.
+DISPLAY_CONFIGS = {}
+
 
 class ReportAnalysis:
 
@@ -28,11 +30,14 @@ class ReportAnalysis:
         module_split = module.__name__.split(".")
         method = module_split[-1]
 
-        config_file = Path.cwd().resolve() / "src" / "lib" / "analysis" / "methods" / "display_config" / \
-            f"{method}.json"
+        if method not in DISPLAY_CONFIGS:
+            config_file = Path.cwd().resolve() / "src" / "lib" / "analysis" / "methods" / "display_config" / \
+                f"{method}.json"
+
+            with open(config_file) as json_file:
+                DISPLAY_CONFIGS[method] = json.load(json_file)
 
-        with open(config_file) as json_file:
-            config_dict = json.load(json_file)
+        config_dict = DISPLAY_CONFIGS[method]
 
         self.config_general = config_dict["general"]
         self.config_components = config_dict["components"]
@@ -40,9 +45,17 @@ class ReportAnalysis:
         self.name = self.config_general["display_name"]
         self.savename = self.config_general["save_name"]
 
-        config_local_file = Path.cwd().resolve() / "cfg" / "local" / "local.json"
-        config = Config(logger_name=LOGGER_NAME)
-        config.load_config(filename=config_local_file)
+        # ----------------------------------------------------------------------
+        #   The local configuration comes from the context of the run, when
+        #   available (e.g. as part of the ``Analysis``).
+        # ----------------------------------------------------------------------
+        context = getattr(self, "context", None)
+        if context is not None:
+            config = context.config
+        else:
+            config_local_file = Path.cwd().resolve() / "cfg" / "local" / "local.json"
+            config = Config(logger_name=LOGGER_NAME)
+            config.load_config(filename=config_local_file)
         self.store_folder = Path(config.local_config["paths"]["data_storage"])
 
     def present_analysis(self):
@@ -61,6 +74,8 @@ class ReportAnalysis:
     def create_plot(self):
         """Generates the report for an analysis.
         """
+        from plotly.subplots import make_subplots
+
         today_string = datetime.today().strftime('%Y-%m-%d')
 
         # ----------------------------------------------------------------------
@@ -0,0 +1,204 @@
+"""Structuring of the data into sequences for the learning of the LSTM and
+the reverse operation for its predictions."""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class Sequences:
+
+    def create_dataset(self, dataset, input_sequence_length: int = 1, output_sequence_length: int = 1, shift_future: int = 0):
+        """Structures the data into sequences and labels for the learning. It's
+        done by breaking the data into sub-sequences and pairing to the
+        respective label (sequence or single value).
+
+        For example, in the case the predicted sequence has length one, a
+        dataset of `N` entries:
+
+        .. math::
+
+            \\text{Seq}_{N} = [x_{1}, x_{2}, x_{3}, x_{4}, \\ldots, x_{N}]
+
+        a sub-sequence of size `L` (where :math:`L < N`) to predict the next
+        point after the sequence, it would be defined as:
+
+        .. math::
+
+            \\text{SubSeq}_{i, L} = [x_{i}, x_{i+1}, x_{i+2}, \\ldots, x_{i+L}] \\rightarrow \\text{Predict: } x_{i+L+1}
+
+        As a numeric example, given :math:`\\text{Seq}` with 6 samples:
+
+        .. math::
+
+            \\text{Seq}_{6} = [x_{1}, x_{2}, x_{3}, x_{4}, x_{5}, x_{6}]
+
+        and using 3 samples to predict the next one, so the parameter
+        ``time_step`` is equal to 3:
+
+        .. math::
+
+            \\text{SubSeq}_{1, 3} = \\left[ x_{1}, x_{2}, x_{3} \\right] \\rightarrow \\text{Predict: } x_{4}
+
+            \\text{SubSeq}_{2, 3} = \\left[ x_{2}, x_{3}, x_{4} \\right] \\rightarrow \\text{Predict: } x_{5}
+
+            \\text{SubSeq}_{3, 3} = \\left[ x_{3}, x_{4}, x_{5} \\right] \\rightarrow \\text{Predict: } x_{6}
+
+        Example (predicted length greater than one):
+
+        .. image:: _static/images/drawing_lstm_structure.png
+            :width: 600
+            :align: center
+            :alt: Example of data structure
+
+        Parameters
+        ----------
+            dataset: data
+                Name of the column in the Pandas Dataframe to be used for the
+                calculation of the moving average.
+            input_sequence_length: integer, optional
+                Length of the sequences.
+            output_sequence_length: integer, optional
+                Length of the sequences.
+            shift_future: integer, optional
+                Length of the sequences.
+
+        The sequences are strided views of ``dataset`` (no copy of the data),
+        so the memory is only allocated when the model requires a contiguous
+        array.
+
+        Returns
+        -------
+            sequences: Numpy array
+                Array of sequence arrays paired to the labels.
+            labels: Numpy array
+                Array of labels paired to the sequence arrays.
+
+        """
+        if input_sequence_length == len(dataset):
+            return np.array([dataset]), np.array([])
+
+        dataset = np.asarray(dataset)
+        count = len(dataset) - input_sequence_length - output_sequence_length + 1
+        if count <= 0:
+            return np.array([]), np.array([])
+
+        # ----------------------------------------------------------------------
+        #   The window dimension is added by Numpy as the last one, so it is
+        #   moved to be the second, followed by the features (if any).
+        # ----------------------------------------------------------------------
+        sequences = np.moveaxis(
+            sliding_window_view(dataset, input_sequence_length, axis=0), -1, 1)
+
+        start_label = input_sequence_length + shift_future
+        if output_sequence_length == 1:
+            labels = dataset[start_label:]
+        else:
+            labels = np.moveaxis(
+                sliding_window_view(dataset[start_label:],
+                                    output_sequence_length, axis=0), -1, 1)
+
+        # ----------------------------------------------------------------------
+        #   Only the sequences with a complete label are used.
+        # ----------------------------------------------------------------------
+        count = min(count, len(labels))
+
+        return sequences[:count], labels[:count]
+
+    def squash_output(self, data, mode: str = "average"):
+        """Combines the overlapping results from the steps into a single
+        sequence of values. The combination can be done by different methods:
+
+        1. Average.
+        2. Last.
+        3. First.
+        4. Weighted average (linear weigths, with highest weight to the last
+           value).
+
+        The squashing is the reverse operation from the ``create_dataset``
+        method. To illustrate it, an example of a 7 elements is presented below:
+
+        .. image:: _static/images/drawing_lstm_squash.png
+            :width: 600
+            :align: center
+            :alt: Example of data squashing
+
+        Incide each cell (value), the index is written, so first the data
+        element index and then the index inside this vector. The last value is
+        always 0, since we have here only 2 dimensions.
+
+        To represent the operation, the same data is represented below, just
+        rearranging it. The colors are used to indicate the tracking of the
+        "movement":
+
+        .. image:: _static/images/drawing_lstm_rearrange.png
+            :width: 600
+            :align: center
+            :alt: Example of rearrangement
+
+        The important point is to note that **each level has an unique sum of
+        the indexes**, so the first anti-diagonal cut is denoted by sum 0,
+        the second anti-diagonal cut by sum equal to 1, and so one.
+
+        A second note is that the initial part and final part of the squashing
+        have less elements to be used.
+
+        So the squashing is an overlap-add: each value is accumulated into the
+        position given by the sum of its indexes, along with the count of values
+        (or the sum of the weights) of the position, which divides the result.
+        The values of each position are accumulated in the order of the first
+        index, the same order of the individual predictions.
+
+        Parameters
+        ----------
+            data: np.array
+                Data to be squashed.
+            mode: string, optional
+                The method to be used for the combination of the values. The
+                possible methods are:
+
+                * ``average``
+                * ``last``
+                * ``first``
+                * ``weighted-average``
+
+        Returns
+        -------
+            results: np.array
+                List of values from ``data`` squashed into a single dimension
+                vector. The size of the output is given by the first dimension
+                of data added to its second dimension.
+
+        """
+        if data.shape[0] == 1 or (len(data.shape) == 2 and data.shape[1] == 1):
+            return data.flatten().reshape(-1, 1)
+
+        rows, columns = data.shape[0], data.shape[1]
+        values = data.reshape(rows, columns, -1)[:, :, 0]
+
+        # ----------------------------------------------------------------------
+        #   Position (sum of the indexes) of each value and the first and last
+        #   index of the rows contributing to each position.
+        # ----------------------------------------------------------------------
+        index_row = np.repeat(np.arange(rows), columns)
+        position = (index_row.reshape(rows, columns) + np.arange(columns)).ravel()
+        length = rows + columns - 1
+        first_row = np.maximum(0, np.arange(length) - (columns - 1))
+        last_row = np.minimum(np.arange(length), rows - 1)
+
+        if mode == "average":
+            results = (np.bincount(position, weights=values.ravel(), minlength=length)
+                       / np.bincount(position, minlength=length))
+        elif mode == "last":
+            # The value from the first row reaching the position
+            results = values[first_row, np.arange(length) - first_row]
+        elif mode == "first":
+            # The value from the last row reaching the position
+            results = values[last_row, np.arange(length) - last_row]
+        elif mode == "weighted-average":
+            weights = (index_row - first_row[position] + 1).astype(float)
+            results = (np.bincount(position, weights=weights * values.ravel(), minlength=length)
+                       / np.bincount(position, weights=weights, minlength=length))
+        else:
+            results = np.array([])
+
+        return results.reshape(-1, 1)
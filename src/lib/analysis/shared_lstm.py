@@ -0,0 +1,157 @@
+import numpy as np
+from src.lib.analysis.model_registry import SHARED_SYMBOL
+from src.lib.analysis.windows import Windows
+
+
+class SharedLSTM:
+    """Single LSTM model shared by several symbols (``lstm_shared_model``),
+    instead of one model per symbol.
+
+    The series of each symbol is normalized independently (with its own
+    scaler, see ``LSTM.prepare_LSTM``), and the sequences from all the symbols
+    are pooled into one training set. The model is stored as the one of
+    ``SHARED_SYMBOL``, so it is trained once for the complete universe (by the
+    training worker) and the prediction for all the symbols is done with a
+    single call of the model.
+
+    The methods receive the list of ``Analysis`` objects, which are already
+    prepared and have the indicator to be predicted calculated.
+    """
+
+    def pool_LSTM(self, analyses: list, source_column: str):
+        """Prepares the sequences of each symbol for the LSTM.
+
+        Returns
+        -------
+            lstm_data: list
+                List with the data from ``LSTM.prepare_LSTM`` for each
+                ``Analysis``, in the same order.
+
+        """
+        return [analysis.prepare_LSTM(dataframe=analysis.ohlc_dataset,
+                                      source_column=source_column,
+                                      sequence_length=analysis.sequence_length,
+                                      prediction_length=analysis.prediction_length)
+                for analysis in analyses]
+
+    def train_shared_LSTM(self, analyses: list, source_column: str = "MACD Histogram"):
+        """Trains (or fine-tunes) the shared model with the pooled sequences
+        from all the symbols. The samples are ordered by the date of their
+        last label, so the most recent samples of the universe are used to
+        evaluate the loss after the fine-tuning.
+
+        Parameters
+        ----------
+            analyses: list
+                List of ``Analysis`` objects.
+            source_column: str, optional
+                Name of the column to be predicted.
+
+        Returns
+        -------
+            lstm_training: dict
+                Origin of the model, epochs trained and duration of the
+                training, with the column as key.
+
+        """
+        lstm_data = self.pool_LSTM(analyses=analyses, source_column=source_column)
+
+        sample_dates = np.concatenate([data["sample_dates"] for data in lstm_data])
+        order = np.argsort(sample_dates, kind="stable")
+
+        # ----------------------------------------------------------------------
+        #   The samples are kept as views of the sequences of each symbol, and
+        #   only copied batch by batch during the training.
+        # ----------------------------------------------------------------------
+        windows = Windows(sequences=[data["x_train"] for data in lstm_data],
+                          labels=[data["y_train"] for data in lstm_data],
+                          order=order)
+
+        self.logger.info("Training the shared LSTM model with %s samples from %s symbols.",
+                         len(windows), len(analyses))
+
+        analysis = analyses[0]
+        analysis.create_lstm_model(X=windows,
+                                   Y=None,
+                                   number_blocks=analysis.config.lstm_number_blocks,
+                                   epochs=analysis.config.lstm_epochs,
+                                   sequence_length=analysis.sequence_length,
+                                   prediction_length=analysis.prediction_length,
+                                   number_features=analysis.config.lstm_number_features,
+                                   hidden_neurons=analysis.config.lstm_hidden_neurons,
+                                   save_model=True,
+                                   source_column=source_column,
+                                   sample_dates=sample_dates[order],
+                                   train=True,
+                                   symbol=SHARED_SYMBOL)
+
+        return {source_column: analysis.lstm_training[source_column]}
+
+    def predict_shared_LSTM(self, analyses: list,
+                            source_column: str = "MACD Histogram",
+                            result_column: str = "MACD Histogram Fit",
+                            extend_original_data: bool = True):
+        """Predicts the column for all the symbols with the shared model, with
+        a single call of the model for the sequences of all the symbols. The
+        results are written to the dataframe of each symbol as done by
+        ``LSTM.calc_LSTM``.
+
+        Parameters
+        ----------
+            analyses: list
+                List of ``Analysis`` objects.
+            source_column: str, optional
+                Name of the column to be predicted.
+            result_column: str, optional
+                Name of the column with the fitted values.
+            extend_original_data: bool, optional
+                If ``True``, the prediction is also written to the prediction
+                entries of ``source_column``.
+
+        """
+        if not analyses:
+            return
+
+        lstm_data = self.pool_LSTM(analyses=analyses, source_column=source_column)
+
+        analysis = analyses[0]
+        model = analysis.create_lstm_model(X=None,
+                                           Y=None,
+                                           number_blocks=analysis.config.lstm_number_blocks,
+                                           epochs=analysis.config.lstm_epochs,
+                                           sequence_length=analysis.sequence_length,
+                                           prediction_length=analysis.prediction_length,
+                                           number_features=analysis.config.lstm_number_features,
+                                           hidden_neurons=analysis.config.lstm_hidden_neurons,
+                                           save_model=True,
+                                           source_column=source_column,
+                                           train=False,
+                                           symbol=SHARED_SYMBOL)
+        training = analysis.lstm_training[source_column]
+
+        # ----------------------------------------------------------------------
+        #   The training and prediction sequences from all the symbols go
+        #   through the model at once, and are split back afterwards.
+        # ----------------------------------------------------------------------
+        if model is not None:
+            inputs = ([data["x_train"] for data in lstm_data] +
+                      [data["x_test"] for data in lstm_data])
+            sizes = np.cumsum([len(x) for x in inputs])[:-1]
+            outputs = np.split(model.predict(np.concatenate(inputs)), sizes)
+
+        for i, analysis in enumerate(analyses):
+            analysis.lstm_training[source_column] = dict(training)
+
+            if model is None:
+                analysis.clear_LSTM(dataframe=analysis.ohlc_dataset,
+                                    source_column=source_column,
+                                    result_column=result_column)
+                continue
+
+            analysis.store_LSTM(dataframe=analysis.ohlc_dataset,
+                                lstm_data=lstm_data[i],
+                                train_predict=outputs[i],
+                                test_predict=outputs[len(analyses) + i],
+                                source_column=source_column,
+                                extend_original_data=extend_original_data,
+                                result_column=result_column)
@@ -0,0 +1,120 @@
+"""Training samples of the LSTM built on the fly from the sequences of one or
+more series, so the training only allocates memory for one batch at a time
+instead of the complete (and mostly duplicated) set of sequences."""
+
+import numpy as np
+
+
+class Windows:
+    """Samples (sequence and label) of one or more series, kept as the strided
+    views from ``Sequences.create_dataset``. A sample is only copied into a
+    contiguous array when it is part of a batch (see ``batches``) or taken
+    explicitly (see ``take``).
+
+    Attributes
+    ----------
+        sequences: list
+            Sequences of each series, with shape ``(samples, steps, features)``.
+        labels: list
+            Labels of each series, paired to the sequences.
+        source: np.ndarray
+            Series of each sample.
+        row: np.ndarray
+            Position of each sample in the sequences of its series.
+    """
+
+    def __init__(self, sequences: list, labels: list, order: np.ndarray = None):
+        """
+        Parameters
+        ----------
+            sequences: list
+                Sequences of each series.
+            labels: list
+                Labels of each series.
+            order: np.ndarray, optional
+                Order of the samples (e.g. by date), as indices of the samples
+                of all the series one after the other.
+        """
+        self.sequences = list(sequences)
+        self.labels = list(labels)
+
+        sizes = [len(sequence) for sequence in self.sequences]
+        self.source = np.repeat(np.arange(len(sizes)), sizes)
+        self.row = np.concatenate([np.arange(size) for size in sizes]
+                                  or [np.array([], dtype=int)])
+
+        if order is not None:
+            self.source = self.source[order]
+            self.row = self.row[order]
+
+    def __len__(self):
+        return len(self.source)
+
+    def subset(self, samples):
+        """Windows with only part of the samples (indices or boolean mask),
+        without copying the data."""
+        windows = Windows.__new__(Windows)
+        windows.sequences = self.sequences
+        windows.labels = self.labels
+        windows.source = self.source[samples]
+        windows.row = self.row[samples]
+
+        return windows
+
+    def split(self, ratio: float):
+        """Splits the samples into training and validation, with the last
+        ``ratio`` of the samples for the validation (same as the
+        ``validation_split`` from Keras)."""
+        split_at = int(np.floor(len(self) * (1.0 - ratio)))
+
+        return self.subset(slice(0, split_at)), self.subset(slice(split_at, None))
+
+    def take(self, samples=None, dtype=None):
+        """Copies the samples into contiguous arrays.
+
+        Parameters
+        ----------
+            samples: indices, slice or boolean mask, optional
+                Samples to be taken. All the samples if not passed.
+            dtype: optional
+                Type of the arrays. The type of the series if not passed.
+
+        Returns
+        -------
+            X: np.ndarray
+                Sequences of the samples.
+            Y: np.ndarray
+                Labels of the samples.
+
+        """
+        source = self.source if samples is None else self.source[samples]
+        row = self.row if samples is None else self.row[samples]
+
+        x = np.empty((len(source),) + self.sequences[0].shape[1:],
+                     dtype=dtype or self.sequences[0].dtype)
+        y = np.empty((len(source),) + self.labels[0].shape[1:],
+                     dtype=dtype or self.labels[0].dtype)
+
+        for i in np.unique(source):
+            selected = source == i
+            x[selected] = self.sequences[i][row[selected]]
+            y[selected] = self.labels[i][row[selected]]
+
+        return x, y
+
+    def batches(self, batch_size: int, shuffle: bool = False, seed=None, dtype=np.float32):
+        """Generator of batches of samples, in the order of the samples or
+        shuffled (new order for each call, as done by Keras for each epoch).
+
+        Yields
+        ------
+            x, y: np.ndarray
+                Sequences and labels of the batch.
+
+        """
+        samples = np.arange(len(self))
+        if shuffle:
+            np.random.default_rng(seed).shuffle(samples)
+
+        for start in range(0, len(samples), batch_size):
+            yield self.take(samples[start:start + batch_size], dtype=dtype)
@@ -1,5 +1,4 @@
 import json
-import requests
 import time
 from src.lib import messages as M
 
@@ -29,7 +28,7 @@ class Access:
                 'Accept': 'application/json',
             }
 
-            response = requests.request(
+            response = self.http.request(
                 "POST", url, headers=headers, data=payload)
             response_body_json = json.loads(response.text)
             response_headers_json = dict(response.headers)
@@ -81,7 +80,7 @@ class Access:
                 'Content-Type': 'application/json',
             }
 
-            response = requests.request(
+            response = self.http.request(
                 "GET", url, headers=headers, data=payload)
 
             response_body_json = json.loads(response.text)
@@ -137,7 +136,7 @@ class Access:
                 'Content-Type': 'application/json',
             }
 
-            response = requests.request(
+            response = self.http.request(
                 "POST", url, headers=headers, data=payload)
             response_body_json = json.loads(response.text)
             response_headers_json = dict(response.headers)
@@ -218,7 +217,7 @@ class Access:
                 'x-once-authentication': '',
             }
 
-            response = requests.request(
+            response = self.http.request(
                 "PATCH", url, headers=headers, data=payload)
             response_body_json = json.loads(response.text)
             response_headers_json = dict(response.headers)
@@ -266,7 +265,7 @@ class Access:
                 'Accept': 'application/json',
             }
 
-            response = requests.request(
+            response = self.http.request(
                 "POST", url, headers=headers, data=payload)
             response_body_json = json.loads(response.text)
             response_headers_json = dict(response.headers)
@@ -330,7 +329,7 @@ class Access:
             'Authorization': f'Bearer {self.access_token}'
         }
 
-        response = requests.request(
+        response = self.http.request(
             "DELETE", url, headers=headers, data=payload)
 
         if response.text == "":
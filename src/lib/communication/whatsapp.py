@@ -2,7 +2,6 @@
 import logging
 import time
 import re
-from twilio.rest import Client
 from src.lib import constants as C
 from src.lib import messages as M
 
@@ -10,6 +9,7 @@ from src.lib import messages as M
 class Whatsapp:
 
     def wapp_initialize(self):
+        from twilio.rest import Client
 
         self.client = Client(self.wapp_account_sid, self.wapp_auth_token)
 
@@ -47,10 +47,12 @@ class Config:
 
         self.api_data = None
         self.user_data = None
+        self.http_config = None
 
         self.data_source_fetch_name = None
         self.data_source_fetch_access_data = None
         self.data_source_fetch_user_data = None
+        self.data_source_fetch_rate_limit = None
 
         self.data_source_trade_name = None
         self.data_source_trade_access_data = None
@@ -84,8 +86,30 @@ class Config:
         # ---------------- Execution Block -------------------------------------
         self.time_sleep = None
         self.lstm_model_age = None
+        self.lstm_model_cache_size = None
+        self.lstm_finetune = None
+        self.lstm_finetune_epochs = None
+        self.lstm_finetune_patience = None
+        self.lstm_finetune_tolerance = None
+        self.lstm_training_budget = None
+        self.lstm_train_in_analysis = None
+        self.lstm_numpy_inference = None
+        self.lstm_shared_model = None
+        self.lstm_stream_training = None
+        self.forecaster = None
         self.display_analysis = None
         self.save_analysis = None
+        self.panel_analysis = None
+        self.incremental_analysis = None
+        self.workers = None
+        self.tf_threads = None
+        self.ohlc_store = None
+        self.ohlc_store_max_age = None
+        self.cloud_sql_idle_timeout = None
+        self.cloud_sql_status_max_age = None
+        self.mysql_pool_size = None
+        self.mysql_bulk_mode = None
+        self.mysql_bulk_rows = None
 
         # ---------------- Analysis Block --------------------------------------
         self.analysis_length_pre = None
@@ -97,6 +121,10 @@ class Config:
         self.lstm_epochs = None
         self.lstm_normalization_lower = None
         self.lstm_normalization_upper = None
+        self.lstm_batch_size = None
+        self.lstm_validation_split = None
+        self.lstm_early_stopping_patience = None
+        self.lstm_early_stopping_min_delta = None
 
         # ---------------- Simulation Block ------------------------------------
         self.analysis_length_post = None
@@ -182,11 +210,14 @@ class Config:
             # ------------------------------------------------------------------
             try:
                 self.api_data = self.json_data["api"]
+                self.http_config = self.json_data["api"].get("http")
 
                 self.data_source_fetch_name = self.json_data[
                     "api"]["fetching"]["selection"]
                 self.data_source_fetch_access_data = self.json_data[
                     "api"]["fetching"][self.data_source_fetch_name]["access_data"]
+                self.data_source_fetch_rate_limit = self.json_data[
+                    "api"]["fetching"][self.data_source_fetch_name].get("rate_limit")
 
                 self.data_source_trade_name = self.json_data[
                     "api"]["trading"]["selection"]
@@ -286,8 +317,60 @@ class Config:
             # ---------------- Execution Block ---------------------------------
             self.time_sleep = self.parameters["execution"]["time_sleep"]["value"]
             self.lstm_model_age = self.parameters["execution"]["lstm_model_age"]["value"]
+            self.lstm_model_cache_size = self.get_key(
+                "parameters", ["execution", "lstm_model_cache_size", "value"], 0) or 0
+            self.lstm_finetune = self.get_key(
+                "parameters", ["execution", "lstm_finetune", "value"], False)
+            self.lstm_finetune_epochs = self.get_key(
+                "parameters", ["execution", "lstm_finetune_epochs", "value"], 10) or 10
+            # A patience or tolerance of 0 is valid, so the default is only
+            # used when the value is missing.
+            lstm_finetune_patience = self.get_key(
+                "parameters", ["execution", "lstm_finetune_patience", "value"], 2)
+            self.lstm_finetune_patience = (lstm_finetune_patience
+                                           if isinstance(lstm_finetune_patience, (int, float))
+                                           else 2)
+            lstm_finetune_tolerance = self.get_key(
+                "parameters", ["execution", "lstm_finetune_tolerance", "value"], 0.25)
+            self.lstm_finetune_tolerance = (lstm_finetune_tolerance
+                                            if isinstance(lstm_finetune_tolerance, (int, float))
+                                            else 0.25)
             self.display_analysis = self.parameters["execution"]["display_analysis"]["value"]
             self.save_analysis = self.parameters["execution"]["save_analysis"]["value"]
+            self.panel_analysis = self.get_key(
+                "parameters", ["execution", "panel_analysis", "value"], False)
+            self.incremental_analysis = self.get_key(
+                "parameters", ["execution", "incremental_analysis", "value"], False)
+            self.workers = self.get_key(
+                "parameters", ["execution", "workers", "value"], 1) or 1
+            self.tf_threads = self.get_key(
+                "parameters", ["execution", "tf_threads", "value"], 0) or 0
+            self.ohlc_store = self.get_key(
+                "parameters", ["execution", "ohlc_store", "value"], False)
+            self.ohlc_store_max_age = self.get_key(
+                "parameters", ["execution", "ohlc_store_max_age", "value"], 0) or 0
+            self.cloud_sql_idle_timeout = self.get_key(
+                "parameters", ["execution", "cloud_sql_idle_timeout", "value"], 0) or 0
+            self.cloud_sql_status_max_age = self.get_key(
+                "parameters", ["execution", "cloud_sql_status_max_age", "value"], 0) or 0
+            self.mysql_pool_size = self.get_key(
+                "parameters", ["execution", "mysql_pool_size", "value"], 4) or 4
+            self.mysql_bulk_mode = self.get_key(
+                "parameters", ["execution", "mysql_bulk_mode", "value"], "insert") or "insert"
+            self.mysql_bulk_rows = self.get_key(
+                "parameters", ["execution", "mysql_bulk_rows", "value"], 1000) or 1000
+            self.lstm_training_budget = self.get_key(
+                "parameters", ["execution", "lstm_training_budget", "value"], 0) or 0
+            self.lstm_train_in_analysis = self.get_key(
+                "parameters", ["execution", "lstm_train_in_analysis", "value"], False)
+            self.lstm_numpy_inference = self.get_key(
+                "parameters", ["execution", "lstm_numpy_inference", "value"], False)
+            self.lstm_shared_model = self.get_key(
+                "parameters", ["execution", "lstm_shared_model", "value"], False)
+            self.lstm_stream_training = self.get_key(
+                "parameters", ["execution", "lstm_stream_training", "value"], False)
+            self.forecaster = self.get_key(
+                "parameters", ["execution", "forecaster", "value"], "lstm") or "lstm"
 
             # ---------------- Analysis Block ----------------------------------
             self.analysis_length_pre = self.parameters["analysis"]["length_analysis"]["value"]
@@ -301,6 +384,14 @@ class Config:
                 "analysis"]["lstm_normalization_lower"]["value"]
             self.lstm_normalization_upper = self.parameters[
                 "analysis"]["lstm_normalization_upper"]["value"]
+            self.lstm_batch_size = self.get_key(
+                "parameters", ["analysis", "lstm_batch_size", "value"], 32) or 32
+            self.lstm_validation_split = self.get_key(
+                "parameters", ["analysis", "lstm_validation_split", "value"], 0) or 0
+            self.lstm_early_stopping_patience = self.get_key(
+                "parameters", ["analysis", "lstm_early_stopping_patience", "value"], 0) or 0
+            self.lstm_early_stopping_min_delta = self.get_key(
+                "parameters", ["analysis", "lstm_early_stopping_min_delta", "value"], 0) or 0
 
             # ---------------- Simulation Block --------------------------------
             self.analysis_length_post = self.parameters["simulation"]["length_analysis"]["value"]
@@ -45,3 +45,18 @@ UPDATE = 2
 # ------------------------------------------------------------------------------
 ERROR_BUY = 9999
 ERROR_SELL = -9999
+
+# ------------------------------------------------------------------------------
+#   Parameters of the strategies, shared by the analysis of a single symbol,
+#   of the panel and the incremental analysis, so their results are the same.
+#   The names of the columns (e.g. ``MACD EMA 12``) are kept as they are.
+# ------------------------------------------------------------------------------
+MACD_LENGTH_FAST = 12
+MACD_LENGTH_SLOW = 26
+MACD_LENGTH_SIGNAL = 9
+MACD_THRESHOLD = 0.0
+RSI_LENGTH = 14
+RSI_THRESHOLD_UPPER = 70
+RSI_THRESHOLD_LOWER = 30
+BBANDS_LENGTH = 20
+BBANDS_WIDTH = 2
@@ -1,9 +1,7 @@
 from datetime import datetime
 import json
 import logging
-import requests
 import pandas as pd
-import matplotlib.dates as mdates
 from src.lib import constants as C
 from src.lib import messages as M
 
@@ -40,10 +38,16 @@ class AlphaVantage:
         )
         url = url.replace("[TICKER]", self.ticker)
 
+        # ----------------------------------------------------------------------
+        #   Only the last 100 entries, when the older ones are already stored.
+        # ----------------------------------------------------------------------
+        if self.fetch_compact:
+            url = url.replace("outputsize=full", "outputsize=compact")
+
         # ----------------------------------------------------------------------
         #   Gets the access
         # ----------------------------------------------------------------------
-        r = requests.get(url)
+        r = self.http.get(url)
         response = json.loads(r.text)
 
         if r.status_code == 200:
@@ -98,6 +102,8 @@ class AlphaVantage:
         9. ``Split Coefficient``
 
         """
+        import matplotlib.dates as mdates
+
         # ----------------------------------------------------------------------
         #   Reorganize the disctionaries and split them.
         #   Data sample will take the first element of the dicture, just to
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+class LocalStore:
+    """Local storage of the OHLC data of each ticker, so only the entries
+    missing since the last fetch are requested to the provider (delta fetch).
+
+    The data is stored as one Pandas pickle per ticker (columnar, without
+    additional dependencies), along with a JSON file with the metadata of the
+    store (provider, date of the last update, range of dates, etc.).
+
+    A delta fetch always overlaps with the last stored entries. The overlapping
+    entries are compared to the stored ones, and if the provider changed them
+    (e.g. the adjusted closing values after a split or dividend) the history is
+    considered revised and must be fetched completely again. The last stored
+    entry is excluded from this comparison, since it may have been stored
+    before the end of the trading day.
+
+    The configuration of the store (attribute ``store``) is a dictionary:
+
+    .. code-block:: python
+
+        {
+            "folder": Path("data/ohlc"),
+            "max_age": 12,  # Hours before the store is considered stale
+        }
+
+    """
+
+    STORE_VERSION = 1
+    STORE_OVERLAP_DAYS = 7
+    STORE_TOLERANCE = 1e-6
+
+    # --------------------------------------------------------------------------
+    #   Ranges accepted by the Yahoo Finance API and the number of calendar
+    #   days covered by them. AlphaVantage accepts only the full history or the
+    #   compact one (last 100 entries, about 140 calendar days).
+    # --------------------------------------------------------------------------
+    STORE_RANGES_YAHOO = [("5d", 5), ("1mo", 28), ("3mo", 90), ("6mo", 180),
+                          ("1y", 365), ("2y", 730), ("5y", 1825)]
+    STORE_COMPACT_DAYS_ALPHAVANTAGE = 140
+
+    def store_paths(self):
+        """Location of the files with the data and the metadata."""
+        folder = Path(self.store["folder"])
+
+        return folder / f"{self.ticker}.pkl", folder / f"{self.ticker}.json"
+
+    def load_store(self):
+        """Loads the stored data for the ticker.
+
+        Returns
+        -------
+            data: Pandas dataframe
+                Stored data, or ``None`` if there is no valid store (e.g.
+                created for another provider).
+            metadata: dict
+                Metadata of the store, or ``None``.
+
+        """
+        metadata = self.load_store_metadata(adjusted=self.adjusted)
+        if metadata is None:
+            return None, None
+
+        data_path, metadata_path = self.store_paths()
+
+        return pd.read_pickle(data_path), metadata
+
+    def load_store_metadata(self, adjusted: bool):
+        """Loads the metadata of the store for the ticker, if the store exists
+        and was created with the same provider and adjustment."""
+        data_path, metadata_path = self.store_paths()
+        if not data_path.exists() or not metadata_path.exists():
+            return None
+
+        with open(metadata_path, "r") as json_file:
+            metadata = json.load(json_file)
+
+        if (metadata.get("version") != self.STORE_VERSION or
+                metadata.get("source") != self.source or
+                metadata.get("adjusted") != adjusted):
+            return None
+
+        return metadata
+
+    def store_is_current(self, adjusted: bool = True):
+        """Checks if the stored data can be used without any fetch, so the
+        caller doesn't need to wait for the rate limit of the provider."""
+        if self.store is None:
+            return False
+
+        metadata = self.load_store_metadata(adjusted=adjusted)
+
+        return metadata is not None and self.store_is_fresh(metadata)
+
+    def save_store(self, data: pd.DataFrame, full: bool, metadata: dict = None):
+        """Stores the data for the ticker, updating the metadata.
+
+        Parameters
+        ----------
+            data: Pandas dataframe
+                Complete data for the ticker.
+            full: bool
+                Indicates if the complete history was fetched.
+            metadata: dict, optional
+                Previous metadata of the store.
+
+        """
+        data_path, metadata_path = self.store_paths()
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        now = datetime.now(timezone.utc).isoformat()
+        if metadata is None:
+            metadata = {}
+
+        metadata.update({
+            "version": self.STORE_VERSION,
+            "ticker": self.ticker,
+            "source": self.source,
+            "adjusted": self.adjusted,
+            "last_update": now,
+            "first_date": str(data.index[0]),
+            "last_date": str(data.index[-1]),
+            "entries": len(data),
+        })
+        if full:
+            metadata["last_full_update"] = now
+
+        data.to_pickle(data_path)
+        with open(metadata_path, "w") as json_file:
+            json.dump(metadata, json_file, indent=4)
+
+    def store_is_fresh(self, metadata: dict):
+        """Checks if the store was updated less than ``max_age`` hours ago."""
+        last_update = datetime.fromisoformat(metadata["last_update"])
+        age = datetime.now(timezone.utc) - last_update
+
+        return age.total_seconds() < self.store["max_age"] * 3600
+
+    def set_delta_range(self, metadata: dict):
+        """Defines the range to be requested to the provider, covering the
+        period since the last stored entry plus an overlap.
+
+        Returns
+        -------
+            delta: bool
+                ``True`` if a reduced range is requested, ``False`` if the
+                complete history is needed.
+
+        """
+        last_date = pd.Timestamp(metadata["last_date"])
+        days = (pd.Timestamp.now() - last_date).days + self.STORE_OVERLAP_DAYS
+
+        if self.source == "YahooFinance":
+            for fetch_range, range_days in self.STORE_RANGES_YAHOO:
+                if days <= range_days:
+                    self.fetch_range = fetch_range
+                    return True
+
+        elif self.source == "AlphaVantage":
+            if days <= self.STORE_COMPACT_DAYS_ALPHAVANTAGE:
+                self.fetch_compact = True
+                return True
+
+        return False
+
+    def merge_store(self, stored: pd.DataFrame, delta: pd.DataFrame):
+        """Appends the entries from the delta fetch to the stored data.
+
+        Returns
+        -------
+            data: Pandas dataframe
+                Merged data, or ``None`` if the history was revised by the
+                provider (or the delta doesn't overlap with the stored data).
+
+        """
+        stored_dates = stored.index.normalize()
+        delta_dates = delta.index.normalize()
+
+        # ----------------------------------------------------------------------
+        #   The delta must start inside the stored range, otherwise there might
+        #   be missing entries between them.
+        # ----------------------------------------------------------------------
+        if len(delta) == 0 or delta_dates[0] > stored_dates[-1]:
+            return None
+
+        # ----------------------------------------------------------------------
+        #   Verifies the overlapping entries (except the last stored one), for
+        #   changes in the adjusted values.
+        # ----------------------------------------------------------------------
+        overlap = stored_dates[:-1].intersection(delta_dates)
+        stored_close = pd.Series(stored["Close Final"].to_numpy(dtype=float),
+                                 index=stored_dates)
+        delta_close = pd.Series(delta["Close Final"].to_numpy(dtype=float),
+                                index=delta_dates)
+        if not np.allclose(stored_close.loc[overlap].to_numpy(),
+                           delta_close.loc[overlap].to_numpy(),
+                           rtol=self.STORE_TOLERANCE, equal_nan=True):
+            return None
+
+        # ----------------------------------------------------------------------
+        #   A split in the new entries changes the previous ones as well.
+        # ----------------------------------------------------------------------
+        new_entries = delta[delta_dates >= stored_dates[-1]]
+        splits = pd.to_numeric(new_entries["Split Coefficient"],
+                               errors="coerce").dropna()
+        if ((splits != 1) & (splits != 0)).any():
+            return None
+
+        return pd.concat([stored[stored_dates < stored_dates[-1]], new_entries])
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter for the requests to a provider.
+
+    The bucket holds up to ``requests`` tokens and is refilled continuously at
+    ``requests`` tokens every ``period`` seconds. Each request takes one token,
+    waiting for it if the bucket is empty. This allows short bursts up to the
+    limit of the provider (e.g. 5 requests per minute for AlphaVantage) without
+    a fixed pause before every request.
+
+    Attributes
+    ----------
+        requests: `int`
+            Maximum number of requests in a period (capacity of the bucket).
+        period: `float`
+            Length of the period, in seconds.
+        clock: `function`
+            Monotonic clock in seconds.
+    """
+
+    def __init__(self, requests: int, period: float, clock=time.monotonic):
+        self.requests = requests
+        self.period = period
+        self.clock = clock
+
+        self.tokens = float(requests)
+        self.last_refill = self.clock()
+        self.lock = None
+
+    def refill(self):
+        """Adds the tokens accumulated since the last refill."""
+        now = self.clock()
+        self.tokens = min(float(self.requests),
+                          self.tokens + (now - self.last_refill) * self.requests / self.period)
+        self.last_refill = now
+
+    def wait_time(self):
+        """Time, in seconds, until a token is available."""
+        self.refill()
+        if self.tokens >= 1:
+            return 0.0
+
+        return (1 - self.tokens) * self.period / self.requests
+
+    async def acquire(self):
+        """Takes a token from the bucket, waiting until one is available. The
+        requests waiting are served in order of arrival.
+        """
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+
+        async with self.lock:
+            wait = self.wait_time()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.wait_time()
+            self.tokens = self.tokens - 1
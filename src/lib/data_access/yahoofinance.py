@@ -1,6 +1,5 @@
 from datetime import datetime
 import json
-import requests
 import pandas as pd
 from src.lib import messages as M
 
@@ -10,9 +9,10 @@ class YahooFinance:
     def access_yahoofinance(self):
         """Fetches Json data from the Yahoo Finance API.
 
-        The data is requested with daily interval for 10 years long. Requesting
-        for the `max` long will return the data not in day-interval, but
-        3-months interval.
+        The data is requested with daily interval for 10 years long, or for
+        the shorter ``fetch_range`` when only the latest entries are missing
+        from the local store. Requesting for the `max` long will return the
+        data not in day-interval, but 3-months interval.
 
         """
 
@@ -27,7 +27,7 @@ class YahooFinance:
         elif (self.type_series == "TIMESERIES" and self.period == "DAILY" and self.adjusted):
             url = self.access_config["BASE_URL"] + \
                 self.access_config["URL_CHART"] + f"/{self.ticker}"
-            querystring = {"range": "10y",
+            querystring = {"range": self.fetch_range,
                            "region": "US",
                            "interval": "1d",
                            "lang": "en",
@@ -41,7 +41,7 @@ class YahooFinance:
         # ----------------------------------------------------------------------
         #   Gets the access
         # ----------------------------------------------------------------------
-        r = requests.request("GET", url, headers=headers, params=querystring)
+        r = self.http.request("GET", url, headers=headers, params=querystring)
         self.logger.info(f"Response from request: {r.status_code}")
 
         # ----------------------------------------------------------------------
@@ -0,0 +1,127 @@
+"""Pooled HTTP sessions shared by the accesses to the APIs."""
+
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpSessions:
+    """Registry with one ``requests.Session`` per host, so the connections
+    (TCP and TLS handshake) are kept alive and reused by all the requests of
+    the run, instead of a new connection for each request.
+
+    Requests answered with one of the ``status_retry`` codes (e.g. 429 for too
+    many requests) are retried with an exponential backoff, respecting the
+    ``Retry-After`` header from the server. Only the idempotent methods are
+    retried, so an order (``POST``) is never placed twice. After the last
+    retry, the response is returned to the caller as usual.
+
+    Attributes
+    ----------
+        pool_size: int
+            Maximum number of connections kept alive for each host.
+        timeout: float
+            Timeout in seconds for connecting and reading each response.
+        retries: int
+            Maximum number of retries for each request.
+        backoff_factor: float
+            Factor of the exponential backoff between retries, in seconds.
+        status_retry: list
+            Status codes from the response which are retried.
+
+    Examples
+    --------
+
+    The configuration is defined in the ``api-cfg.json`` file:
+
+    .. code-block:: json
+
+        {
+            "api": {
+                "http": {
+                    "pool_size": 10,
+                    "timeout": 30,
+                    "retries": 3,
+                    "backoff_factor": 0.5,
+                    "status_retry": [429, 500, 502, 503, 504]
+                }
+            }
+        }
+
+    """
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 timeout: float = 30,
+                 retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 status_retry: list = (429, 500, 502, 503, 504)):
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_retry = list(status_retry)
+
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, http_config: dict = None):
+        """Creates the registry from the ``http`` configuration of the APIs.
+        Missing values keep the defaults."""
+        if not http_config:
+            return cls()
+
+        return cls(**http_config)
+
+    def get_session(self, url: str):
+        """Returns the session for the host of the URL, creating it on the
+        first request to the host."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        with self.lock:
+            if host not in self.sessions:
+                retry = Retry(total=self.retries,
+                              backoff_factor=self.backoff_factor,
+                              status_forcelist=self.status_retry,
+                              raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=1,
+                                      pool_maxsize=self.pool_size,
+                                      max_retries=retry)
+
+                session = requests.Session()
+                session.mount(f"{parts.scheme}://", adapter)
+                self.sessions[host] = session
+
+            return self.sessions[host]
+
+    def request(self, method: str, url: str, **kwargs):
+        """Same as ``requests.request``, but through the session of the host
+        and with the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        """Same as ``requests.get``, through the session of the host."""
+        return self.request("GET", url, **kwargs)
+
+    def close(self):
+        """Closes all the sessions and their connections."""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+
+HTTP_SESSIONS = HttpSessions()
+
+
+def get_http_sessions():
+    """Registry shared by the classes which don't get one injected, so they
+    still reuse the connections within the process."""
+    return HTTP_SESSIONS
@@ -229,6 +229,24 @@ MESSAGE = {
         "Message": "Successful fetch of dataframe from the API "
                    "for ticker %s."
     },
+    "Store_Up_To_Date": {
+        "Flag": C.SUCCESS,
+        "Level": C.INFO,
+        "Message": "Local data for ticker %s is up to date, no fetch from "
+                   "the API."
+    },
+    "Store_Delta_Success": {
+        "Flag": C.SUCCESS,
+        "Level": C.INFO,
+        "Message": "Local data for ticker %s updated from the API with %s "
+                   "new entries."
+    },
+    "Store_History_Revised": {
+        "Flag": C.NEUTRAL,
+        "Level": C.WARNING,
+        "Message": "History of ticker %s was revised by the API (e.g. split "
+                   "or dividend), fetching the complete history."
+    },
     "Config_Load_Config": {
         "Flag": C.NEUTRAL,
         "Level": C.INFO,
@@ -0,0 +1,190 @@
+"""Bulk writing of a dataframe into a MySQL table, without converting the
+complete dataframe into a list of rows first.
+
+Two modes are available (selected by the ``mysql_bulk_mode`` parameter):
+
+*. ``insert``: multi-row ``INSERT ... ON DUPLICATE KEY UPDATE`` statements,
+   each with up to ``chunk_rows`` rows and about ``max_bytes`` of data, so
+   the statements stay below the packet limit of the server.
+*. ``load_data``: the dataframe is written to a temporary CSV file, sent with
+   ``LOAD DATA LOCAL INFILE`` (which needs ``local_infile`` enabled on the
+   server). The existing rows with the same unique key are replaced.
+
+In both cases the rows are converted chunk by chunk, so only one chunk is
+held as Python objects at a time.
+
+"""
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+def quote(name: str):
+    """Name of a column or table, quoted for MySQL."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def clean_chunk(chunk: pd.DataFrame):
+    """Rows of the chunk as tuples of Python values, with ``None`` for the
+    missing and infinite values (``NULL`` in the database)."""
+    columns = []
+    for _, column in chunk.items():
+        values = column.to_numpy(dtype=object)
+        missing = column.isna().to_numpy()
+        if column.dtype.kind == "f":
+            missing |= np.isinf(column.to_numpy())
+        values[missing] = None
+        columns.append(values)
+
+    return list(zip(*columns))
+
+
+def iter_chunks(dataframe: pd.DataFrame, chunk_rows: int):
+    """Generator of the rows of the dataframe, ``chunk_rows`` at a time (see
+    ``clean_chunk``)."""
+    for start in range(0, len(dataframe), chunk_rows):
+        yield clean_chunk(dataframe.iloc[start:start + chunk_rows])
+
+
+def rows_per_statement(dataframe: pd.DataFrame, chunk_rows: int, max_bytes: int):
+    """Number of rows for each statement: up to ``chunk_rows``, reduced so
+    the estimated size of the statement stays below ``max_bytes``. The size of
+    a row is estimated (in excess) from the memory used by the dataframe."""
+    if len(dataframe) == 0:
+        return chunk_rows
+
+    row_bytes = (dataframe.memory_usage(index=False, deep=True).sum() / len(dataframe) +
+                 8 * len(dataframe.columns))
+
+    return int(max(1, min(chunk_rows, max_bytes // max(row_bytes, 1))))
+
+
+def insert_statement(table_name: str, columns: list, rows: int, update: bool = True):
+    """Multi-row ``INSERT`` for ``rows`` rows, with ``%s`` placeholders."""
+    columns_list = ", ".join(quote(column) for column in columns)
+    row_values = "(" + ", ".join(["%s"] * len(columns)) + ")"
+
+    sql_query = (f"INSERT INTO {quote(table_name)} ({columns_list}) VALUES " +
+                 ", ".join([row_values] * rows))
+
+    if update:
+        updates = ", ".join(f"{quote(column)} = VALUES({quote(column)})"
+                            for column in columns)
+        sql_query += f" ON DUPLICATE KEY UPDATE {updates}"
+
+    return sql_query
+
+
+def bulk_insert(cursor, table_name: str, dataframe: pd.DataFrame,
+                chunk_rows: int = 1000, max_bytes: int = 4 * 1024 * 1024,
+                update: bool = True):
+    """Inserts (or updates, with ``update``) the rows of the dataframe with
+    multi-row ``INSERT`` statements.
+
+    Parameters
+    ----------
+        cursor
+            Cursor of the connection (see ``GoogleCloudMySQL.transaction``).
+        table_name: str
+            Name of the table.
+        dataframe: pd.DataFrame
+            Data, with the columns of the table.
+        chunk_rows: int, optional
+            Maximum number of rows per statement.
+        max_bytes: int, optional
+            Approximate maximum size of the data of each statement.
+        update: bool, optional
+            If ``True``, the rows with an existing unique key are updated.
+
+    Returns
+    -------
+        statements: int
+            Number of statements executed.
+
+    """
+    columns = list(dataframe.columns)
+    rows = rows_per_statement(dataframe, chunk_rows, max_bytes)
+
+    statements = 0
+    full_statement = None
+    for chunk in iter_chunks(dataframe, rows):
+        if len(chunk) == rows:
+            if full_statement is None:
+                full_statement = insert_statement(table_name, columns, rows, update)
+            sql_query = full_statement
+        else:
+            sql_query = insert_statement(table_name, columns, len(chunk), update)
+
+        cursor.execute(sql_query, [value for row in chunk for value in row])
+        statements += 1
+
+    return statements
+
+
+def write_csv(dataframe: pd.DataFrame, path: Path, chunk_rows: int = 10000):
+    """Writes the dataframe as a CSV file for ``LOAD DATA`` (no header, ``\\N``
+    for ``NULL``, backslashes escaped, booleans as numbers and dates in the
+    MySQL format)."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        for start in range(0, len(dataframe), chunk_rows):
+            chunk = dataframe.iloc[start:start + chunk_rows]
+            chunk = chunk.replace([np.inf, -np.inf], np.nan)
+            for column in chunk.columns:
+                if chunk[column].dtype == bool:
+                    chunk[column] = chunk[column].astype(int)
+                elif chunk[column].dtype == object:
+                    chunk[column] = chunk[column].map(
+                        lambda value: value.replace("\\", "\\\\")
+                        if isinstance(value, str) else value)
+
+            chunk.to_csv(file, header=False, index=False, na_rep="\\N",
+                         date_format="%Y-%m-%d %H:%M:%S", lineterminator="\n")
+
+
+def load_data_statement(table_name: str, columns: list, path: Path):
+    """``LOAD DATA LOCAL INFILE`` for a file from ``write_csv``."""
+    columns_list = ", ".join(quote(column) for column in columns)
+    filename = Path(path).as_posix().replace("\\", "\\\\").replace("'", "\\'")
+
+    return (f"LOAD DATA LOCAL INFILE '{filename}' REPLACE INTO TABLE {quote(table_name)} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            "LINES TERMINATED BY '\\n' "
+            f"({columns_list})")
+
+
+def load_data(cursor, table_name: str, dataframe: pd.DataFrame, temp_folder: Path = None):
+    """Writes the rows of the dataframe with ``LOAD DATA LOCAL INFILE``, from
+    a temporary CSV file (removed at the end).
+
+    Parameters
+    ----------
+        cursor
+            Cursor of the connection, opened with ``allow_local_infile``.
+        table_name: str
+            Name of the table.
+        dataframe: pd.DataFrame
+            Data, with the columns of the table.
+        temp_folder: Path, optional
+            Folder for the temporary file. The one of the system if not
+            passed.
+
+    Returns
+    -------
+        statements: int
+            Number of statements executed.
+
+    """
+    file = tempfile.NamedTemporaryFile(suffix=".csv", dir=temp_folder, delete=False)
+    file.close()
+    path = Path(file.name)
+
+    try:
+        write_csv(dataframe, path)
+        cursor.execute(load_data_statement(table_name, list(dataframe.columns), path))
+    finally:
+        os.remove(path)
+
+    return 1
@@ -0,0 +1,527 @@
+"""Lifecycle of the Google Cloud SQL instance: the instance is started once
+when the first database operation needs it, kept running while there are
+operations (jobs) active, and stopped after a period without use, so the boot
+latency is paid once per period of use instead of once per ``Storage``.
+
+There is a single manager per instance in each process (see
+``get_lifecycle``), shared by all the ``Storage`` objects. Since the instance
+is also used by other processes (e.g. the server and the scheduled scripts),
+the activity of each process is recorded in a folder shared by them (see
+``SharedActivity``), and the instance is only stopped when none of them is
+using it. A process which exits (e.g. a script) checks at its end if the
+instance can be stopped, since its timer of the idle stop doesn't run anymore.
+
+"""
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def process_alive(pid: int):
+    """``True`` if the process with ``pid`` (in the same host) is running. On
+    Windows it can't be checked, and the process is assumed to be running."""
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedActivity:
+    """Activity of the processes using the instance, in a folder shared by
+    them (e.g. under ``data_storage``): one lease file per process, with its
+    number of active jobs and the time of its last activity.
+
+    A lease is ignored (and removed) when its process is not running anymore,
+    and a lease with active jobs is ignored when it is older than
+    ``lease_max_age`` (e.g. a process which crashed on Windows, where the
+    process can't be checked).
+    """
+    lease_max_age = 6 * 3600.0
+
+    def __init__(self, folder: Path, clock=time.time, is_alive=process_alive):
+        """
+        Parameters
+        ----------
+            folder: Path
+                Folder of the lease files.
+            clock: optional
+                Function returning the time (shared by the processes, so the
+                time of the system).
+            is_alive: optional
+                Function checking if a process (by its pid) is running.
+        """
+        self.folder = Path(folder)
+        self.clock = clock
+        self.is_alive = is_alive
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.path = self.folder / f"{self.host}_{self.pid}.json"
+
+    def update(self, active_jobs: int):
+        """Records the number of jobs of this process, with the current time
+        as its last activity."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        lease = {"host": self.host, "pid": self.pid,
+                 "active_jobs": active_jobs, "last_activity": self.clock()}
+
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(lease))
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        """Removes the lease of this process (e.g. at its end)."""
+        self.path.unlink(missing_ok=True)
+
+    def is_stale(self, lease: dict):
+        if lease["host"] == self.host and not self.is_alive(lease["pid"]):
+            return True
+        return (lease["active_jobs"] > 0 and
+                self.clock() - lease["last_activity"] > self.lease_max_age)
+
+    def others(self):
+        """Activity of the other processes.
+
+        Returns
+        -------
+            active_jobs: int
+                Number of jobs active in the other processes.
+            last_activity: float
+                Time of the last activity of the other processes, or ``None``.
+
+        """
+        active_jobs = 0
+        last_activity = None
+        for path in self.folder.glob("*.json"):
+            if path == self.path:
+                continue
+            try:
+                lease = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+
+            if self.is_stale(lease):
+                path.unlink(missing_ok=True)
+                continue
+
+            active_jobs += lease["active_jobs"]
+            if last_activity is None or lease["last_activity"] > last_activity:
+                last_activity = lease["last_activity"]
+
+        return active_jobs, last_activity
+
+
+class CloudSQLLifecycle:
+    """Tracks the state of a Cloud SQL instance and starts / stops it.
+
+    The requests to the Cloud SQL Admin API are done by the ``api`` object,
+    which is the ``GoogleCloudMySQL`` part of a ``Storage``:
+
+    *. ``get_instance_status()``: returns the activation policy (``RUNNING``,
+       ``STOPPED`` or ``ERROR``), the state and the complete response.
+    *. ``set_activation_policy(policy)``: requests the activation policy
+       (``ALWAYS`` or ``NEVER``).
+
+    Attributes
+    ----------
+        active_jobs: int
+            Number of jobs (e.g. open connections) of this process using the
+            instance.
+        last_activity: float
+            Time (from ``clock``) when the last job finished.
+        stop_requested: bool
+            ``True`` if a stop is deferred to the end of the active jobs.
+        status_time: float
+            Time (from ``clock``) of the cached status, or ``None``.
+    """
+    # --------------------------------------------------------------------------
+    #   Polling of the status while an operation of the instance is running:
+    #   the first check is done after ``settle_delay`` (right after the
+    #   request the status is still the previous one), and then with
+    #   exponential backoff.
+    # --------------------------------------------------------------------------
+    settle_delay = 15.0
+    poll_initial = 2.0
+    poll_factor = 2.0
+    poll_max = 60.0
+    boot_timeout = 1800.0
+
+    def __init__(self, api, idle_timeout: float = 0, status_max_age: float = 60,
+                 logger_name: str = "invst", activity: SharedActivity = None,
+                 sleep=time.sleep, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+            api: `GoogleCloudMySQL`
+                Object doing the requests to the Cloud SQL Admin API.
+            idle_timeout: float, optional
+                Seconds without jobs before the instance is stopped. With
+                ``0`` the instance is only stopped explicitly (``stop``).
+            status_max_age: float, optional
+                Seconds the status of the instance is cached.
+            logger_name: str, optional
+                Name of the logger.
+            activity: SharedActivity, optional
+                Activity shared with the other processes using the instance.
+                If not passed, only the jobs of this process are considered,
+                which is only safe if a single process uses the instance.
+            sleep, clock: optional
+                Functions to wait and to measure the time.
+        """
+        self.api = api
+        self.idle_timeout = idle_timeout
+        self.activity = activity
+        self.status_max_age = status_max_age
+        self.sleep = sleep
+        self.clock = clock
+
+        self.logger = logging.getLogger(logger_name + ".cloud_sql_lifecycle")
+
+        self.active_jobs = 0
+        self.last_activity = clock()
+        self.status_time = None
+        self._status = None
+        self._timer = None
+        self._exit_registered = False
+        self.stop_requested = False
+
+        # ----------------------------------------------------------------------
+        #   The operations of the instance are serialized (a second caller
+        #   waits for the start already in progress, instead of repeating it).
+        # ----------------------------------------------------------------------
+        self._lock = threading.RLock()
+
+    # --------------------------------------------------------------------------
+    #   Status
+    # --------------------------------------------------------------------------
+    def status(self, refresh: bool = False):
+        """Activation policy and state of the instance, from the cache if it
+        is not older than ``status_max_age``.
+
+        Returns
+        -------
+            policy: str
+                ``RUNNING``, ``STOPPED`` or ``ERROR``.
+            state: str
+                State of the instance (e.g. ``RUNNABLE``).
+
+        """
+        with self._lock:
+            if (refresh or self._status is None or
+                    self.clock() - self.status_time > self.status_max_age):
+                policy, state, _ = self.api.get_instance_status()
+                self._status = (policy, state)
+                self.status_time = self.clock()
+
+            return self._status
+
+    def is_running(self, refresh: bool = False):
+        """``True`` if the instance is running and available."""
+        return self.status(refresh=refresh) == ("RUNNING", "RUNNABLE")
+
+    def wait_for(self, condition, description: str):
+        """Polls the status, with exponential backoff, until ``condition``
+        (called with the policy and state) is met.
+
+        Returns
+        -------
+            result: bool
+                ``False`` if the condition was not met before
+                ``boot_timeout``.
+
+        """
+        waited = 0.0
+        delay = self.poll_initial
+        while not condition(*self.status(refresh=True)):
+            if waited >= self.boot_timeout:
+                self.logger.error("Timeout waiting for the Google Cloud SQL to %s.",
+                                  description)
+                return False
+
+            self.logger.info("Waiting for the Google Cloud SQL to %s (%.0f s).",
+                             description, waited)
+            self.sleep(delay)
+            waited += delay
+            delay = min(delay * self.poll_factor, self.poll_max)
+
+        return True
+
+    def wait_operation(self):
+        """Waits for an operation already running on the instance (e.g. a
+        start requested by another process) to finish."""
+        policy, state = self.status()
+        if state != "RUNNABLE":
+            return self.wait_for(lambda policy, state: state == "RUNNABLE",
+                                 "finish the previous operation")
+        return True
+
+    # --------------------------------------------------------------------------
+    #   Start and stop
+    # --------------------------------------------------------------------------
+    def start(self):
+        """Starts the instance, unless it is already running, and waits until
+        it is available.
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the instance is running.
+
+        """
+        with self._lock:
+            self.cancel_idle_stop()
+
+            if self.is_running():
+                return True
+            if not self.wait_operation():
+                return False
+
+            policy, state = self.status()
+            if policy == "ERROR":
+                return False
+            if policy == "RUNNING":
+                return True
+
+            self.logger.info("Starting the Google Cloud SQL instance.")
+            time_start = self.clock()
+            self.api.set_activation_policy("ALWAYS")
+            self.sleep(self.settle_delay)
+
+            result = self.wait_for(lambda policy, state: (policy, state) == ("RUNNING", "RUNNABLE"),
+                                   "start")
+            if result:
+                self.logger.info("Google Cloud SQL instance started in %.0f s.",
+                                 self.clock() - time_start)
+
+            return result
+
+    def stop(self):
+        """Stops the instance, unless it is already stopped or in use. With
+        jobs active in this process (e.g. connections checked out of the pool
+        by other threads), the stop is deferred to the end of the last one
+        (see ``release``). With jobs active in other processes, the stop is
+        refused, and the instance is stopped by the idle stop.
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the instance is stopped.
+
+        """
+        with self._lock:
+            if self.active_jobs > 0:
+                self.logger.info("Stop of the Google Cloud SQL deferred until the end "
+                                 "of the %s active jobs.", self.active_jobs)
+                self.stop_requested = True
+                return False
+
+            other_jobs, _ = self.other_activity()
+            if other_jobs > 0:
+                self.logger.warning("Stop of the Google Cloud SQL refused: %s jobs "
+                                    "active in other processes.", other_jobs)
+                return False
+
+            return self.stop_instance()
+
+    def stop_instance(self):
+        """Stops the instance, unless it is already stopped, without checking
+        the jobs (see ``stop``).
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the instance is stopped.
+
+        """
+        with self._lock:
+            self.cancel_idle_stop()
+            self.stop_requested = False
+
+            if not self.wait_operation():
+                return False
+
+            policy, state = self.status()
+            if policy == "ERROR":
+                return False
+            if policy == "STOPPED":
+                return True
+
+            self.logger.info("Stopping the Google Cloud SQL instance.")
+            self.api.set_activation_policy("NEVER")
+            self.sleep(self.settle_delay)
+
+            return self.wait_for(lambda policy, state: (policy, state) == ("STOPPED", "RUNNABLE"),
+                                 "stop")
+
+    # --------------------------------------------------------------------------
+    #   Jobs and idle stop
+    # --------------------------------------------------------------------------
+    def acquire(self):
+        """Registers a job using the instance, starting it if needed."""
+        with self._lock:
+            self.active_jobs += 1
+            self.cancel_idle_stop()
+            self.record_activity()
+            self.register_exit()
+            result = self.start()
+            if not result:
+                self.active_jobs -= 1
+                self.record_activity()
+            return result
+
+    def release(self):
+        """Registers the end of a job. After the last one, the instance is
+        stopped if a stop was requested meanwhile (see ``stop``), or its stop
+        is scheduled for ``idle_timeout``."""
+        with self._lock:
+            self.active_jobs = max(self.active_jobs - 1, 0)
+            self.last_activity = self.clock()
+            self.record_activity()
+
+            if self.active_jobs == 0:
+                if self.stop_requested:
+                    self.stop()
+                else:
+                    self.schedule_idle_stop()
+
+    @contextmanager
+    def job(self):
+        """Context for a job using the instance (see ``acquire``)."""
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def record_activity(self):
+        """Records the jobs of this process in the shared activity."""
+        if self.activity is None:
+            return
+        try:
+            self.activity.update(self.active_jobs)
+        except OSError as error:
+            self.logger.warning("Activity of the Google Cloud SQL not recorded: %s", error)
+
+    def other_activity(self):
+        """Jobs active in the other processes and seconds since their last
+        activity (``None`` without activity)."""
+        if self.activity is None:
+            return 0, None
+        active_jobs, last_activity = self.activity.others()
+        if last_activity is None:
+            return active_jobs, None
+        return active_jobs, self.activity.clock() - last_activity
+
+    def schedule_idle_stop(self, delay: float = None):
+        """Schedules the stop after ``idle_timeout`` (or ``delay``), if
+        enabled."""
+        if not self.idle_timeout or self.idle_timeout <= 0:
+            return
+
+        self.cancel_idle_stop()
+        self._timer = threading.Timer(delay or self.idle_timeout, self.stop_if_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def cancel_idle_stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def stop_if_idle(self):
+        """Stops the instance if there are no jobs, in this process and in the
+        others, and the last one finished at least ``idle_timeout`` ago.
+        Otherwise (without jobs in this process), the check is scheduled again
+        for when the instance can have been idle for ``idle_timeout``.
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the stop was done.
+
+        """
+        with self._lock:
+            self.cancel_idle_stop()
+            if self.active_jobs > 0:
+                return False
+
+            other_jobs, other_idle = self.other_activity()
+            idle = self.clock() - self.last_activity
+            if other_idle is not None:
+                idle = min(idle, other_idle)
+
+            if other_jobs > 0 or idle < self.idle_timeout:
+                self.schedule_idle_stop(delay=max(self.idle_timeout - idle, 1.0))
+                return False
+
+            self.logger.info("Google Cloud SQL idle for %.0f s.", idle)
+            return self.stop()
+
+    def register_exit(self):
+        """Registers ``stop_on_exit`` for the end of the process, once."""
+        if self._exit_registered or not self.idle_timeout or self.idle_timeout <= 0:
+            return
+        atexit.register(self.stop_on_exit)
+        self._exit_registered = True
+
+    def stop_on_exit(self):
+        """Check at the end of the process (e.g. a script, whose idle stop
+        would not run anymore): the instance is stopped if no other process is
+        using it or used it in the last ``idle_timeout`` (a process still
+        running stops it later, with its own idle stop).
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the stop was done.
+
+        """
+        with self._lock:
+            self.cancel_idle_stop()
+            if self.activity is not None:
+                self.activity.remove()
+
+            other_jobs, other_idle = self.other_activity()
+            if self.active_jobs > 0 or other_jobs > 0 or (
+                    other_idle is not None and other_idle < self.idle_timeout):
+                return False
+
+            self.logger.info("Stopping the idle Google Cloud SQL at the end of the process.")
+            return self.stop()
+
+
+# ------------------------------------------------------------------------------
+#   Managers of the process, with the project and instance as key.
+# ------------------------------------------------------------------------------
+LIFECYCLES = {}
+LIFECYCLES_LOCK = threading.Lock()
+
+
+def get_lifecycle(api, idle_timeout: float = 0, status_max_age: float = 60,
+                  logger_name: str = "invst", activity_folder: Path = None):
+    """Manager of the instance of ``api`` (``cloud_project`` and
+    ``cloud_sql_instance``), created on the first call for the instance and
+    shared afterwards. See ``CloudSQLLifecycle`` for the parameters, and
+    ``SharedActivity`` for ``activity_folder``."""
+    key = (api.cloud_project, api.cloud_sql_instance)
+
+    with LIFECYCLES_LOCK:
+        if key not in LIFECYCLES:
+            LIFECYCLES[key] = CloudSQLLifecycle(api=api,
+                                                idle_timeout=idle_timeout,
+                                                status_max_age=status_max_age,
+                                                logger_name=logger_name,
+                                                activity=(SharedActivity(activity_folder)
+                                                          if activity_folder is not None
+                                                          else None))
+        return LIFECYCLES[key]
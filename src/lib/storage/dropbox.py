@@ -1,6 +1,4 @@
-import dropbox
 from pathlib import Path
-import requests
 
 
 class DropboxAPI:
@@ -29,6 +27,8 @@ class DropboxAPI:
             "client_id": app_key,
             "client_secret": app_secret
         }
+        import requests
+
         r = requests.post(token_url, data=params)
         print(r.text)
 
@@ -77,6 +77,8 @@ class DropboxAPI:
         """
         self.logger.info(f"Listing files in the folder: {folderpath}")
 
+        import dropbox
+
         dbx = dropbox.Dropbox(self.access_token)
 
         folderpath = self.fix_folder_path(folderpath)
@@ -141,6 +143,8 @@ class DropboxAPI:
         # ----------------------------------------------------------------------
         #   Connects to Dropbox and tests it.
         # ----------------------------------------------------------------------
+        import dropbox
+
         dbx = dropbox.Dropbox(self.access_token)
         try:
             account = dbx.users_get_current_account()
@@ -204,6 +208,8 @@ class DropboxAPI:
         # ----------------------------------------------------------------------
         #   Connects to Dropbox and tests it.
         # ----------------------------------------------------------------------
+        import dropbox
+
         dbx = dropbox.Dropbox(self.access_token)
 
         try:
@@ -225,6 +231,8 @@ class DropboxAPI:
 
         folder = "/Models/lstm_MACD Histogram_IBM/"
 
+        import dropbox
+
         dbx = dropbox.Dropbox(self.access_token)
 
         result = dbx.files_list_folder(folder, recursive=True)
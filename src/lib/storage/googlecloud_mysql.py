@@ -1,16 +1,66 @@
-import mysql.connector
-from mysql.connector.constants import ClientFlag
 from pathlib import Path
 import pandas as pd
 from typing import List, Union
-from googleapiclient import discovery
-import google.auth
 from src.lib import messages as M
 from src.lib import constants as C
-import numpy as np
 import base64
 import os
-import time
+from contextlib import contextmanager
+from src.lib.storage.mysql_pool import get_pool
+from src.lib.storage.schema_cache import get_schema_cache
+from src.lib.storage.bulk_writer import bulk_insert, load_data
+
+
+# ------------------------------------------------------------------------------
+#   Datatypes of the fields in the tables created from dataframes, instead of
+#   the ones derived by Pandas.
+# ------------------------------------------------------------------------------
+FIELD_TYPES = {
+    "WKN": "VARCHAR(200)",
+    "Position ID": "VARCHAR(200)",
+    "Depot ID": "VARCHAR(200)",
+    "Depot Aggregated ID": "VARCHAR(200)",
+    "Order ID": "VARCHAR(200)",
+    "Venue ID": "VARCHAR(200)",
+    "Client ID": "VARCHAR(200)",
+    "Account ID": "VARCHAR(200)",
+    "Instrument ID": "VARCHAR(200)",
+    "Account Display ID": "VARCHAR(200)",
+    "Settlement account ID": "VARCHAR(200)",
+    "Balance Unit": "VARCHAR(10)",
+    "Balance Euro Unit": "VARCHAR(10)",
+    "Available Cash Unit": "VARCHAR(10)",
+    "Available Cash Euro Unit": "VARCHAR(10)",
+    "Purchase Value Unit": "VARCHAR(10)",
+    "Purchase Price Unit": "VARCHAR(10)",
+    "Current Value Unit": "VARCHAR(10)",
+    "Current Price Unit": "VARCHAR(10)",
+    "Limit Unit": "VARCHAR(10)",
+    "Hedgeability": "VARCHAR(30)",
+    "Profit/Loss Purchase Absolute Unit": "VARCHAR(10)",
+    "Profit/Loss Previous Day Absolute Unit": "VARCHAR(10)",
+    "Account Currency": "VARCHAR(10)",
+    "IBAN": "VARCHAR(200)",
+    "Quantity": "INT(10)",
+    "Available Cash Value": "DECIMAL(12, 2)",
+    "Available Cash Euro Value": "DECIMAL(12, 2)",
+    "Balance Value": "DECIMAL(12, 2)",
+    "Balance Euro Value": "DECIMAL(12, 2)",
+    "Depot Aggregated Purchase Value": "DECIMAL(12, 2)",
+    "Depot Aggregated Current Value": "DECIMAL(12, 3)",
+    "Depot Aggregated Profit/Loss Purchase Absolute Value": "DECIMAL(12, 3)",
+    "Depot Aggregated Profit/Loss Purchase Relative": "DECIMAL(12, 3)",
+    "Depot Aggregated Profit/Loss Previous Day Absolute Value": "DECIMAL(12, 3)",
+    "Depot Aggregated Profit/Loss Previous Day Relative": "DECIMAL(12, 3)",
+    "Purchase Value": "DECIMAL(12, 3)",
+    "Purchase Price": "DECIMAL(12, 5)",
+    "Current Value": "DECIMAL(12, 3)",
+    "Current Price": "DECIMAL(12, 3)",
+    "Profit/Loss Purchase Absolute Value": "DECIMAL(12, 3)",
+    "Profit/Loss Purchase Relative": "DECIMAL(12, 3)",
+    "Profit/Loss Previous Day Absolute Value": "DECIMAL(12, 3)",
+    "Profit/Loss Previous Day Relative": "DECIMAL(12, 3)",
+}
 
 
 class GoogleCloudMySQL:
@@ -25,6 +75,9 @@ class GoogleCloudMySQL:
         key_path = Path.cwd().resolve() / "keys" / "service-account.json"
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(key_path)
 
+        import google.auth
+        from googleapiclient import discovery
+
         credentials, self.cloud_project = google.auth.default()
         service = discovery.build(
             'sqladmin', 'v1beta4', credentials=credentials, cache_discovery=False)
@@ -50,58 +103,29 @@ class GoogleCloudMySQL:
 
         return policy, state, response
 
-    def start_stop_instance(self, start_stop: str = "START"):
-        """Method to start or stop a Cloud SQL instance. The purpose for
-        managing the status of the instance is to avoid unecessary costs with
-        the instance running without use.
+    def set_activation_policy(self, policy: str):
+        """Method to request the activation policy of a Cloud SQL instance,
+        which starts (``ALWAYS``) or stops (``NEVER``) it. The request returns
+        before the operation is finished (see ``CloudSQLLifecycle``).
 
         See reference in https://cloud.google.com/sql/docs/mysql/admin-api/rest/v1beta4/instances/patch
 
         Parameters
         ----------
-            start_stop: str
-                Parameter to define the type of request:
-                *. ``START``: Starts the instance.
-                *. ``STOP``: Stops the instance.
+            policy: str
+                Activation policy, ``ALWAYS`` or ``NEVER``.
 
         Returns
         -------
             request result
 
         """
-        self.logger.info(f"Google Cloud SQL instance operation: {start_stop}")
-
-        policy_result, state_result, response_result = self.get_instance_status()
-
-        if state_result != "RUNNABLE":
-            for i in range(1, 200):
-                policy_result, state_result, response_result = self.get_instance_status()
-                if (state_result == "RUNNABLE"):
-                    self.logger.info(
-                        "Google Cloud SQL has finalized previous operation.")
-                    break
-                self.logger.info(
-                    f"Waiting previous operation to finish. Try {i}")
-                time.sleep(10)
-
-        if policy_result == "ERROR":
-            return 0
-        elif policy_result == "RUNNING" and start_stop == "START":
-            self.logger.info(f"Google Cloud SQL is already running")
-            return 0
-        elif policy_result == "STOPPED" and start_stop == "STOP":
-            self.logger.info(f"Google Cloud SQL is already stopped")
-            return 0
-
-        policy = 'ALWAYS'
-        if start_stop == "START":
-            policy = 'ALWAYS'
-        elif start_stop == "STOP":
-            policy = 'NEVER'
-
         key_path = Path.cwd().resolve() / "keys" / "service-account.json"
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(key_path)
 
+        import google.auth
+        from googleapiclient import discovery
+
         credentials, self.cloud_project = google.auth.default()
         service = discovery.build(
             'sqladmin', 'v1beta4', credentials=credentials, cache_discovery=False)
@@ -117,28 +141,43 @@ class GoogleCloudMySQL:
             instance=self.cloud_sql_instance,
             body=dbinstancebody).execute()
 
-        # ----------------------------------------------------------------------
-        #   Adds a sleep before checking for the status, since if the check is
-        #   done right after the start, the status seems to be delayed and
-        #   improper.
-        # ----------------------------------------------------------------------
-        time.sleep(15)
+        return request
 
-        policy_result, state_result, response_result = self.get_instance_status()
-        if state_result != "RUNNABLE":
-            for i in range(1, 200):
-                policy_result, state_result, response_result = self.get_instance_status()
-                if (state_result == "RUNNABLE"):
-                    self.logger.info(
-                        "Google Cloud SQL has finalized current operation.")
-                    break
-                self.logger.info(
-                    f"Waiting current operation to finish. Try {i}")
-                time.sleep(10)
+    def start_stop_instance(self, start_stop: str = "START"):
+        """Method to start or stop a Cloud SQL instance. The purpose for
+        managing the status of the instance is to avoid unecessary costs with
+        the instance running without use. The operation is done by the
+        lifecycle manager of the instance, which skips it if the instance is
+        already in the requested state.
 
-        return request
+        Parameters
+        ----------
+            start_stop: str
+                Parameter to define the type of request:
+                *. ``START``: Starts the instance.
+                *. ``STOP``: Stops the instance. While connections are in
+                   use, the stop is deferred until they are returned, and it
+                   is refused while other processes use the instance (see
+                   ``CloudSQLLifecycle.stop``).
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the instance is in the requested state.
+
+        """
+        self.logger.info(f"Google Cloud SQL instance operation: {start_stop}")
+
+        if start_stop == "START":
+            return self.lifecycle.start()
+        elif start_stop == "STOP":
+            return self.lifecycle.stop()
+
+        return False
 
     def create_connection_string(self):
+        from mysql.connector.constants import ClientFlag
+
         self.config_db = {
             'user': self.config.get_key(
                 "user", ["storage",
@@ -171,56 +210,93 @@ class GoogleCloudMySQL:
                          "GoogleCloudMySQL",
                          "user_data",
                          "SSL_Key"], ""),
+            'allow_local_infile': self.config.mysql_bulk_mode == "load_data",
         }
 
-    def create_connection(self, database_name: str = None):
+    def get_connection_pool(self):
+        """Pool of connections of the database server, shared by the storages
+        and threads of the process (see ``ConnectionPool``)."""
+        if self.pool is None:
+            self.create_connection_string()
+            self.pool = get_pool(config_db=self.config_db,
+                                 pool_size=self.config.mysql_pool_size or 4,
+                                 lifecycle=self.lifecycle,
+                                 logger_name=self.logger_name)
+
+        return self.pool
+
+    @contextmanager
+    def transaction(self, database_name: str = None):
+        """Context for running several statements in a single connection and
+        transaction, committed at the end (or rolled back if an exception is
+        raised). The calls of ``execute_query`` inside the context use its
+        connection. Nested contexts, in the same thread, are part of the
+        outer transaction.
 
-        self.create_connection_string()
-
-        if database_name is not None:
-            self.config_db['database'] = database_name
-
-        self.cnxn = mysql.connector.connect(**self.config_db)
-        cursor = self.cnxn.cursor()
-
-        return cursor
+        Parameters
+        ----------
+            database_name: str, optional
+                Database selected for the statements.
 
-    def close_connection(self):
+        Yields
+        ------
+            cursor
+                Cursor of the connection.
 
-        self.cnxn.close()
-        self.cnxn = None
+        """
+        state = self.transaction_state
+        cursor = getattr(state, "cursor", None)
+
+        if cursor is not None:
+            self.use_database(database_name=database_name)
+            yield cursor
+            return
+
+        with self.get_connection_pool().connection() as connection:
+            state.cursor = connection.cursor(buffered=True)
+            state.database = None
+            try:
+                self.use_database(database_name=database_name)
+                yield state.cursor
+            finally:
+                state.cursor.close()
+                state.cursor = None
+
+    def use_database(self, database_name: str = None):
+        """Selects the database for the statements of the current
+        transaction, if not selected yet."""
+        state = self.transaction_state
+
+        if database_name is not None and database_name != state.database:
+            state.cursor.execute(f"USE `{database_name}`")
+            state.database = database_name
+
+    def get_schema_cache(self):
+        """Cache of the schema of the database server, shared by the storages
+        of the process (see ``SchemaCache``)."""
+        if self.schema_cache is None:
+            self.create_connection_string()
+            self.schema_cache = get_schema_cache(config_db=self.config_db)
+
+        return self.schema_cache
+
+    def select_query(self, query: str):
+        """Runs a ``SELECT`` without a database selected, returning the
+        rows."""
+        return self.execute_query(database_name=None,
+                                  query=query,
+                                  type_query="SELECT")
 
     def check_db_exists(self, database_name: str):
 
-        cursor = self.create_connection()
-
-        cursor.execute("SHOW DATABASES")
-
-        result = False
-        for db in cursor:
-            if db[0] == database_name:
-                result = True
-                break
-
-        self.close_connection()
-
-        return result
+        return self.get_schema_cache().database_exists(database_name=database_name,
+                                                       execute=self.select_query)
 
     def check_table_exists(self, database_name: str, table_name: str):
 
-        sql_query = """
-            SHOW TABLES;
-            """
-        cursor = self.execute_query(database_name=database_name,
-                                    query=sql_query,
-                                    type_query="SELECT")
-
-        result = False
-        for table in cursor:
-            if table[0] == table_name:
-                result = True
-
-        return result
+        return self.get_schema_cache().table_exists(database_name=database_name,
+                                                    table_name=table_name,
+                                                    execute=self.select_query)
 
     def execute_query(self, database_name: str, query: List[str], type_query: List[str]):
 
@@ -240,28 +316,26 @@ class GoogleCloudMySQL:
 
         result = None
 
-        if self.cnxn is not None:
-            self.logger.info("Connection already open!")
-            return None
-        cursor = self.create_connection(database_name=database_name)
+        # ----------------------------------------------------------------------
+        #   The statement runs in the current transaction if there is one, or
+        #   in its own (committed at the end) with a connection of the pool.
+        # ----------------------------------------------------------------------
+        with self.transaction(database_name=database_name) as cursor:
 
-        if parameter is None:
-            cursor.execute(query)
-        else:
-            if isinstance(parameter, list):
-                cursor.executemany(query, parameter)
+            if parameter is None:
+                cursor.execute(query)
             else:
-                cursor.execute(query, parameter)
-
-        if type_query == "NONE" or type_query == "" or type_query is None:
-            result = cursor
-        elif type_query in ["SELECT"]:
-            result = cursor.fetchall()
-        elif type_query in ["INSERT", "UPDATE", "ALTER"]:
-            self.cnxn.commit()
-            result = cursor
-
-        self.close_connection()
+                if isinstance(parameter, list):
+                    cursor.executemany(query, parameter)
+                else:
+                    cursor.execute(query, parameter)
+
+            if type_query == "NONE" or type_query == "" or type_query is None:
+                result = cursor
+            elif type_query in ["SELECT"]:
+                result = cursor.fetchall()
+            elif type_query in ["INSERT", "UPDATE", "ALTER"]:
+                result = cursor
 
         return result
 
@@ -279,9 +353,10 @@ class GoogleCloudMySQL:
             self.logger.info(f"Database '{database_name}' already present")
             return False
 
-        cursor = self.create_connection()
-        cursor.execute(f"CREATE DATABASE {database_name}")
-        self.close_connection()
+        self.execute_query(database_name=None,
+                           query=f"CREATE DATABASE {database_name}",
+                           type_query="NONE")
+        self.get_schema_cache().add_database(database_name=database_name)
 
         return True
 
@@ -300,8 +375,15 @@ class GoogleCloudMySQL:
             self.logger.info(f"Table '{table_name}' already present")
             return False
 
+        # ----------------------------------------------------------------------
+        #   The datatypes of some fields are given, so some text fields can be
+        #   used later in Unique Keys.
+        # ----------------------------------------------------------------------
+        dtype = {field: type_field for field, type_field in FIELD_TYPES.items()
+                 if field in dataframe.columns}
+
         sql_query = pd.io.sql.get_schema(
-            dataframe.reset_index(), table_name)
+            dataframe.reset_index(), table_name, dtype=dtype)
 
         sql_query = sql_query.replace('"', '`')
 
@@ -321,64 +403,6 @@ class GoogleCloudMySQL:
         self.execute_query(database_name=database_name,
                            query=sql_query_index, type_query="ALTER")
 
-        # ----------------------------------------------------------------------
-        #   Corrects the datatypes so some text fields can be used later in
-        #   Unique Keys
-        # ----------------------------------------------------------------------
-        fields = {
-            "WKN": "VARCHAR(200)",
-            "Position ID": "VARCHAR(200)",
-            "Depot ID": "VARCHAR(200)",
-            "Depot Aggregated ID": "VARCHAR(200)",
-            "Order ID": "VARCHAR(200)",
-            "Venue ID": "VARCHAR(200)",
-            "Client ID": "VARCHAR(200)",
-            "Account ID": "VARCHAR(200)",
-            "Instrument ID": "VARCHAR(200)",
-            "Account Display ID": "VARCHAR(200)",
-            "Settlement account ID": "VARCHAR(200)",
-            "Balance Unit": "VARCHAR(10)",
-            "Balance Euro Unit": "VARCHAR(10)",
-            "Available Cash Unit": "VARCHAR(10)",
-            "Available Cash Euro Unit": "VARCHAR(10)",
-            "Purchase Value Unit": "VARCHAR(10)",
-            "Purchase Price Unit": "VARCHAR(10)",
-            "Current Value Unit": "VARCHAR(10)",
-            "Current Price Unit": "VARCHAR(10)",
-            "Limit Unit": "VARCHAR(10)",
-            "Hedgeability": "VARCHAR(30)",
-            "Profit/Loss Purchase Absolute Unit": "VARCHAR(10)",
-            "Profit/Loss Previous Day Absolute Unit": "VARCHAR(10)",
-            "Account Currency": "VARCHAR(10)",
-            "IBAN": "VARCHAR(200)",
-            "Quantity": "INT(10)",
-            "Available Cash Value": "DECIMAL(12, 2)",
-            "Available Cash Euro Value": "DECIMAL(12, 2)",
-            "Balance Value": "DECIMAL(12, 2)",
-            "Balance Euro Value": "DECIMAL(12, 2)",
-            "Depot Aggregated Purchase Value": "DECIMAL(12, 2)",
-            "Depot Aggregated Current Value": "DECIMAL(12, 3)",
-            "Depot Aggregated Profit/Loss Purchase Absolute Value": "DECIMAL(12, 3)",
-            "Depot Aggregated Profit/Loss Purchase Relative": "DECIMAL(12, 3)",
-            "Depot Aggregated Profit/Loss Previous Day Absolute Value": "DECIMAL(12, 3)",
-            "Depot Aggregated Profit/Loss Previous Day Relative": "DECIMAL(12, 3)",
-            "Purchase Value": "DECIMAL(12, 3)",
-            "Purchase Price": "DECIMAL(12, 5)",
-            "Current Value": "DECIMAL(12, 3)",
-            "Current Price": "DECIMAL(12, 3)",
-            "Profit/Loss Purchase Absolute Value": "DECIMAL(12, 3)",
-            "Profit/Loss Purchase Relative": "DECIMAL(12, 3)",
-            "Profit/Loss Previous Day Absolute Value": "DECIMAL(12, 3)",
-            "Profit/Loss Previous Day Relative": "DECIMAL(12, 3)",
-        }
-        for field, type_field in fields.items():
-            if f"`{field}`" in sql_query:
-                sql_query_alter = f"""
-                    ALTER TABLE `{table_name}`
-                    MODIFY `{field}` {type_field}"""
-                self.execute_query(database_name=database_name,
-                                   query=sql_query_alter, type_query="ALTER")
-
         # ----------------------------------------------------------------------
         #   Adds an Unique Key for the table
         # ----------------------------------------------------------------------
@@ -388,9 +412,9 @@ class GoogleCloudMySQL:
                 "Account ID"
                 ]
 
-        if any(k in sql_query for k in keys):
+        if "Date" in dataframe.columns:
             for key in keys:
-                if key in sql_query and "`Date`" in sql_query:
+                if key in dataframe.columns:
                     self.logger.info(
                         f"Adding constraint to table '{table_name}' for '{key}'")
                     sql_query_alter = f"""
@@ -402,6 +426,12 @@ class GoogleCloudMySQL:
                                        query=sql_query_alter, type_query="ALTER")
                     break
 
+        # ----------------------------------------------------------------------
+        #   The new table (and its columns) is loaded in the schema cache on
+        #   the next use.
+        # ----------------------------------------------------------------------
+        self.get_schema_cache().invalidate()
+
         return True
 
     def load_pandas_from_db(self, database_name: str, table_name: Union[str, List[str]]):
@@ -413,13 +443,17 @@ class GoogleCloudMySQL:
         flag_final, level_final, message_final = M.get_status(
             self.logger_name, "Storage_LoadSuccess_Database")
 
-        for table_name_item in table_name:
-            dataframe, flag, level, message = self.load_pandas_from_db_item(database_name=database_name,
-                                                                            table_name=table_name_item)
-            dataframes.append(dataframe)
-            if flag != C.SUCCESS:
-                flag_final, level_final, message_final = M.get_status(
-                    self.logger_name, "Storage_LoadError_Database")
+        # ----------------------------------------------------------------------
+        #   All the tables are read with the same connection.
+        # ----------------------------------------------------------------------
+        with self.transaction(database_name=database_name):
+            for table_name_item in table_name:
+                dataframe, flag, level, message = self.load_pandas_from_db_item(database_name=database_name,
+                                                                                table_name=table_name_item)
+                dataframes.append(dataframe)
+                if flag != C.SUCCESS:
+                    flag_final, level_final, message_final = M.get_status(
+                        self.logger_name, "Storage_LoadError_Database")
 
         return dataframes, flag_final, level_final, message_final
 
@@ -431,19 +465,25 @@ class GoogleCloudMySQL:
         # ----------------------------------------------------------------------
         #   Gets the data from database, along with the columns structure, since
         #   they are the same from the DataFrame, and convert the results in the
-        #   Dataframe.
+        #   Dataframe. The columns come from the schema cache, and only a table
+        #   unknown to it (e.g. created by another process) is described.
         # ----------------------------------------------------------------------
-        sql_query = f"""
-            DESCRIBE `{table_name}`;
-        """
+        columns = self.get_schema_cache().columns(database_name=database_name,
+                                                  table_name=table_name,
+                                                  execute=self.select_query)
 
-        result_columns = self.execute_query(database_name=database_name,
-                                            query=sql_query,
-                                            type_query="SELECT")
+        if columns is None:
+            sql_query = f"""
+                DESCRIBE `{table_name}`;
+            """
 
-        columns = []
-        for item in result_columns:
-            columns.append(item[0])
+            result_columns = self.execute_query(database_name=database_name,
+                                                query=sql_query,
+                                                type_query="SELECT")
+
+            columns = []
+            for item in result_columns:
+                columns.append(item[0])
 
         sort_list = []
         if "WKN" in columns:
@@ -486,10 +526,16 @@ class GoogleCloudMySQL:
             table_name = [table_name]
             dataframe = [dataframe]
 
-        for table_name_item, dataframe_item in zip(table_name, dataframe):
-            self.save_pandas_as_db_item(database_name=database_name,
-                                        table_name=table_name_item,
-                                        dataframe=dataframe_item)
+        # ----------------------------------------------------------------------
+        #   All the statements (creation of the database and tables, and the
+        #   insertion of the data) use the same connection, and the data of
+        #   all the tables is committed at once.
+        # ----------------------------------------------------------------------
+        with self.transaction():
+            for table_name_item, dataframe_item in zip(table_name, dataframe):
+                self.save_pandas_as_db_item(database_name=database_name,
+                                            table_name=table_name_item,
+                                            dataframe=dataframe_item)
 
     def save_pandas_as_db_item(self, database_name: str, table_name: str, dataframe: pd.DataFrame):
 
@@ -497,9 +543,11 @@ class GoogleCloudMySQL:
             f"Storing data from Dataframe to table '{table_name}'")
 
         # ----------------------------------------------------------------------
-        # Prepare the Pandas dataframe for storage.
+        # Prepare the Pandas dataframe for storage. The drop of the column
+        # already makes the copy of the dataframe, which is then changed in
+        # place.
         # ----------------------------------------------------------------------
-        dataframe_storage = dataframe.copy()
+        dataframe_storage = dataframe.drop(columns=["Unnamed: 0"], errors="ignore")
 
         if "Date" in dataframe_storage.columns:
             # dataframe_storage["Date"] = pd.to_datetime(
@@ -509,9 +557,6 @@ class GoogleCloudMySQL:
             dataframe_storage['Date'] = pd.to_datetime(
                 dataframe_storage['Date'], infer_datetime_format=True)
 
-        if "Unnamed: 0" in dataframe_storage.columns:
-            dataframe_storage.drop(columns=["Unnamed: 0"], inplace=True)
-        dataframe_storage.index = pd.RangeIndex(len(dataframe_storage.index))
         dataframe_storage.reset_index(inplace=True, drop=True)
         if "WKN" in dataframe_storage.columns and "Date" in dataframe_storage.columns:
             dataframe_storage.sort_values(
@@ -533,38 +578,21 @@ class GoogleCloudMySQL:
 
         self.logger.info(f"Adding data to {table_name}")
 
-        pandas_columns_list = [
-            '`' + x + '`' for x in dataframe_storage.columns]
-        pandas_columns_list = ", ".join(pandas_columns_list)
-
-        pandas_values_list = ['%s'] * len(dataframe_storage.columns)
-        pandas_values_list = ', '.join(pandas_values_list)
-
-        updates = []
-        for item in dataframe_storage.columns:
-            #updates.append(f"`{item}` = newval.`{item}`")
-            updates.append(f"`{item}` = VALUES(`{item}`)")
-
-        update_string = ", ".join(updates)
-
         # ----------------------------------------------------------------------
-        #   Adequates the values in the dataframe for the SQL, since there are
-        #   different data representation.
+        #   The rows are sent in chunks (multi-row inserts or a CSV file for
+        #   ``LOAD DATA``), converted to the SQL representation chunk by chunk.
         # ----------------------------------------------------------------------
-        dataframe_storage.replace([np.inf, -np.inf], np.nan, inplace=True)
-        dataframe_storage_clear = dataframe_storage.replace(np.NaN, pd.NA).where(
-            dataframe_storage.notnull(), None)
-
-        values = dataframe_storage_clear.to_numpy().tolist()
-
-        sql_query = f"""
-            INSERT INTO `{table_name}` ({pandas_columns_list})
-            VALUES ({pandas_values_list}) 
-            ON DUPLICATE KEY UPDATE
-                {update_string}
-            """
+        with self.transaction(database_name=database_name) as cursor:
+            if self.config.mysql_bulk_mode == "load_data":
+                statements = load_data(cursor=cursor,
+                                       table_name=table_name,
+                                       dataframe=dataframe_storage,
+                                       temp_folder=self.temp_folder)
+            else:
+                statements = bulk_insert(cursor=cursor,
+                                         table_name=table_name,
+                                         dataframe=dataframe_storage,
+                                         chunk_rows=self.config.mysql_bulk_rows or 1000)
 
-        self.execute_query(database_name=database_name,
-                           query=sql_query,
-                           type_query="INSERT",
-                           parameter=values)
+        self.logger.info(f"Added {len(dataframe_storage)} rows to {table_name} "
+                         f"in {statements} statements")
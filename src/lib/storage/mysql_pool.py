@@ -0,0 +1,193 @@
+"""Pool of connections to the MySQL database, so the SSL connection is opened
+once and reused by the following statements, instead of one connection per
+statement.
+
+There is a single pool per database server and user in each process (see
+``get_pool``), shared by all the ``Storage`` objects and threads (e.g. the
+requests of the Flask app).
+
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """Thread-safe pool of up to ``pool_size`` connections. A connection is
+    used by a single thread at a time: ``connection`` blocks while all of them
+    are in use.
+
+    Each use of a connection is a job of the Cloud SQL instance (see
+    ``CloudSQLLifecycle``), so the instance is started when needed and kept
+    running while the connections are in use.
+
+    Attributes
+    ----------
+        idle: list
+            Connections available for use.
+        opened: int
+            Number of connections opened by the pool.
+    """
+
+    def __init__(self, config_db: dict, pool_size: int = 4, lifecycle=None,
+                 logger_name: str = "invst", connect=None):
+        """
+        Parameters
+        ----------
+            config_db: dict
+                Arguments of the connection (see ``create_connection_string``).
+            pool_size: int, optional
+                Maximum number of connections.
+            lifecycle: `CloudSQLLifecycle`, optional
+                Manager of the instance.
+            logger_name: str, optional
+                Name of the logger.
+            connect: optional
+                Function to open a connection. ``mysql.connector.connect`` if
+                not passed.
+        """
+        self.config_db = dict(config_db)
+        self.pool_size = max(int(pool_size), 1)
+        self.lifecycle = lifecycle
+        self.connect = connect
+
+        self.logger = logging.getLogger(logger_name + ".mysql_pool")
+
+        self.idle = []
+        self.opened = 0
+        self._lock = threading.Lock()
+        self._available = threading.BoundedSemaphore(self.pool_size)
+
+    def open_connection(self):
+        """Opens a new connection to the database."""
+        if self.connect is None:
+            import mysql.connector
+
+            self.connect = mysql.connector.connect
+
+        connection = self.connect(**self.config_db)
+        connection.autocommit = False
+
+        with self._lock:
+            self.opened += 1
+        self.logger.debug("Opened connection %s of the pool.", self.opened)
+
+        return connection
+
+    def get_connection(self):
+        """Takes a connection from the pool (opening it if there is no idle
+        one, or if the idle one was disconnected, e.g. by a stop of the
+        instance), waiting while all of them are in use.
+
+        Raises
+        ------
+            ConnectionError
+                If the Cloud SQL instance couldn't be started.
+
+        """
+        self._available.acquire()
+
+        # ----------------------------------------------------------------------
+        #   If the start of the instance fails, the job is already released by
+        #   the lifecycle, so only the place in the pool is given back.
+        # ----------------------------------------------------------------------
+        try:
+            started = self.lifecycle is None or self.lifecycle.acquire()
+        except Exception:
+            self._available.release()
+            raise
+
+        if not started:
+            self._available.release()
+            raise ConnectionError("The Google Cloud SQL instance could not be started.")
+
+        try:
+            with self._lock:
+                connection = self.idle.pop() if self.idle else None
+
+            if connection is not None and not connection.is_connected():
+                self.discard(connection)
+                connection = None
+
+            if connection is None:
+                connection = self.open_connection()
+
+            return connection
+
+        except Exception:
+            if self.lifecycle is not None:
+                self.lifecycle.release()
+            self._available.release()
+            raise
+
+    def put_connection(self, connection, discard: bool = False):
+        """Returns a connection to the pool, or closes it if ``discard``."""
+        try:
+            if discard:
+                self.discard(connection)
+            else:
+                with self._lock:
+                    self.idle.append(connection)
+        finally:
+            if self.lifecycle is not None:
+                self.lifecycle.release()
+            self._available.release()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Context with a connection of the pool, as a transaction: it is
+        committed at the end, or rolled back if an exception is raised."""
+        connection = self.get_connection()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            # ------------------------------------------------------------------
+            #   A connection which fails also on the rollback (e.g. it was
+            #   lost) is not returned to the pool.
+            # ------------------------------------------------------------------
+            try:
+                connection.rollback()
+            except Exception:
+                self.put_connection(connection, discard=True)
+                raise
+            self.put_connection(connection)
+            raise
+        else:
+            self.put_connection(connection)
+
+    def close(self):
+        """Closes the idle connections."""
+        with self._lock:
+            idle, self.idle = self.idle, []
+
+        for connection in idle:
+            self.discard(connection)
+
+
+# ------------------------------------------------------------------------------
+#   Pools of the process, with the server and user as key.
+# ------------------------------------------------------------------------------
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+def get_pool(config_db: dict, pool_size: int = 4, lifecycle=None,
+             logger_name: str = "invst"):
+    """Pool of the server and user from ``config_db``, created on the first
+    call and shared afterwards. See ``ConnectionPool`` for the parameters."""
+    key = (config_db.get("host"), config_db.get("user"))
+
+    with POOLS_LOCK:
+        if key not in POOLS:
+            POOLS[key] = ConnectionPool(config_db=config_db,
+                                        pool_size=pool_size,
+                                        lifecycle=lifecycle,
+                                        logger_name=logger_name)
+        return POOLS[key]
@@ -0,0 +1,132 @@
+"""Cache of the schema of the MySQL server (databases, tables and their
+columns), so the checks before storing a dataframe (``create_db`` and
+``create_table_from_pandas``) and the columns of the tables loaded don't need
+a query each.
+
+The cache is loaded with a single query to ``information_schema`` the first
+time it is used, and kept for the process (see ``get_schema_cache``). The
+statements changing the schema (DDL) done by the ``Storage`` update it. Since
+other processes can create databases and tables meanwhile, only the existing
+ones are answered from the cache: a database or table not found is checked
+again by loading the schema once more.
+
+"""
+import threading
+
+
+class SchemaCache:
+    """Databases and tables of the server, with the columns of each table.
+
+    Attributes
+    ----------
+        databases: set
+            Names of the databases.
+        tables: dict
+            Columns (in the order of the table) with ``(database, table)`` as
+            key.
+        loaded: bool
+            ``True`` if the content reflects the server (i.e. loaded and not
+            invalidated since).
+    """
+    query = """
+        SELECT s.SCHEMA_NAME, c.TABLE_NAME, c.COLUMN_NAME
+        FROM information_schema.SCHEMATA s
+        LEFT JOIN information_schema.COLUMNS c ON c.TABLE_SCHEMA = s.SCHEMA_NAME
+        WHERE s.SCHEMA_NAME NOT IN ('mysql', 'sys', 'performance_schema', 'information_schema')
+        ORDER BY s.SCHEMA_NAME, c.TABLE_NAME, c.ORDINAL_POSITION;
+        """
+
+    def __init__(self):
+        self.databases = set()
+        self.tables = {}
+        self.loaded = False
+        self._lock = threading.RLock()
+
+    def load(self, execute):
+        """Loads the schema from the server.
+
+        Parameters
+        ----------
+            execute: function
+                Function running a ``SELECT`` and returning the rows (e.g.
+                ``execute_query`` of the storage, with the query as argument).
+
+        """
+        rows = execute(self.query)
+
+        with self._lock:
+            self.databases = set()
+            self.tables = {}
+            for database, table, column in rows:
+                self.databases.add(database)
+                if table is not None:
+                    self.tables.setdefault((database, table), []).append(column)
+            self.loaded = True
+
+    def ensure_loaded(self, execute):
+        """Loads the schema, if not loaded yet.
+
+        Returns
+        -------
+            result: bool
+                ``True`` if the schema was loaded by this call.
+
+        """
+        with self._lock:
+            if not self.loaded:
+                self.load(execute)
+                return True
+            return False
+
+    def database_exists(self, database_name: str, execute):
+        """``True`` if the database exists. If not found in a schema loaded
+        before, the schema is loaded again to confirm it."""
+        with self._lock:
+            loaded = self.ensure_loaded(execute)
+            if database_name not in self.databases and not loaded:
+                self.load(execute)
+            return database_name in self.databases
+
+    def table_exists(self, database_name: str, table_name: str, execute):
+        """``True`` if the table exists. If not found in a schema loaded
+        before, the schema is loaded again to confirm it."""
+        with self._lock:
+            loaded = self.ensure_loaded(execute)
+            if (database_name, table_name) not in self.tables and not loaded:
+                self.load(execute)
+            return (database_name, table_name) in self.tables
+
+    def columns(self, database_name: str, table_name: str, execute):
+        """Columns of the table, or ``None`` if the table is not known."""
+        self.ensure_loaded(execute)
+        columns = self.tables.get((database_name, table_name))
+        return list(columns) if columns is not None else None
+
+    def add_database(self, database_name: str):
+        """Registers a database created by the storage."""
+        with self._lock:
+            self.databases.add(database_name)
+
+    def invalidate(self):
+        """Marks the cache to be loaded again on the next use, after a change
+        of the tables."""
+        with self._lock:
+            self.loaded = False
+
+
+# ------------------------------------------------------------------------------
+#   Caches of the process, with the server and user as key.
+# ------------------------------------------------------------------------------
+SCHEMA_CACHES = {}
+SCHEMA_CACHES_LOCK = threading.Lock()
+
+
+def get_schema_cache(config_db: dict):
+    """Cache of the server and user from ``config_db``, created on the first
+    call and shared afterwards."""
+    key = (config_db.get("host"), config_db.get("user"))
+
+    with SCHEMA_CACHES_LOCK:
+        if key not in SCHEMA_CACHES:
+            SCHEMA_CACHES[key] = SchemaCache()
+        return SCHEMA_CACHES[key]
@@ -0,0 +1,211 @@
+"""Data analysis of several symbols / tickers at once.
+"""
+
+import logging
+from src.analysis import Analysis
+from src.run_context import RunContext
+from src.lib.analysis.panel import Panel
+from src.lib.analysis.shared_lstm import SharedLSTM
+
+LOGGER_NAME = "invst.panel_analysis"
+
+
+class PanelAnalysis(Panel, SharedLSTM):
+    """Analysis of a list of symbols / tickers, where the indicators and
+    recommendations of the strategies are calculated for all the symbols at
+    once (see ``Panel``), instead of one ``Analysis`` at a time.
+
+    Each symbol still has its own ``Analysis`` object, which is used for the
+    steps which depend on a single symbol: data adequation, prediction with the
+    LSTM, simulation, summary and arbitration. The results per symbol are the
+    same as from ``Analysis.analyze``. With ``lstm_shared_model`` enabled, the
+    prediction is done for all the symbols at once with the shared model (see
+    ``SharedLSTM``).
+
+    Attributes
+    ----------
+        analyses: `list`
+            List with the ``Analysis`` object for each symbol, in the same
+            order as the input.
+        logger_name: `string`
+            Name of the logger.
+    """
+
+    def __init__(self,
+                 ohlc_data: dict,
+                 logger_name: str,
+                 context: RunContext = None):
+        """
+        Parameters
+        ----------
+            ohlc_data: `dictionary`
+                Dictionary with the symbol as key and a Pandas dataframe with
+                its OHLC data as value.
+            logger_name: `string`
+                Name of the logger.
+            context: `RunContext`, optional
+                Context of the run, shared by the analysis of all the symbols.
+                If not passed, a new one is created.
+        """
+
+        self.logger_name = logger_name + ".panel_analysis"
+        self.logger = logging.getLogger(self.logger_name)
+        self.logger.info("Initializing panel analysis.")
+
+        if context is None:
+            context = RunContext(logger_name=logger_name)
+
+        self.analyses = []
+        for symbol, data in ohlc_data.items():
+            self.analyses.append(Analysis(symbol=symbol,
+                                          ohlc_data=data,
+                                          logger_name=logger_name,
+                                          context=context))
+
+    def analyze(self):
+        """Performs the complete analysis of all the symbols.
+
+        The basic operation of this method is:
+
+        1. **Pre-Process**: Prepares each symbol as done by ``Analysis``.
+        2. **Panels**: Groups the symbols with the same number of entries into
+           panels. Symbols with a shorter history (e.g. recently listed) end
+           up in a separate panel.
+        3. **Indicators and recommendations**: Calculated for each panel at
+           once. Only the prediction of the MACD Histogram is done by symbol,
+           or for all the symbols at once with the shared model.
+        4. **Evaluation**: Simulation, summary and arbitration for each symbol.
+
+        Returns
+        -------
+            results: `dictionary`
+                Dictionary with the symbol as key and the same outcome from
+                ``Analysis.analyze`` as value (decision, analysis results and
+                dataframe).
+
+        """
+
+        # ----------------------------------------------------------------------
+        #   Data adequation, grouping the symbols with the same layout of
+        #   entries (real data followed by the prediction).
+        # ----------------------------------------------------------------------
+        groups = {}
+        for analysis in self.analyses:
+            analysis.prepare_analysis()
+
+            dataset = analysis.ohlc_dataset
+            key = (len(dataset),
+                   int((dataset["Data Type"] == "Prediction data").sum()))
+            groups.setdefault(key, []).append(analysis)
+
+        # ----------------------------------------------------------------------
+        #   Indicators and recommendations for each panel
+        # ----------------------------------------------------------------------
+        for key, analyses in groups.items():
+            self.logger.info("Calculating panel with %s symbols and %s entries",
+                             len(analyses), key[0])
+            self.analyze_panel(analyses=analyses)
+
+        # ----------------------------------------------------------------------
+        #   The MACD recommendation depends on the prediction of the histogram.
+        # ----------------------------------------------------------------------
+        self.predict_panel(analyses=self.analyses)
+
+        for analyses in groups.values():
+            self.recommend_panel_group_MACD(analyses=analyses)
+
+        # ----------------------------------------------------------------------
+        #   Individual evaluation of the strategies and final decision.
+        # ----------------------------------------------------------------------
+        results = {}
+        for analysis in self.analyses:
+            results[analysis.symbol] = analysis.evaluate_analysis(
+                precalculated=True)
+
+        return results
+
+    def train_models(self):
+        """Trains or refreshes the LSTM model shared by all the symbols, with
+        the pooled sequences of the MACD Histogram. Used by the training worker
+        (``automation/train_models.py``) with ``lstm_shared_model`` enabled.
+
+        Returns
+        -------
+            lstm_training: `dictionary`
+                Origin of the model, epochs trained and duration.
+
+        """
+        for analysis in self.analyses:
+            analysis.prepare_analysis()
+            analysis.calc_MACD_indicators()
+
+        return self.train_shared_LSTM(analyses=self.analyses,
+                                      source_column="MACD Histogram")
+
+    def analyze_panel(self, analyses: list):
+        """Calculates the indicators and recommendations from the strategies
+        for a group of symbols with the same number of entries, and writes them
+        into the dataframe of each symbol.
+
+        Parameters
+        ----------
+            analyses: `list`
+                List of ``Analysis`` objects, already prepared by
+                ``Analysis.prepare_analysis``.
+
+        """
+        datasets = [analysis.ohlc_dataset for analysis in analyses]
+        prediction = (datasets[0]["Data Type"] ==
+                      "Prediction data").to_numpy()
+
+        close = self.stack_panel(datasets=datasets,
+                                 source_column="Close Final")
+        change = self.stack_panel(datasets=datasets,
+                                  source_column="Close Final Change")
+
+        panel = self.calc_panel_indicators(close=close,
+                                           change=change,
+                                           prediction=prediction)
+        panel.update(self.recommend_panel(close=close, panel=panel))
+        self.unstack_panel(datasets=datasets, panel=panel)
+
+    def predict_panel(self, analyses: list):
+        """Predicts the MACD Histogram of the symbols: by symbol, or with a
+        single call of the shared model for all of them
+        (``lstm_shared_model``).
+
+        Parameters
+        ----------
+            analyses: `list`
+                List of ``Analysis`` objects, with the indicators calculated.
+
+        """
+        if not analyses:
+            return
+
+        config = analyses[0].config
+        if config.lstm_shared_model and config.forecaster == "lstm":
+            self.predict_shared_LSTM(analyses=analyses,
+                                     source_column="MACD Histogram",
+                                     result_column="MACD Histogram Fit")
+        else:
+            for analysis in analyses:
+                analysis.calc_MACD_prediction()
+
+    def recommend_panel_group_MACD(self, analyses: list):
+        """Calculates the recommendation from the MACD strategy for a group of
+        symbols with the same number of entries, after the prediction of the
+        histogram.
+
+        Parameters
+        ----------
+            analyses: `list`
+                List of ``Analysis`` objects from the same panel.
+
+        """
+        datasets = [analysis.ohlc_dataset for analysis in analyses]
+
+        histogram = self.stack_panel(datasets=datasets,
+                                     source_column="MACD Histogram")
+        self.unstack_panel(datasets=datasets,
+                           panel=self.recommend_panel_MACD(histogram=histogram))
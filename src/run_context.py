@@ -0,0 +1,128 @@
+"""Objects shared by all the symbols of a run (configuration, storage and
+connections), so they are created once per run instead of once per symbol.
+"""
+
+import logging
+from pathlib import Path
+from src.lib.config import Config
+from src.lib import constants as C
+
+
+class RunContext:
+    """Context of a run (e.g. ``run_analysis``), passed to the ``Analysis``,
+    ``PanelAnalysis`` and ``AsyncDataAccess`` objects created during it.
+
+    The configuration files are loaded once when the context is created. The
+    storage (which starts the Google Cloud SQL instance, if enabled) and the
+    pooled HTTP sessions are only created when first used, and then shared.
+
+    Attributes
+    ----------
+        config: `Config`
+            Configuration loaded from the files in ``cfg``.
+        config_loaded: `bool`
+            ``True`` if all the configuration files were loaded.
+        logger_name: `string`
+            Name of the logger of the run.
+    """
+
+    def __init__(self, logger_name: str, config: Config = None):
+        """
+        Parameters
+        ----------
+            logger_name: `string`
+                Name of the logger of the run.
+            config: `Config`, optional
+                Configuration already loaded. If not passed, it is loaded from
+                the files in ``cfg``.
+        """
+        self.logger_name = logger_name
+        self.logger = logging.getLogger(logger_name + ".run_context")
+
+        self.config_loaded = True
+        if config is None:
+            config = self.load_config()
+        self.config = config
+
+        self._storage = None
+        self._http = None
+
+    def load_config(self):
+        """Loads the configuration files (access, user data, local and
+        parameters).
+
+        Returns
+        -------
+            config: `Config`
+                Configuration with the content of the files.
+
+        """
+        config_base_path = Path.cwd().resolve() / "cfg"
+        config_access_file = config_base_path / "api-cfg.json"
+        config_access_userdata_file = config_base_path / "user" / "api-cfg-access.json"
+        config_local_file = config_base_path / "local" / "local.json"
+        config_parameters_file = config_base_path / "parameters.json"
+
+        config = Config(logger_name=self.logger_name)
+        results = [config.load_config(filename=config_access_file),
+                   config.load_config(filename=config_access_userdata_file),
+                   config.load_config(filename=config_local_file),
+                   config.load_config(filename=config_parameters_file)]
+
+        self.config_loaded = all(result[1] == C.SUCCESS for result in results)
+
+        return config
+
+    @property
+    def storage(self):
+        """Storage of the run, created on the first use."""
+        if self._storage is None:
+            from src.storage import Storage
+
+            self._storage = Storage(config=self.config,
+                                    logger_name=self.logger_name)
+
+        return self._storage
+
+    @property
+    def http(self):
+        """Pooled HTTP sessions of the run, created on the first use."""
+        if self._http is None:
+            from src.lib.http_session import HttpSessions
+
+            self._http = HttpSessions.from_config(self.config.http_config)
+
+        return self._http
+
+    @property
+    def data_storage(self):
+        """Folder for the data stored locally."""
+        return Path(self.config.local_config["paths"]["data_storage"])
+
+    @property
+    def ohlc_store(self):
+        """Settings of the local store of the OHLC data, or ``None`` if it is
+        disabled."""
+        if not self.config.ohlc_store:
+            return None
+
+        return {"folder": self.data_storage / "ohlc",
+                "max_age": self.config.ohlc_store_max_age}
+
+    @property
+    def rate_limit(self):
+        """Rate limit for the data provider. Without it, one request every
+        ``time_sleep`` is used."""
+        rate_limit = self.config.data_source_fetch_rate_limit
+        if rate_limit is None:
+            rate_limit = {"requests": 1, "period": self.config.time_sleep}
+
+        return rate_limit
+
+    def close(self):
+        """Closes the HTTP sessions of the run. The Cloud SQL instance is not
+        stopped here, but by its lifecycle manager once it is idle (see
+        ``CloudSQLLifecycle``)."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
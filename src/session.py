@@ -2,8 +2,8 @@ import logging
 import json
 import uuid
 import time
-import requests
 from src.lib import messages as M
+from src.lib.http_session import HttpSessions, get_http_sessions
 from src.lib.comdirect.access import Access
 from src.lib.comdirect.accounts import Accounts
 from src.lib.comdirect.depots import Depots
@@ -12,10 +12,17 @@ from src.lib.comdirect.orders import Orders
 
 class Session (Access, Accounts, Depots, Orders):
 
-    def __init__(self, access_config, access_userdata, logger_name, session_info: dict = None) -> None:
+    def __init__(self, access_config, access_userdata, logger_name, session_info: dict = None,
+                 http: HttpSessions = None) -> None:
 
         self.session_connected = False
 
+        # ----------------------------------------------------------------------
+        #   Pooled connections, so all the requests of the session reuse the
+        #   same connection to the host.
+        # ----------------------------------------------------------------------
+        self.http = http if http is not None else get_http_sessions()
+
         self.client_id = access_userdata["client_id"]
         self.client_secret = access_userdata["client_secret"]
         self.username = access_userdata["account_number"]
@@ -92,7 +99,7 @@ class Session (Access, Accounts, Depots, Orders):
                 'x-once-authentication': 'TAN_FREI',
             }
 
-        response = requests.request(
+        response = self.http.request(
             type_req, url, headers=headers, data=payload)
 
         # ----------------------------------------------------------------------
@@ -1,10 +1,12 @@
 import logging
+import threading
 import pandas as pd
 from pathlib import Path
 from src.lib import messages as M
 from src.lib.config import Config
 from src.lib.storage.dropbox import DropboxAPI as Dropbox
 from src.lib.storage.googlecloud_mysql import GoogleCloudMySQL
+from src.lib.storage.cloud_sql_lifecycle import get_lifecycle
 from src.lib.storage.pandas_operations import PandasOperations
 from typing import Union
 
@@ -13,9 +15,11 @@ class Storage(Dropbox, GoogleCloudMySQL, PandasOperations):
 
     def __init__(self, config: Config, logger_name: str) -> None:
 
-        self.cnxn = None
-        self.cursor = None
         self.config_db = None
+        self.lifecycle = None
+        self.pool = None
+        self.schema_cache = None
+        self.transaction_state = threading.local()
 
         # ----------------------------------------------------------------------
         #   Defines the location of the files with configurations and load them.
@@ -65,10 +69,20 @@ class Storage(Dropbox, GoogleCloudMySQL, PandasOperations):
         self.logger.info("Initializing storage.")
 
         # ----------------------------------------------------------------------
-        #   Starts the Google Cloud SQL is this option is enabled.
+        #   Manager of the Google Cloud SQL instance, if this option is
+        #   enabled. It is shared by all the storages of the process, and the
+        #   instance is only started when the first connection is opened, and
+        #   stopped after ``cloud_sql_idle_timeout`` minutes without use by
+        #   any process (their activity is kept under ``data_storage``).
         # ----------------------------------------------------------------------
         if self.store_google_cloud_mysql:
-            self.start_stop_instance(start_stop="START")
+            self.lifecycle = get_lifecycle(
+                api=self,
+                idle_timeout=(self.config.cloud_sql_idle_timeout or 0) * 60.0,
+                status_max_age=self.config.cloud_sql_status_max_age or 60,
+                logger_name=logger_name,
+                activity_folder=(self.data_storage / "cloud_sql_activity"
+                                 if self.data_storage is not None else None))
 
     def close(self):
 
@@ -0,0 +1,208 @@
+import pytest
+import numpy as np
+import pandas as pd
+from conftest import random_walk_df
+from src.lib.analysis.basic import Basic
+from src.lib.analysis.arbitration import Arbitration
+
+
+class ArbitrationHarness (Basic, Arbitration):
+
+    def __init__(self, ohlc_dataset):
+        self.ohlc_dataset = ohlc_dataset
+
+
+def create_test_df(seed: int, length_real: int = 750, length_prediction: int = 25):
+    """Creates a random walk dataframe (see ``random_walk_df``) with an
+    oscillating series (similar to the MACD Histogram and RSI) and the
+    Bollinger Bands of the closing value."""
+
+    def oscillators(rng):
+        oscillator = 50 + 30 * np.sin(np.arange(length_real) / 15) + \
+            rng.normal(0, 10, length_real)
+        return {"Oscillator": oscillator, "Oscillator Centered": oscillator - 50}
+
+    dataframe = random_walk_df(seed=seed, length_real=length_real,
+                               length_prediction=length_prediction,
+                               columns=oscillators, dates=False)
+
+    sma = dataframe["Close Final"].rolling(window=20).mean()
+    std = dataframe["Close Final"].rolling(window=20).std()
+    dataframe["Upper"] = sma + 2 * std
+    dataframe["Lower"] = sma - 2 * std
+
+    return dataframe
+
+
+def reference_threshold(dataframe: pd.DataFrame,
+                        source_column: str,
+                        threshold_upper,
+                        threshold_lower,
+                        hysteresis: bool,
+                        values_upper_mid_lower: tuple):
+    """Row by row recommendation, as originally done by
+    ``recommend_threshold_cross`` and ``recommend_threshold_curve``. Thresholds
+    passed as strings are used as column names."""
+
+    dataframe = dataframe.copy()
+    value_default = values_upper_mid_lower[1]
+    value_high = values_upper_mid_lower[0]
+    value_low = values_upper_mid_lower[2]
+
+    dataframe.loc[:, "Result"] = value_default
+
+    i = 0
+    for index, row in dataframe.iterrows():
+        if i > 1:
+            upper = threshold_upper
+            lower = threshold_lower
+            if isinstance(threshold_upper, str):
+                upper = dataframe.iloc[i][threshold_upper]
+                lower = dataframe.iloc[i][threshold_lower]
+
+            if dataframe.iloc[i][source_column] > upper:
+                value = value_high
+            elif dataframe.iloc[i][source_column] < lower:
+                value = value_low
+            elif dataframe.iloc[i-1]["Result"] == value_high and hysteresis:
+                value = value_high
+            elif dataframe.iloc[i-1]["Result"] == value_low and hysteresis:
+                value = value_low
+            else:
+                value = value_default
+
+            dataframe.iloc[i, dataframe.columns.get_loc("Result")] = value
+        i = i + 1
+
+    return dataframe["Result"].to_numpy()
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("hysteresis", [True, False])
+def test_recommend_threshold_cross_abs_parity(seed, hysteresis):
+    dataframe = create_test_df(seed=seed)
+    values = ("SELL", "HOLD", "BUY")
+
+    expected = reference_threshold(dataframe, "Oscillator", 70, 30,
+                                   hysteresis, values)
+
+    harness = ArbitrationHarness(dataframe)
+    harness.recommend_threshold_cross(source_column="Oscillator",
+                                      threshold_upper=70,
+                                      threshold_lower=30,
+                                      mode="abs",
+                                      hysteresis=hysteresis,
+                                      values_upper_mid_lower=values,
+                                      result_column="Result")
+
+    np.testing.assert_array_equal(
+        harness.ohlc_dataset["Result"].to_numpy(), expected)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_recommend_threshold_cross_norm_parity(seed):
+    dataframe = create_test_df(seed=seed)
+    values = ("BUY", "HOLD", "SELL")
+    column = dataframe["Oscillator Centered"]
+
+    expected = reference_threshold(dataframe, "Oscillator Centered",
+                                   column.max() * 0.15, column.min() * 0.15,
+                                   True, values)
+
+    harness = ArbitrationHarness(dataframe)
+    harness.recommend_threshold_cross(source_column="Oscillator Centered",
+                                      threshold_upper=0.15,
+                                      threshold_lower=0.15,
+                                      mode="norm",
+                                      values_upper_mid_lower=values,
+                                      result_column="Result")
+
+    np.testing.assert_array_equal(
+        harness.ohlc_dataset["Result"].to_numpy(), expected)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_recommend_threshold_curve_parity(seed):
+    dataframe = create_test_df(seed=seed)
+    values = ("BUY", "HOLD", "SELL")
+
+    expected = reference_threshold(dataframe, "Close Final", "Upper", "Lower",
+                                   True, values)
+
+    harness = ArbitrationHarness(dataframe)
+    harness.recommend_threshold_curve(source_column="Close Final",
+                                      reference_column_upper="Upper",
+                                      reference_column_lower="Lower",
+                                      values_upper_mid_lower=values,
+                                      result_column="Result")
+
+    np.testing.assert_array_equal(
+        harness.ohlc_dataset["Result"].to_numpy(), expected)
+
+
+def test_threshold_states_hysteresis():
+    values = np.array([90, 90, 50, 80, 50, 50, 20, 50, np.nan, 80])
+
+    states = Arbitration.threshold_states(values=values,
+                                          threshold_upper=70,
+                                          threshold_lower=30)
+
+    np.testing.assert_array_equal(states, [0, 0, 0, 1, 1, 1, -1, -1, -1, 1])
+    assert states.dtype == np.int8
+
+
+def reference_define_actions(dataframe: pd.DataFrame, source_column: str):
+    """Row by row events, as originally done by ``define_actions``."""
+
+    events = []
+    for i in range(dataframe.shape[0]):
+        current_value = dataframe.iloc[i][source_column]
+        previous_value = dataframe.iloc[i - 1][source_column]
+
+        if (current_value == "BUY" and previous_value != "BUY"):
+            events.append("BUY")
+        elif (current_value == "SELL" and previous_value != "SELL"):
+            events.append("SELL")
+        else:
+            events.append("HOLD")
+
+    return np.array(events, dtype=object)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_define_actions_parity(seed):
+    dataframe = create_test_df(seed=seed)
+
+    harness = ArbitrationHarness(dataframe)
+    harness.recommend_threshold_curve(source_column="Close Final",
+                                      reference_column_upper="Upper",
+                                      reference_column_lower="Lower",
+                                      result_column="Recommendation")
+    harness.ohlc_dataset.loc[harness.ohlc_dataset.index[-3:],
+                             "Recommendation"] = np.nan
+
+    expected = reference_define_actions(harness.ohlc_dataset,
+                                        "Recommendation")
+
+    harness.define_actions(source_column="Recommendation",
+                           result_column="Events")
+    result = harness.ohlc_dataset["Events"].to_numpy()
+
+    # --------------------------------------------------------------------------
+    #   The first entry was compared against the last one (wrapping around),
+    #   while now it has no previous entry and is always HOLD.
+    # --------------------------------------------------------------------------
+    np.testing.assert_array_equal(result[1:], expected[1:])
+    assert result[0] == "HOLD"
+
+
+def test_define_actions_first_row():
+    dataframe = pd.DataFrame({"Recommendation": ["BUY", "BUY", "HOLD", "SELL",
+                                                 "SELL", "BUY", "SELL"]})
+
+    harness = ArbitrationHarness(dataframe)
+    harness.define_actions(source_column="Recommendation",
+                           result_column="Events")
+
+    assert list(harness.ohlc_dataset["Events"]) == [
+        "HOLD", "HOLD", "HOLD", "SELL", "HOLD", "BUY", "SELL"]
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+import pandas as pd
+from conftest import random_walk_df
+from src.lib.analysis.basic import Basic
+
+
+def create_test_df(seed: int, length_real: int = 750, length_prediction: int = 25):
+    """Creates a random walk dataframe (see ``random_walk_df``) with its gains
+    and losses, as used in the RSI."""
+
+    dataframe = random_walk_df(seed=seed, length_real=length_real,
+                               length_prediction=length_prediction)
+
+    change = dataframe["Close Final"].diff(1)
+    dataframe["Gain"] = change.mask(change < 0, 0)
+    dataframe["Loss Absolute"] = change.mask(change > 0, 0).abs()
+
+    return dataframe
+
+
+def reference_wilder(dataframe: pd.DataFrame, source_column: str, length: int):
+    """Element by element smoothing, as originally done in ``calc_RSI_SMA``."""
+
+    average = dataframe[source_column].rolling(
+        window=length, min_periods=length).mean().to_numpy()
+    average[length + 1:] = np.nan
+    source = dataframe[source_column].to_numpy()
+
+    for i in range(length + 1, len(average)):
+        average[i] = (average[i - 1] * (length - 1) + source[i]) / length
+
+    return average
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("source_column", ["Gain", "Loss Absolute"])
+def test_calc_wilder_parity(seed, source_column):
+    dataframe = create_test_df(seed=seed)
+
+    expected = reference_wilder(dataframe, source_column, 14)
+
+    Basic().calc_wilder(dataframe=dataframe,
+                        source_column=source_column,
+                        length=14,
+                        result_column="Average")
+    result = dataframe["Average"].to_numpy()
+
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+def test_calc_wilder_rsi_parity():
+    dataframe = create_test_df(seed=3)
+    rs = (reference_wilder(dataframe, "Gain", 14) /
+          reference_wilder(dataframe, "Loss Absolute", 14))
+    expected = 100 - (100 / (1 + rs))
+
+    basic = Basic()
+    basic.calc_wilder(dataframe=dataframe, source_column="Gain", length=14,
+                      result_column="Gain Average")
+    basic.calc_wilder(dataframe=dataframe, source_column="Loss Absolute",
+                      length=14, result_column="Loss Average")
+    result = 100 - (100 / (1 + dataframe["Gain Average"] /
+                           dataframe["Loss Average"])).to_numpy()
+
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
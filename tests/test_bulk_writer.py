@@ -0,0 +1,88 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from automation.benchmark_bulk_writer import StandInCursor, benchmark, write_legacy
+from src.lib.storage.bulk_writer import (bulk_insert, clean_chunk, insert_statement,
+                                         load_data)
+
+
+class CursorHarness:
+    """Cursor recording the statements and their parameters."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, query, parameter=None):
+        self.calls.append((query, parameter))
+
+
+def create_dataframe(rows=10):
+    return pd.DataFrame({
+        "Date": pd.date_range("2021-01-01", periods=rows, freq="D").strftime("%Y-%m-%d"),
+        "WKN": [f"A\\{i}" if i % 3 else f'B"{i}' for i in range(rows)],
+        "Quantity": np.arange(rows),
+        "Value": np.where(np.arange(rows) % 4 == 0, np.nan, np.arange(rows) * 1.5),
+        "Ratio": np.where(np.arange(rows) % 5 == 0, np.inf, 0.5),
+    })
+
+
+def test_clean_chunk():
+    dataframe = pd.DataFrame({"Date": pd.to_datetime(["2021-01-01", None]),
+                              "Value": [np.inf, 1.5],
+                              "Quantity": [1, 2],
+                              "Flag": [True, False]})
+
+    rows = clean_chunk(dataframe)
+
+    assert rows == [(pd.Timestamp("2021-01-01"), None, 1, True), (None, 1.5, 2, False)]
+    assert type(rows[1][1]) is float and type(rows[0][2]) is int
+
+
+def test_chunks():
+    dataframe = create_dataframe(rows=25)
+    cursor = CursorHarness()
+
+    statements = bulk_insert(cursor, "table", dataframe, chunk_rows=10)
+
+    assert statements == 3
+    assert [len(parameter) for _, parameter in cursor.calls] == [50, 50, 25]
+    assert cursor.calls[0][0] == insert_statement("table", list(dataframe.columns), 10)
+    assert cursor.calls[2][0].count("(%s, %s, %s, %s, %s)") == 5
+
+    # The size of the statements is bounded.
+    cursor = CursorHarness()
+    bulk_insert(cursor, "table", dataframe, chunk_rows=10, max_bytes=200)
+    assert len(cursor.calls) == 25
+
+
+def read_table(connection):
+    return connection.execute("SELECT * FROM history ORDER BY `Date`").fetchall()
+
+
+def test_same_result():
+    dataframe = create_dataframe()
+    tables = []
+
+    for write in [write_legacy,
+                  lambda cursor, table, data: bulk_insert(cursor, table, data, chunk_rows=3),
+                  load_data]:
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE history (`Date`, `WKN`, `Quantity`, `Value`, `Ratio`, "
+                           "UNIQUE (`Date`))")
+        write(StandInCursor(connection), "history", dataframe)
+        # Writing again updates the rows.
+        write(StandInCursor(connection), "history", dataframe)
+        tables.append([tuple(str(value) for value in row) for row in read_table(connection)])
+
+    assert len(tables[0]) == len(dataframe)
+    assert tables[0] == tables[1] == tables[2]
+    assert tables[0][1][1] == "A\\1" and tables[0][0][1] == 'B"0'
+    assert tables[0][0][3] == "None" and tables[0][0][4] == "None"
+
+
+def test_benchmark():
+    results = benchmark(rows=400, chunk_rows=100)
+
+    assert set(results) == {"legacy", "insert", "load_data"}
+    assert all(result["Rows"] == 400 for result in results.values())
+    assert results["insert"]["Statements"] == 4
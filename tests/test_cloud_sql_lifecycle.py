@@ -0,0 +1,223 @@
+import json
+from src.lib.storage.cloud_sql_lifecycle import CloudSQLLifecycle, SharedActivity
+
+
+class Clock:
+    """Clock advanced only by the calls of ``sleep``."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class InstanceHarness:
+    """Instance which takes ``boot_time`` seconds to apply a new activation
+    policy, counting the requests to the API."""
+
+    def __init__(self, clock, policy="STOPPED", boot_time=100.0):
+        self.clock = clock
+        self.policy = policy
+        self.boot_time = boot_time
+        self.ready_at = 0.0
+        self.status_calls = 0
+        self.patches = []
+
+    def get_instance_status(self):
+        self.status_calls += 1
+        state = "RUNNABLE" if self.clock() >= self.ready_at else "PENDING_CREATE"
+        return self.policy, state, {}
+
+    def set_activation_policy(self, policy):
+        self.patches.append(policy)
+        self.policy = "RUNNING" if policy == "ALWAYS" else "STOPPED"
+        self.ready_at = self.clock() + self.boot_time
+
+
+def create_lifecycle(policy="STOPPED", idle_timeout=0):
+    clock = Clock()
+    api = InstanceHarness(clock, policy=policy)
+    lifecycle = CloudSQLLifecycle(api=api, idle_timeout=idle_timeout, status_max_age=30,
+                                  sleep=clock.sleep, clock=clock)
+    return lifecycle, api, clock
+
+
+def test_start_once():
+    lifecycle, api, clock = create_lifecycle()
+
+    assert lifecycle.start()
+    assert lifecycle.start()
+    with lifecycle.job():
+        with lifecycle.job():
+            assert lifecycle.active_jobs == 2
+
+    assert api.patches == ["ALWAYS"]
+    assert lifecycle.is_running()
+    assert clock.now >= api.boot_time
+
+
+def test_backoff():
+    lifecycle, api, clock = create_lifecycle()
+
+    lifecycle.start()
+
+    # Settle delay, then exponential backoff until the boot finishes.
+    polls = clock.sleeps[1:]
+    assert clock.sleeps[0] == lifecycle.settle_delay
+    assert polls == [2.0, 4.0, 8.0, 16.0, 32.0, 60.0]
+
+
+def test_status_cached():
+    lifecycle, api, clock = create_lifecycle(policy="RUNNING")
+
+    for _ in range(5):
+        assert lifecycle.is_running()
+    assert api.status_calls == 1
+
+    clock.now += 31
+    assert lifecycle.is_running()
+    assert api.status_calls == 2
+
+
+def test_stop_if_idle():
+    lifecycle, api, clock = create_lifecycle(policy="RUNNING", idle_timeout=600)
+
+    lifecycle.acquire()
+    clock.now += 1000
+    assert not lifecycle.stop_if_idle()
+
+    lifecycle.release()
+    lifecycle.cancel_idle_stop()
+    clock.now += 599
+    assert not lifecycle.stop_if_idle()
+
+    clock.now += 1
+    assert lifecycle.stop_if_idle()
+    assert api.patches == ["NEVER"]
+
+    # Already stopped.
+    assert lifecycle.stop()
+    assert api.patches == ["NEVER"]
+
+
+def test_no_idle_stop():
+    lifecycle, api, clock = create_lifecycle(policy="RUNNING")
+
+    with lifecycle.job():
+        pass
+
+    assert lifecycle._timer is None
+    assert api.patches == []
+
+
+def create_shared(tmp_path, clock, name):
+    """Activity of a process named ``name``, in a folder shared with the
+    others of the test."""
+    activity = SharedActivity(tmp_path, clock=clock, is_alive=lambda pid: True)
+    activity.path = tmp_path / f"{name}.json"
+    return activity
+
+
+def test_shared_activity(tmp_path):
+    clock = Clock()
+    api = InstanceHarness(clock, policy="RUNNING")
+    server = CloudSQLLifecycle(api=api, idle_timeout=600, status_max_age=30,
+                               activity=create_shared(tmp_path, clock, "server"),
+                               sleep=clock.sleep, clock=clock)
+    script = CloudSQLLifecycle(api=api, idle_timeout=600, status_max_age=30,
+                               activity=create_shared(tmp_path, clock, "script"),
+                               sleep=clock.sleep, clock=clock)
+
+    with server.job():
+        pass
+    script.acquire()
+
+    # The server is idle, but the script is in a transaction.
+    clock.now += 1000
+    assert not server.stop_if_idle()
+    assert server._timer is not None
+
+    # The script ended right now.
+    script.release()
+    assert not server.stop_if_idle()
+
+    clock.now += 600
+    assert server.stop_if_idle()
+    assert api.patches == ["NEVER"]
+    server.cancel_idle_stop()
+    script.cancel_idle_stop()
+
+
+def test_stop_on_exit(tmp_path):
+    clock = Clock()
+    api = InstanceHarness(clock, policy="RUNNING")
+    first = CloudSQLLifecycle(api=api, idle_timeout=600, status_max_age=30,
+                              activity=create_shared(tmp_path, clock, "first"),
+                              sleep=clock.sleep, clock=clock)
+    second = CloudSQLLifecycle(api=api, idle_timeout=600, status_max_age=30,
+                               activity=create_shared(tmp_path, clock, "second"),
+                               sleep=clock.sleep, clock=clock)
+
+    with first.job():
+        with second.job():
+            pass
+        # The other script still has a job.
+        assert not second.stop_on_exit()
+        assert not (tmp_path / "second.json").exists()
+
+    # The last script to end stops the instance, without waiting.
+    assert first.stop_on_exit()
+    assert api.patches == ["NEVER"]
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_stale_lease(tmp_path):
+    clock = Clock()
+    activity = SharedActivity(tmp_path, clock=clock, is_alive=lambda pid: pid != 1)
+    (tmp_path / "crashed.json").write_text(json.dumps(
+        {"host": activity.host, "pid": 1, "active_jobs": 2, "last_activity": 0.0}))
+    (tmp_path / "remote.json").write_text(json.dumps(
+        {"host": "other", "pid": 1, "active_jobs": 1, "last_activity": 0.0}))
+
+    assert activity.others() == (1, 0.0)
+    assert not (tmp_path / "crashed.json").exists()
+
+    clock.now += SharedActivity.lease_max_age + 1
+    assert activity.others() == (0, None)
+
+
+def test_stop_deferred():
+    lifecycle, api, clock = create_lifecycle(policy="RUNNING")
+
+    lifecycle.acquire()
+    lifecycle.acquire()
+    assert not lifecycle.stop()
+    assert lifecycle.stop_requested
+
+    lifecycle.release()
+    assert api.patches == []
+
+    # The instance is stopped at the end of the last job.
+    lifecycle.release()
+    assert api.patches == ["NEVER"]
+    assert not lifecycle.stop_requested
+
+
+def test_stop_refused(tmp_path):
+    clock = Clock()
+    api = InstanceHarness(clock, policy="RUNNING")
+    server = CloudSQLLifecycle(api=api, activity=create_shared(tmp_path, clock, "server"),
+                               sleep=clock.sleep, clock=clock)
+    script = CloudSQLLifecycle(api=api, activity=create_shared(tmp_path, clock, "script"),
+                               sleep=clock.sleep, clock=clock)
+
+    with script.job():
+        assert not server.stop()
+    assert server.stop()
+    assert api.patches == ["NEVER"]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from src.lib.analysis.sequences import Sequences
+from src.lib.analysis.forecasters import AutoRegressive, LinearExtrapolation, get_forecaster
+
+
+def create_sequences(series, sequence_length, prediction_length):
+    x, y = Sequences().create_dataset(dataset=series.reshape(-1, 1),
+                                      input_sequence_length=sequence_length,
+                                      output_sequence_length=prediction_length)
+    return x, y
+
+
+def test_autoregressive():
+    # Linear recurrence (with a small perturbation), so the next values are
+    # nearly linear in the sequence.
+    series = np.zeros(200)
+    series[:2] = [1.0, -0.5]
+    for t in range(2, len(series)):
+        series[t] = 0.6 * series[t - 1] - 0.3 * series[t - 2] + 0.1 + 0.01 * np.sin(t)
+
+    for prediction_length in [1, 5]:
+        x, y = create_sequences(series, 10, prediction_length)
+        model = get_forecaster("ar").fit(x[:150], y[:150])
+
+        prediction = model.predict(x[150:])
+        assert isinstance(model, AutoRegressive)
+        assert prediction.shape == y[150:].shape
+        assert prediction.dtype == np.float32
+        np.testing.assert_allclose(prediction, y[150:], atol=2e-3)
+
+
+def test_linear_extrapolation():
+    series = 3.0 + 0.25 * np.arange(60)
+
+    for prediction_length in [1, 4]:
+        x, y = create_sequences(series, 8, prediction_length)
+        model = get_forecaster("linear").fit(x, y)
+
+        assert isinstance(model, LinearExtrapolation)
+        np.testing.assert_allclose(model.predict(x), y, rtol=1e-6)
+
+
+def test_unknown_forecaster():
+    with pytest.raises(ValueError):
+        get_forecaster("prophet")
@@ -0,0 +1,28 @@
+from src.lib.http_session import HttpSessions
+
+
+def test_session_per_host():
+    http = HttpSessions(pool_size=4, retries=2)
+
+    session = http.get_session("https://api.comdirect.de/oauth/token")
+    assert http.get_session(
+        "https://api.comdirect.de/api/session/clients/user/v1/sessions") is session
+    assert http.get_session("https://yfapi.net/v8/finance/chart") is not session
+    assert len(http.sessions) == 2
+
+    adapter = session.get_adapter("https://api.comdirect.de/")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    assert 429 in adapter.max_retries.status_forcelist
+
+    http.close()
+    assert len(http.sessions) == 0
+
+
+def test_from_config():
+    http = HttpSessions.from_config({"timeout": 5, "retries": 1})
+    assert http.timeout == 5
+    assert http.retries == 1
+    assert http.pool_size == 10
+
+    assert HttpSessions.from_config(None).timeout == 30
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Maximum time (seconds) to import the entry points, in a new interpreter.
+BUDGET_ANALYSIS = 2.0
+BUDGET_APP = 5.0
+
+# Dependencies which are only imported when used (training, plots, reports,
+# storage).
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "matplotlib", "deepdiff",
+                 "mysql", "googleapiclient", "dropbox", "twilio", "PIL"]
+
+
+def measure_import(statement: str):
+    """Duration of the import and heavy modules loaded by it."""
+    code = ("import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "duration = time.perf_counter() - start\n"
+            f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps([duration, loaded]))\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_analysis():
+    duration, loaded = measure_import("from src.analysis import Analysis")
+
+    assert loaded == []
+    assert duration < BUDGET_ANALYSIS
+
+
+def test_import_app():
+    pytest.importorskip("flask")
+    pytest.importorskip("dash")
+    pytest.importorskip("requests")
+
+    duration, loaded = measure_import("import app")
+
+    assert loaded == []
+    assert duration < BUDGET_APP
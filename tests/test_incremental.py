@@ -0,0 +1,154 @@
+import logging
+import pytest
+import numpy as np
+import pandas as pd
+from conftest import random_walk_df
+from src.lib.analysis.basic import Basic
+from src.lib.analysis.arbitration import Arbitration
+from src.lib.analysis.performance_simulation import PerformanceSimulation
+from src.lib.analysis.summary import Summary
+from src.lib.analysis.panel import Panel
+from src.lib.analysis.incremental import Incremental
+
+METHODS = ["Crash", "MACD", "RSI SMA", "RSI EMA", "BBANDS"]
+
+
+class IncrementalHarness (Basic, Arbitration, PerformanceSimulation, Summary, Incremental):
+
+    def __init__(self, ohlc_dataset):
+        self.ohlc_dataset = ohlc_dataset
+        self.symbol = "TEST"
+        self.logger = logging.getLogger("test")
+        self.analysis_results = {}
+        self.data_length = int((ohlc_dataset["Data Type"] == "Real data").sum())
+        self.analysis_length_pre = 750
+        self.sequence_length = 10
+        self.prediction_length = 25
+        self.initial_value = 10000
+        self.stopgain = 1.4
+        self.stoploss = 0.85
+        self.operation_cost_fix = 4.90
+        self.operation_cost_proportional = 0.0025
+        self.operation_cost_min = 9.90
+        self.operation_cost_max = 59.90
+        self.tax_percentage = 0.1
+
+
+def create_test_df(seed: int, length_real: int, length_prediction: int = 25):
+    """Creates a random walk dataframe (see ``random_walk_df``) with a random
+    volume."""
+
+    return random_walk_df(seed=seed, length_real=length_real,
+                          length_prediction=length_prediction,
+                          columns=lambda rng: {"Volume": rng.integers(
+                              1000, 5000, length_real).astype(float)})
+
+
+def complete_analysis(dataframe: pd.DataFrame):
+    """Complete analysis of the strategies (without the LSTM prediction)."""
+
+    harness = IncrementalHarness(dataframe.copy())
+    harness.calc_change(dataframe=harness.ohlc_dataset,
+                        source_column="Close Final",
+                        shift=1,
+                        result_column="Close Final Change")
+
+    panel = Panel()
+    datasets = [harness.ohlc_dataset]
+    prediction = (harness.ohlc_dataset["Data Type"]
+                  == "Prediction data").to_numpy()
+    close = panel.stack_panel(datasets=datasets, source_column="Close Final")
+    change = panel.stack_panel(datasets=datasets,
+                               source_column="Close Final Change")
+    results = panel.calc_panel_indicators(close=close, change=change,
+                                          prediction=prediction)
+    results.update(panel.recommend_panel(close=close, panel=results))
+    results.update(panel.recommend_panel_MACD(
+        histogram=results["MACD Histogram"]))
+    panel.unstack_panel(datasets=datasets, panel=results)
+
+    harness.ohlc_dataset.loc[:, "Crash Recommendation"] = "HOLD"
+
+    for method in METHODS:
+        harness.define_actions(source_column=f"{method} Recommendation",
+                               result_column=f"{method} Recommended Events")
+        harness.simulate_performance(source_column_close="Close Final",
+                                     source_column_decision=f"{method} Recommendation",
+                                     source_column_events=f"{method} Recommended Events",
+                                     initial_value=harness.initial_value,
+                                     stopgain=harness.stopgain,
+                                     stoploss=harness.stoploss,
+                                     operation_cost_fix=harness.operation_cost_fix,
+                                     operation_cost_proportional=harness.operation_cost_proportional,
+                                     operation_cost_min=harness.operation_cost_min,
+                                     operation_cost_max=harness.operation_cost_max,
+                                     tax_percentage=harness.tax_percentage,
+                                     result_column=f"{method} Simulation")
+        harness.calculate_reference(source_column_close="Close Final",
+                                    initial_value=10000,
+                                    result_column=f"{method} Simulation Reference")
+        harness.get_summary(method_name=method)
+
+    return harness
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_incremental_parity(seed):
+    length_initial = 300
+    length_new = 60
+
+    data = create_test_df(seed=seed, length_real=length_initial + length_new)
+    real = data[data["Data Type"] == "Real data"]
+
+    initial = create_test_df(seed=seed, length_real=length_initial)
+    initial.iloc[:length_initial] = data.iloc[:length_initial]
+    complete = complete_analysis(data)
+
+    harness = complete_analysis(initial)
+    state = harness.build_incremental_state()
+
+    new_entries = harness.select_new_entries(dataframe=real, state=state)
+    assert len(new_entries) == length_new
+
+    entries = []
+    for index, row in new_entries.iterrows():
+        entries.append(harness.update_incremental_state(state=state,
+                                                        date=index,
+                                                        close=row["Close Final"],
+                                                        volume=row["Volume"]))
+    entries = pd.DataFrame(entries, index=new_entries.index)
+    expected = complete.ohlc_dataset.loc[new_entries.index]
+
+    for column in entries.columns:
+        if entries[column].dtype == object:
+            np.testing.assert_array_equal(entries[column].to_numpy(),
+                                          expected[column].to_numpy(),
+                                          err_msg=column)
+        else:
+            np.testing.assert_allclose(entries[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, err_msg=column)
+
+    # --------------------------------------------------------------------------
+    #   The summary is the same, except for the prediction which is kept from
+    #   the initial analysis.
+    # --------------------------------------------------------------------------
+    harness.get_incremental_summary(state=state)
+    for method in METHODS:
+        for key, value in complete.analysis_results[method].items():
+            if key in ["Next Event", "Day Next Event"]:
+                continue
+            assert harness.analysis_results[method][key] == pytest.approx(
+                value, rel=1e-9), (method, key)
+
+
+def test_revised_history():
+    data = create_test_df(seed=3, length_real=200)
+    harness = complete_analysis(data)
+    state = harness.build_incremental_state()
+
+    real = data[data["Data Type"] == "Real data"].copy()
+    assert len(harness.select_new_entries(dataframe=real, state=state)) == 0
+
+    real.loc[:, "Close Final"] = real["Close Final"] / 2
+    assert harness.select_new_entries(dataframe=real, state=state) is None
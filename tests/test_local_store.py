@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from src.lib.data_access.local_store import LocalStore
+
+
+class StoreHarness (LocalStore):
+
+    def __init__(self, folder, source="YahooFinance", max_age=12):
+        self.ticker = "TEST"
+        self.source = source
+        self.adjusted = True
+        self.store = {"folder": folder, "max_age": max_age}
+        self.fetch_range = "10y"
+        self.fetch_compact = False
+
+
+def create_test_df(start: str, length: int, seed: int = 0):
+    """Creates a dataframe with the same columns as from the providers."""
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, length))
+
+    return pd.DataFrame({
+        "Open": close,
+        "High": close,
+        "Low": close,
+        "Close": close,
+        "Close Final": close,
+        "Volume": rng.integers(1000, 5000, length).astype(float),
+        "Dividend Amount": [None] * length,
+        "Split Coefficient": [None] * length,
+    }, index=pd.date_range(start, periods=length, freq="B") + pd.Timedelta(hours=14, minutes=30))
+
+
+def test_merge_delta():
+    harness = StoreHarness(folder=None)
+    complete = create_test_df(start="2021-01-01", length=300)
+    stored = complete.iloc[:290].copy()
+    delta = complete.iloc[280:].copy()
+
+    # --------------------------------------------------------------------------
+    #   The last stored entry was partial (stored during the trading day).
+    # --------------------------------------------------------------------------
+    stored.iloc[-1, stored.columns.get_loc("Close Final")] = 1.0
+
+    merged = harness.merge_store(stored=stored, delta=delta)
+    pd.testing.assert_frame_equal(merged, complete)
+
+
+def test_merge_revised_history():
+    harness = StoreHarness(folder=None)
+    complete = create_test_df(start="2021-01-01", length=300)
+    stored = complete.iloc[:290].copy()
+
+    revised = complete.copy()
+    revised.loc[:, "Close Final"] = revised["Close Final"] * 0.98
+    assert harness.merge_store(stored=stored, delta=revised.iloc[280:]) is None
+
+    split = complete.copy()
+    split.iloc[295, split.columns.get_loc("Split Coefficient")] = 4.0
+    assert harness.merge_store(stored=stored, delta=split.iloc[280:]) is None
+
+    assert harness.merge_store(stored=stored, delta=complete.iloc[291:]) is None
+
+
+def test_store_round_trip(tmp_path):
+    harness = StoreHarness(folder=tmp_path)
+    data = create_test_df(start="2021-01-01", length=50)
+
+    assert harness.load_store() == (None, None)
+    assert not harness.store_is_current()
+
+    harness.save_store(data=data, full=True)
+    stored, metadata = harness.load_store()
+    pd.testing.assert_frame_equal(stored, data)
+    assert metadata["entries"] == 50
+    assert harness.store_is_current()
+
+    harness.store["max_age"] = 0
+    assert not harness.store_is_current()
+
+    other = StoreHarness(folder=tmp_path, source="AlphaVantage")
+    assert other.load_store() == (None, None)
+
+
+def test_delta_range(tmp_path):
+    harness = StoreHarness(folder=tmp_path)
+
+    last_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=20)
+    assert harness.set_delta_range({"last_date": str(last_date)})
+    assert harness.fetch_range == "1mo"
+
+    last_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=4000)
+    harness.fetch_range = "10y"
+    assert not harness.set_delta_range({"last_date": str(last_date)})
+    assert harness.fetch_range == "10y"
+
+    harness = StoreHarness(folder=tmp_path, source="AlphaVantage")
+    last_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=20)
+    assert harness.set_delta_range({"last_date": str(last_date)})
+    assert harness.fetch_compact
@@ -0,0 +1,56 @@
+import logging
+from types import SimpleNamespace
+import numpy as np
+from src.lib.analysis.methods.lstm import LSTM
+
+
+class Model:
+    """Model with a fixed loss, recording the samples evaluated."""
+
+    def __init__(self, loss: float):
+        self.loss = loss
+        self.evaluated = []
+
+    def evaluate(self, x, y, verbose=0):
+        self.evaluated.append(x.copy())
+        return self.loss
+
+
+class AnalysisHarness (LSTM):
+
+    def __init__(self):
+        self.config = SimpleNamespace(lstm_finetune_patience=2, lstm_finetune_epochs=1,
+                                      lstm_finetune_tolerance=0.25)
+        self.logger = logging.getLogger("test")
+        self.lstm_training = {}
+
+
+def create_samples(samples=20):
+    X = np.arange(samples * 3.0).reshape(samples, 3, 1)
+    Y = np.arange(samples * 1.0).reshape(samples, 1)
+    dates = np.datetime64("2021-01-01") + np.arange(samples).astype("timedelta64[D]")
+    return X, Y, dates
+
+
+def test_recent_samples():
+    assert LSTM.recent_samples(20).tolist() == [False] * 18 + [True] * 2
+    assert LSTM.recent_samples(5).tolist() == [False] * 4 + [True]
+    assert LSTM.recent_samples(1).tolist() == [False]
+
+
+def test_finetune_held_out():
+    X, Y, dates = create_samples()
+    analysis = AnalysisHarness()
+
+    # The only new samples are the held-out ones: they are not trained, and
+    # the loss is evaluated on them.
+    model = Model(loss=1.0)
+    training = {"last_date": str(dates[17]), "recent_loss": 1.0, "fine_tunes": 0}
+    assert analysis.finetune_lstm_model(model, X, Y, dates, training) is model
+    assert all(np.array_equal(x, X[18:]) for x in model.evaluated)
+    assert training["last_date"] == str(dates[17]) and training["fine_tunes"] == 1
+
+    # Worse than after the complete training.
+    model = Model(loss=1.3)
+    training = {"last_date": str(dates[17]), "recent_loss": 1.0}
+    assert analysis.finetune_lstm_model(model, X, Y, dates, training) is None
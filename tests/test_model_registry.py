@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from src.lib.analysis.model_registry import ModelRegistry
+
+PARAMETERS = {"lstm_epochs": {"value": 200, "unit": "epochs"},
+              "lstm_sequence_length": {"value": 10, "unit": "days"}}
+
+
+def test_parameters_hash():
+    model_hash = ModelRegistry.parameters_hash("GOOG", "MACD Histogram", PARAMETERS)
+
+    reordered = dict(reversed(list(PARAMETERS.items())))
+    assert ModelRegistry.parameters_hash("GOOG", "MACD Histogram", reordered) == model_hash
+
+    upper = {"lstm_epochs": {"value": 200, "unit": "EPOCHS"},
+             "lstm_sequence_length": {"value": 10, "unit": "days"}}
+    assert ModelRegistry.parameters_hash("GOOG", "MACD Histogram", upper) == model_hash
+
+    changed = {"lstm_epochs": {"value": 100, "unit": "epochs"},
+               "lstm_sequence_length": {"value": 10, "unit": "days"}}
+    assert ModelRegistry.parameters_hash("GOOG", "MACD Histogram", changed) != model_hash
+    assert ModelRegistry.parameters_hash("KO", "MACD Histogram", PARAMETERS) != model_hash
+
+
+def test_lru_eviction():
+    registry = ModelRegistry(capacity=2)
+
+    registry.put("a", "hash", "model a")
+    registry.put("b", "hash", "model b")
+    assert registry.get("a", "hash") == "model a"
+
+    registry.put("c", "hash", "model c")
+    assert registry.get("b", "hash") is None
+    assert registry.get("a", "hash") == "model a"
+    assert registry.get("c", "hash") == "model c"
+
+
+def test_stale_entries():
+    registry = ModelRegistry(capacity=2)
+
+    registry.put("a", "hash", "model a")
+    assert registry.get("a", "other hash") is None
+    assert registry.get("a", "hash") is None
+
+    registry.put("b", "hash", "model b",
+                 created=datetime.today() - timedelta(days=20))
+    assert registry.get("b", "hash", max_age=15) is None
+
+    registry = ModelRegistry(capacity=0)
+    registry.put("a", "hash", "model a")
+    assert registry.get("a", "hash") is None
@@ -0,0 +1,179 @@
+import logging
+import threading
+import pytest
+from src.lib.storage.googlecloud_mysql import GoogleCloudMySQL
+from src.lib.storage.mysql_pool import ConnectionPool
+
+
+class Cursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+
+    def execute(self, query, parameter=None):
+        if "FAIL" in query:
+            raise RuntimeError("Query failed")
+        self.connection.statements.append(query.strip())
+        self.rows = [(query.strip(),)]
+
+    def executemany(self, query, parameter):
+        self.connection.statements.append(query.strip())
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class Connection:
+    """Connection which records the statements, commits and rollbacks."""
+
+    def __init__(self, **kwargs):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.connected = True
+
+    def cursor(self, buffered=False):
+        return Cursor(self)
+
+    def is_connected(self):
+        return self.connected
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.connected = False
+
+
+class StorageHarness (GoogleCloudMySQL):
+    """Minimal storage with the attributes used by ``GoogleCloudMySQL``."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.transaction_state = threading.local()
+        self.logger_name = "test"
+        self.logger = logging.getLogger("test")
+
+
+def create_pool(pool_size=2):
+    return ConnectionPool(config_db={}, pool_size=pool_size, connect=Connection)
+
+
+def test_reuse_connection():
+    pool = create_pool()
+    storage = StorageHarness(pool)
+
+    for _ in range(5):
+        result = storage.execute_query(database_name="db", query="SELECT 1", type_query="SELECT")
+
+    connection = pool.idle[0]
+    assert result == [("SELECT 1",)]
+    assert pool.opened == 1
+    assert connection.commits == 5
+    assert connection.statements == ["USE `db`", "SELECT 1"] * 5
+
+
+def test_transaction():
+    pool = create_pool()
+    storage = StorageHarness(pool)
+
+    with storage.transaction():
+        storage.execute_query(database_name=None, query="CREATE DATABASE db", type_query="NONE")
+        storage.execute_query(database_name="db", query="INSERT 1", type_query="INSERT")
+        storage.execute_query(database_name="db", query="INSERT 2", type_query="INSERT")
+
+    connection = pool.idle[0]
+    assert pool.opened == 1
+    assert connection.commits == 1
+    assert connection.statements == ["CREATE DATABASE db", "USE `db`", "INSERT 1", "INSERT 2"]
+
+
+def test_rollback():
+    pool = create_pool()
+    storage = StorageHarness(pool)
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction(database_name="db"):
+            storage.execute_query(database_name="db", query="INSERT 1", type_query="INSERT")
+            storage.execute_query(database_name="db", query="FAIL", type_query="INSERT")
+
+    connection = pool.idle[0]
+    assert connection.commits == 0 and connection.rollbacks == 1
+
+    # The connection is available again.
+    storage.execute_query(database_name="db", query="SELECT 1", type_query="SELECT")
+    assert pool.opened == 1
+
+
+def test_disconnected():
+    pool = create_pool()
+    storage = StorageHarness(pool)
+
+    storage.execute_query(database_name=None, query="SELECT 1", type_query="SELECT")
+    pool.idle[0].connected = False
+    storage.execute_query(database_name=None, query="SELECT 1", type_query="SELECT")
+
+    assert pool.opened == 2
+    assert len(pool.idle) == 1 and pool.idle[0].is_connected()
+
+
+def test_threads():
+    pool = create_pool(pool_size=2)
+    in_use = []
+    maximum = []
+    lock = threading.Lock()
+
+    def worker():
+        storage = StorageHarness(pool)
+        for _ in range(20):
+            with storage.transaction():
+                with lock:
+                    in_use.append(1)
+                    maximum.append(len(in_use))
+                storage.execute_query(database_name=None, query="SELECT 1", type_query="SELECT")
+                with lock:
+                    in_use.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(maximum) <= 2
+    assert pool.opened <= 2
+    assert sum(connection.commits for connection in pool.idle) == 120
+
+
+class Lifecycle:
+    """Lifecycle whose start fails, counting the jobs released."""
+
+    def __init__(self):
+        self.releases = 0
+
+    def acquire(self):
+        return False
+
+    def release(self):
+        self.releases += 1
+
+
+def test_start_failed():
+    lifecycle = Lifecycle()
+    pool = ConnectionPool(config_db={}, pool_size=1, lifecycle=lifecycle, connect=Connection)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            pool.get_connection()
+
+    # No connection opened, no job released twice and the pool is not blocked.
+    assert pool.opened == 0
+    assert lifecycle.releases == 0
+    assert pool._available.acquire(blocking=False)
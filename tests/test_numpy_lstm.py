@@ -0,0 +1,191 @@
+import logging
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.lib.analysis.methods import lstm as lstm_method
+from src.lib.analysis.numpy_lstm import NumpyLSTM, export_keras_model
+
+RNG = np.random.default_rng(7)
+
+
+# ------------------------------------------------------------------------------
+#   Layers with the same interface as the Keras ones used for the export.
+# ------------------------------------------------------------------------------
+class Layer:
+    def __init__(self, config, weights=()):
+        self.config = config
+        self.weights = list(weights)
+
+    def get_config(self):
+        return self.config
+
+    def get_weights(self):
+        return self.weights
+
+
+class LSTM (Layer):
+    def __init__(self, inputs, units, activation="tanh", return_sequences=False):
+        super().__init__({"units": units, "activation": activation,
+                          "recurrent_activation": "sigmoid",
+                          "return_sequences": return_sequences, "use_bias": True},
+                         [RNG.normal(size=(inputs, 4 * units)).astype(np.float32),
+                          RNG.normal(size=(units, 4 * units)).astype(np.float32),
+                          RNG.normal(size=(4 * units,)).astype(np.float32)])
+
+
+class Dense (Layer):
+    def __init__(self, inputs, units, activation="linear"):
+        super().__init__({"units": units, "activation": activation},
+                         [RNG.normal(size=(inputs, units)).astype(np.float32),
+                          RNG.normal(size=(units,)).astype(np.float32)])
+
+
+class TimeDistributed (Layer):
+    def __init__(self, layer):
+        super().__init__({}, layer.get_weights())
+        self.layer = layer
+
+
+class RepeatVector (Layer):
+    def __init__(self, n):
+        super().__init__({"n": n})
+
+
+class Activation (Layer):
+    def __init__(self, activation):
+        super().__init__({"activation": activation})
+
+
+class Dropout (Layer):
+    def __init__(self, rate):
+        super().__init__({"rate": rate})
+
+
+class Model:
+    def __init__(self, layers):
+        self.layers = layers
+
+
+def reference_lstm(x, layer, activation, return_sequences):
+    """Step by step LSTM cell, for each sample and unit."""
+    kernel, recurrent_kernel, bias = layer.get_weights()
+    units = recurrent_kernel.shape[0]
+    sigmoid = lambda v: 1.0 / (1.0 + np.exp(-v))
+    outputs = np.zeros((x.shape[0], x.shape[1], units))
+    for sample in range(x.shape[0]):
+        h = np.zeros(units)
+        c = np.zeros(units)
+        for step in range(x.shape[1]):
+            h_previous = h.copy()
+            for unit in range(units):
+                gate = [x[sample, step] @ kernel[:, k * units + unit]
+                        + h_previous @ recurrent_kernel[:, k * units + unit]
+                        + bias[k * units + unit] for k in range(4)]
+                c[unit] = (sigmoid(gate[1]) * c[unit]
+                           + sigmoid(gate[0]) * activation(gate[2]))
+                h[unit] = sigmoid(gate[3]) * activation(c[unit])
+            outputs[sample, step] = h
+    return outputs if return_sequences else outputs[:, -1]
+
+
+def test_lstm_forward():
+    x = RNG.normal(size=(4, 6, 2))
+
+    for activation, function in [("tanh", np.tanh),
+                                 ("relu", lambda v: np.maximum(v, 0.0))]:
+        for return_sequences in [False, True]:
+            layer = LSTM(2, 3, activation=activation,
+                         return_sequences=return_sequences)
+            model = NumpyLSTM(layers=[], weights=[])
+            description = dict(layer.get_config(), type="LSTM")
+
+            result = model.lstm_forward(x, layer.get_weights(), description)
+            expected = reference_lstm(x, layer, function, return_sequences)
+
+            np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-8)
+
+
+def test_architectures(tmp_path):
+    sequence_length, prediction_length, blocks = 10, 3, 4
+    x = RNG.uniform(size=(5, sequence_length, 1))
+
+    models = {
+        "many to many different sizes": (
+            Model([LSTM(1, blocks), RepeatVector(prediction_length),
+                   LSTM(blocks, blocks, return_sequences=True),
+                   TimeDistributed(Dense(blocks, 1)), Activation("linear")]),
+            (5, prediction_length, 1)),
+        "many to many same sizes": (
+            Model([LSTM(1, blocks, activation="relu"), RepeatVector(sequence_length),
+                   LSTM(blocks, blocks, activation="relu", return_sequences=True),
+                   TimeDistributed(Dense(blocks, 1))]),
+            (5, sequence_length, 1)),
+        "many to one": (
+            Model([LSTM(1, blocks, return_sequences=True),
+                   LSTM(blocks, blocks, return_sequences=True), Dropout(0.2),
+                   LSTM(blocks, blocks, return_sequences=True), Dropout(0.2),
+                   LSTM(blocks, blocks), Dropout(0.2), Dense(blocks, 1)]),
+            (5, 1)),
+    }
+
+    for name, (keras_model, shape) in models.items():
+        path = tmp_path / f"{name}.npz"
+        export_keras_model(model=keras_model, path=path)
+        model = NumpyLSTM.from_npz(path)
+
+        prediction = model.predict(x)
+        assert prediction.shape == shape
+        assert prediction.dtype == np.float32
+
+        # ----------------------------------------------------------------------
+        #   Same result as chaining the reference implementation of the layers.
+        # ----------------------------------------------------------------------
+        expected = x
+        for layer in keras_model.layers:
+            if isinstance(layer, LSTM):
+                activation = (np.tanh if layer.config["activation"] == "tanh"
+                              else lambda v: np.maximum(v, 0.0))
+                expected = reference_lstm(expected, layer, activation,
+                                          layer.config["return_sequences"])
+            elif isinstance(layer, RepeatVector):
+                expected = np.stack([expected] * layer.config["n"], axis=1)
+            elif isinstance(layer, (Dense, TimeDistributed)):
+                expected = expected @ layer.weights[0] + layer.weights[1]
+
+        np.testing.assert_allclose(prediction, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_keras_parity(tmp_path):
+    """Same prediction as Keras, for the models of each architecture created
+    by ``create_lstm_model``."""
+    pytest.importorskip("tensorflow")
+
+    class AnalysisHarness (lstm_method.LSTM):
+        symbol = "TEST"
+        logger = logging.getLogger("test")
+        lstm_training = {}
+        config = SimpleNamespace(
+            parameters={"analysis": {}}, lstm_model_cache_size=0, lstm_validation_split=0.0,
+            lstm_early_stopping_patience=0, lstm_early_stopping_min_delta=0.0,
+            lstm_training_budget=0, lstm_stream_training=False, lstm_batch_size=8)
+
+    analysis = AnalysisHarness()
+    samples, blocks = 16, 4
+
+    for sequence_length, prediction_length in [(10, 3), (5, 5), (10, 1)]:
+        x = RNG.uniform(size=(samples, sequence_length, 1)).astype(np.float32)
+        y = RNG.uniform(size=(samples, prediction_length, 1)).astype(np.float32)
+        if prediction_length == 1:
+            y = y[:, :, 0]
+
+        keras_model = analysis.create_lstm_model(
+            X=x, Y=y, number_blocks=blocks, epochs=1,
+            sequence_length=sequence_length, prediction_length=prediction_length,
+            number_features=1, save_model=False)
+
+        path = tmp_path / f"model_{sequence_length}_{prediction_length}.npz"
+        export_keras_model(model=keras_model, path=path)
+        model = NumpyLSTM.from_npz(path)
+
+        np.testing.assert_allclose(model.predict(x), keras_model.predict(x, verbose=0),
+                                   rtol=1e-4, atol=1e-5)
@@ -0,0 +1,160 @@
+import pytest
+import numpy as np
+import pandas as pd
+from conftest import random_walk_df
+from src.lib.analysis.basic import Basic
+from src.lib.analysis.arbitration import Arbitration
+from src.lib.analysis.panel import Panel
+
+
+class StrategyHarness (Basic, Arbitration):
+
+    def __init__(self, ohlc_dataset):
+        self.ohlc_dataset = ohlc_dataset
+
+
+def create_test_df(seed: int, length_real: int = 750, length_prediction: int = 25):
+    """Creates a dataframe as prepared by ``Analysis.prepare_analysis``: a
+    random walk (see ``random_walk_df``) with its daily change."""
+
+    dataframe = random_walk_df(seed=seed, length_real=length_real,
+                               length_prediction=length_prediction)
+
+    Basic().calc_change(dataframe=dataframe,
+                        source_column="Close Final",
+                        shift=1,
+                        result_column="Close Final Change")
+
+    return dataframe
+
+
+def reference_strategies(dataframe: pd.DataFrame):
+    """Same sequence of calculations done for a single symbol by the
+    strategies (``calc_MACD`` without the LSTM, ``calc_RSI_SMA``,
+    ``calc_RSI_EMA`` and ``calc_BBANDS``)."""
+
+    harness = StrategyHarness(dataframe.copy())
+    df = harness.ohlc_dataset
+
+    harness.calc_EMA(dataframe=df, source_column="Close Final", length=12,
+                     result_column="MACD EMA 12")
+    harness.calc_EMA(dataframe=df, source_column="Close Final", length=26,
+                     result_column="MACD EMA 26")
+    harness.calc_difference(dataframe=df, minuend_column="MACD EMA 12",
+                            subtrahend_column="MACD EMA 26",
+                            result_column="MACD Line")
+    harness.calc_EMA(dataframe=df, source_column="MACD Line", length=9,
+                     result_column="MACD Signal")
+    harness.calc_difference(dataframe=df, minuend_column="MACD Line",
+                            subtrahend_column="MACD Signal",
+                            result_column="MACD Histogram")
+    harness.recommend_threshold_cross(source_column="MACD Histogram",
+                                      threshold_upper=0.0,
+                                      threshold_lower=0.0,
+                                      mode="norm",
+                                      values_upper_mid_lower=(
+                                          "BUY", "HOLD", "SELL"),
+                                      result_column="MACD Recommendation")
+
+    for method in ["RSI SMA", "RSI EMA"]:
+        harness.calc_threshold(dataframe=df, source_column="Close Final Change",
+                               threshold=0, comparison="<", replace_value=0,
+                               result_column=f"{method} Gain")
+        harness.calc_threshold(dataframe=df, source_column="Close Final Change",
+                               threshold=0, comparison=">", replace_value=0,
+                               result_column=f"{method} Loss")
+
+    harness.calc_absolute(dataframe=df, source_column="RSI SMA Loss",
+                          result_column="RSI SMA Loss Absolute")
+    harness.calc_wilder(dataframe=df, source_column="RSI SMA Gain", length=14,
+                        result_column="RSI SMA Gain Average")
+    harness.calc_wilder(dataframe=df, source_column="RSI SMA Loss Absolute",
+                        length=14, result_column="RSI SMA Loss Average")
+    harness.calc_division(dataframe=df, dividend_column="RSI SMA Gain Average",
+                          divisor_column="RSI SMA Loss Average",
+                          result_column="RSI SMA RS")
+    df.loc[:, "RSI SMA RSI"] = 100 - (100 / (1 + df["RSI SMA RS"]))
+
+    harness.calc_scalar_multiplication(dataframe=df, factor1_column="RSI EMA Loss",
+                                       factor2=-1,
+                                       result_column="RSI EMA Loss Positive")
+    harness.calc_EMA(dataframe=df, source_column="RSI EMA Gain", length=14,
+                     result_column="RSI EMA Gain Average")
+    harness.calc_EMA(dataframe=df, source_column="RSI EMA Loss Positive",
+                     length=14, result_column="RSI EMA Loss Average")
+    harness.calc_division(dataframe=df, dividend_column="RSI EMA Gain Average",
+                          divisor_column="RSI EMA Loss Average",
+                          result_column="RSI EMA RS")
+    df.loc[:, "RSI EMA RSI"] = 100 - (100 / (1 + df["RSI EMA RS"]))
+
+    for method in ["RSI SMA", "RSI EMA"]:
+        for hysteresis, suffix in [(False, " Pure"), (True, "")]:
+            harness.recommend_threshold_cross(source_column=f"{method} RSI",
+                                              threshold_upper=70,
+                                              threshold_lower=30,
+                                              mode="abs",
+                                              hysteresis=hysteresis,
+                                              values_upper_mid_lower=(
+                                                  "SELL", "HOLD", "BUY"),
+                                              result_column=f"{method} Recommendation{suffix}")
+
+    harness.calc_SMA(dataframe=df, source_column="Close Final", length=20,
+                     result_column="BBANDS SMA 20")
+    harness.calc_MovingStdDev(dataframe=df, source_column="Close Final",
+                              length=20, result_column="BBANDS StdDev 20")
+    df.loc[:, "BBANDS Upper"] = df["BBANDS SMA 20"] + \
+        (2 * df["BBANDS StdDev 20"])
+    df.loc[:, "BBANDS Lower"] = df["BBANDS SMA 20"] - \
+        (2 * df["BBANDS StdDev 20"])
+    harness.recommend_threshold_curve(source_column="Close Final",
+                                      reference_column_upper="BBANDS Upper",
+                                      reference_column_lower="BBANDS Lower",
+                                      values_upper_mid_lower=(
+                                          "BUY", "HOLD", "SELL"),
+                                      result_column="BBANDS Recommendation")
+
+    return df
+
+
+@pytest.mark.parametrize("seeds", [[0], [0, 1, 2, 3, 4]])
+def test_panel_parity(seeds):
+    datasets = [create_test_df(seed=seed) for seed in seeds]
+    expected = [reference_strategies(dataset) for dataset in datasets]
+
+    panel = Panel()
+    prediction = (datasets[0]["Data Type"] == "Prediction data").to_numpy()
+    close = panel.stack_panel(datasets=datasets, source_column="Close Final")
+    change = panel.stack_panel(datasets=datasets,
+                               source_column="Close Final Change")
+
+    results = panel.calc_panel_indicators(close=close,
+                                          change=change,
+                                          prediction=prediction)
+    results.update(panel.recommend_panel(close=close, panel=results))
+    results.update(panel.recommend_panel_MACD(
+        histogram=results["MACD Histogram"]))
+    panel.unstack_panel(datasets=datasets, panel=results)
+
+    for dataset, reference in zip(datasets, expected):
+        assert set(reference.columns) == set(dataset.columns)
+        for column in reference.columns:
+            np.testing.assert_array_equal(dataset[column].to_numpy(),
+                                          reference[column].to_numpy(),
+                                          err_msg=column)
+
+
+def test_threshold_states_columns():
+    rng = np.random.default_rng(5)
+    values = rng.normal(50, 25, (200, 4))
+    upper = np.array([70, 60, 80, 75])
+
+    states = Arbitration.threshold_states(values=values,
+                                          threshold_upper=upper,
+                                          threshold_lower=30)
+
+    for i in range(values.shape[1]):
+        np.testing.assert_array_equal(
+            states[:, i],
+            Arbitration.threshold_states(values=values[:, i],
+                                         threshold_upper=upper[i],
+                                         threshold_lower=30))
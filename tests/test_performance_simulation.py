@@ -0,0 +1,202 @@
+import pytest
+import numpy as np
+import pandas as pd
+from conftest import random_walk_df
+from src.lib.analysis.basic import Basic
+from src.lib.analysis.performance_simulation import PerformanceSimulation
+
+SIMULATION_PARAMETERS = {
+    "initial_value": 10000,
+    "stopgain": 1.4,
+    "stoploss": 0.85,
+    "operation_cost_fix": 4.90,
+    "operation_cost_proportional": 0.0025,
+    "operation_cost_min": 9.90,
+    "operation_cost_max": 59.90,
+    "tax_percentage": 0.1,
+}
+
+
+class SimulationHarness (Basic, PerformanceSimulation):
+
+    def __init__(self, ohlc_dataset):
+        self.ohlc_dataset = ohlc_dataset
+
+
+def create_test_df(seed: int, length_real: int = 750, length_prediction: int = 25):
+    """Creates a random walk dataframe (see ``random_walk_df``) with
+    recommendations in blocks of random lengths."""
+
+    def recommendations(rng):
+        recommendation = []
+        while len(recommendation) < length_real + length_prediction:
+            recommendation += [rng.choice(["BUY", "HOLD", "SELL"])] * \
+                int(rng.integers(1, 15))
+        recommendation = recommendation[:length_real + length_prediction]
+
+        events = []
+        for i, value in enumerate(recommendation):
+            previous_value = recommendation[i - 1]
+            if value == "BUY" and previous_value != "BUY":
+                events.append("BUY")
+            elif value == "SELL" and previous_value != "SELL":
+                events.append("SELL")
+            else:
+                events.append("HOLD")
+
+        return {"Recommendation": recommendation, "Recommended Events": events}
+
+    return random_walk_df(seed=seed, length_real=length_real,
+                          length_prediction=length_prediction,
+                          columns=recommendations, dates=False)
+
+
+def reference_simulate_performance(dataframe: pd.DataFrame,
+                                   initial_value: float,
+                                   stopgain: float,
+                                   stoploss: float,
+                                   operation_cost_fix: float,
+                                   operation_cost_proportional: float,
+                                   operation_cost_min: float,
+                                   operation_cost_max: float,
+                                   tax_percentage: float):
+    """Row by row simulation, as originally done by ``simulate_performance``."""
+
+    dataframe = dataframe.copy()
+    dataframe.loc[:, "Simulation"] = initial_value
+
+    i = 0
+    pre_first_buy = True
+    cycle_profit = 0
+    cycle_balance = initial_value
+    total_balance = initial_value
+    tax_value = 0
+    operation_cost_value = 0
+    takegain_value = 0
+    stoploss_value = 0
+
+    for index, row in dataframe.iterrows():
+        if i > 0:
+            decision = dataframe.iloc[i]["Recommendation"]
+            event = dataframe.iloc[i]["Recommended Events"]
+            close_prev = dataframe.iloc[i - 1]["Close Final"]
+            close_today = dataframe.iloc[i]["Close Final"]
+
+            perc_day = 1 + ((close_today - close_prev) / close_prev)
+
+            if event == "SELL" or event == "HOLD":
+                pre_first_buy = False
+
+            if (event == "BUY" or event == "SELL") and pre_first_buy == False:
+                operation_cost_value = operation_cost_fix + \
+                    total_balance * operation_cost_proportional
+                if operation_cost_value < operation_cost_min:
+                    operation_cost_value = operation_cost_min
+                if operation_cost_value > operation_cost_max:
+                    operation_cost_value = operation_cost_max
+                cycle_balance = total_balance
+            else:
+                operation_cost_value = 0
+
+            if event == "BUY" and pre_first_buy == False and stoploss < 1:
+                if stoploss_value == 0:
+                    stoploss_value = close_prev * stoploss
+
+            if event == "BUY" and pre_first_buy == False and stopgain > 1:
+                if takegain_value == 0:
+                    takegain_value = close_prev * stopgain
+
+            if stoploss_value > 0 and close_prev < stoploss_value and stoploss < 1:
+                takegain_value = 0
+                stoploss_value = 0
+                decision = "SELL"
+                event = "SELL"
+
+            if takegain_value > 0 and close_prev > takegain_value and stopgain > 1:
+                takegain_value = 0
+                stoploss_value = 0
+                decision = "SELL"
+                event = "SELL"
+
+            if event == "SELL":
+                stoploss_value = 0
+                takegain_value = 0
+
+            if event == "SELL":
+                cycle_profit = total_balance - cycle_balance
+                if cycle_profit < 0:
+                    cycle_profit = 0
+                tax_value = cycle_profit * tax_percentage
+            else:
+                tax_value = 0
+
+            if decision == "BUY" and pre_first_buy == False:
+                total_balance = total_balance * perc_day
+
+            total_balance = total_balance - operation_cost_value - tax_value
+
+            if total_balance <= 0:
+                total_balance = 0
+
+            dataframe.iloc[i, dataframe.columns.get_loc(
+                "Simulation")] = total_balance
+
+        i = i + 1
+
+    return dataframe["Simulation"].to_numpy()
+
+
+def reference_calculate_reference(dataframe: pd.DataFrame, initial_value: float):
+    """Row by row buy-hold simulation, as originally done by
+    ``calculate_reference``."""
+
+    dataframe = dataframe.copy()
+    dataframe.loc[:, "Simulation Reference"] = initial_value
+
+    total_balance = initial_value
+    for i in range(1, dataframe.shape[0]):
+        close_prev = dataframe.iloc[i - 1]["Close Final"]
+        close_today = dataframe.iloc[i]["Close Final"]
+        total_balance = total_balance * \
+            (1 + ((close_today - close_prev) / close_prev))
+        if total_balance <= 0:
+            total_balance = 0
+        dataframe.iloc[i, dataframe.columns.get_loc(
+            "Simulation Reference")] = total_balance
+
+    return dataframe["Simulation Reference"].to_numpy()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("stopgain, stoploss", [(1.4, 0.85), (1.03, 0.97), (1.0, 1.0)])
+def test_simulate_performance_parity(seed, stopgain, stoploss):
+    dataframe = create_test_df(seed=seed)
+    parameters = dict(SIMULATION_PARAMETERS,
+                      stopgain=stopgain, stoploss=stoploss)
+
+    expected = reference_simulate_performance(dataframe, **parameters)
+
+    harness = SimulationHarness(dataframe)
+    harness.simulate_performance(source_column_close="Close Final",
+                                 source_column_decision="Recommendation",
+                                 source_column_events="Recommended Events",
+                                 result_column="Simulation",
+                                 **parameters)
+
+    np.testing.assert_array_equal(
+        harness.ohlc_dataset["Simulation"].to_numpy(), expected)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_calculate_reference_parity(seed):
+    dataframe = create_test_df(seed=seed)
+
+    expected = reference_calculate_reference(dataframe, initial_value=10000)
+
+    harness = SimulationHarness(dataframe)
+    harness.calculate_reference(source_column_close="Close Final",
+                                initial_value=10000,
+                                result_column="Simulation Reference")
+
+    np.testing.assert_array_equal(
+        harness.ohlc_dataset["Simulation Reference"].to_numpy(), expected)
@@ -0,0 +1,51 @@
+import asyncio
+from src.lib.data_access.rate_limit import TokenBucket
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_burst_and_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(requests=5, period=60, clock=clock)
+
+    for i in range(5):
+        assert bucket.wait_time() == 0
+        bucket.tokens = bucket.tokens - 1
+
+    assert bucket.wait_time() == 12
+
+    clock.now = 6.0
+    assert bucket.wait_time() == 6
+
+    clock.now = 600.0
+    bucket.refill()
+    assert bucket.tokens == 5
+
+
+def test_token_bucket_acquire_spacing():
+    bucket = TokenBucket(requests=2, period=0.2)
+    times = []
+
+    async def request():
+        await bucket.acquire()
+        times.append(bucket.clock())
+
+    async def run():
+        await asyncio.gather(*[request() for i in range(4)])
+
+    start = bucket.clock()
+    asyncio.run(run())
+
+    # --------------------------------------------------------------------------
+    #   The first 2 requests are a burst, the next ones wait 0.1 s each.
+    # --------------------------------------------------------------------------
+    assert times[1] - start < 0.05
+    assert times[2] - start >= 0.09
+    assert times[3] - start >= 0.19
@@ -0,0 +1,43 @@
+from pathlib import Path
+from src.lib.config import Config
+from src.run_context import RunContext
+
+
+def create_config(ohlc_store=False):
+    config = Config(logger_name="test")
+    config.local_config = {"paths": {"data_storage": "data"}}
+    config.time_sleep = 15
+    config.ohlc_store = ohlc_store
+    config.ohlc_store_max_age = 2
+    return config
+
+
+def test_config_passed():
+    config = create_config()
+    context = RunContext(logger_name="test", config=config)
+
+    assert context.config is config
+    assert context.config_loaded
+    assert context.data_storage == Path("data")
+    assert context.ohlc_store is None
+    assert context.rate_limit == {"requests": 1, "period": 15}
+
+    # Nothing is created before the first use.
+    assert context._storage is None and context._http is None
+    context.close()
+
+
+def test_ohlc_store():
+    context = RunContext(logger_name="test", config=create_config(ohlc_store=True))
+    context.config.data_source_fetch_rate_limit = {"requests": 5, "period": 60}
+
+    assert context.ohlc_store == {"folder": Path("data") / "ohlc", "max_age": 2}
+    assert context.rate_limit == {"requests": 5, "period": 60}
+
+
+def test_missing_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    context = RunContext(logger_name="test")
+
+    assert not context.config_loaded
@@ -0,0 +1,172 @@
+import logging
+import threading
+from types import SimpleNamespace
+import pandas as pd
+from src.lib.storage.googlecloud_mysql import GoogleCloudMySQL
+from src.lib.storage.mysql_pool import ConnectionPool
+from src.lib.storage.schema_cache import SchemaCache
+
+
+class Server:
+    """Server with the schema as the dictionary ``(database, table)`` to
+    columns, recording the statements."""
+
+    def __init__(self, tables=None, databases=None):
+        self.tables = dict(tables or {})
+        self.databases = set(databases or []) | {database for database, _ in self.tables}
+        self.statements = []
+
+    def schema_rows(self):
+        rows = [(database, None, None) for database in self.databases
+                if not any(key[0] == database for key in self.tables)]
+        for (database, table), columns in self.tables.items():
+            rows += [(database, table, column) for column in columns]
+        return rows
+
+
+class Cursor:
+
+    def __init__(self, server):
+        self.server = server
+        self.database = None
+        self.rows = []
+
+    def execute(self, query, parameter=None):
+        query = " ".join(query.split())
+        self.server.statements.append(query)
+        self.rows = []
+        if query.startswith("USE"):
+            self.database = query.split("`")[1]
+        elif "information_schema" in query:
+            self.rows = self.server.schema_rows()
+        elif query.startswith("CREATE DATABASE"):
+            self.server.databases.add(query.split()[-1])
+        elif query.startswith("CREATE TABLE"):
+            table = query.split("`")[1]
+            columns = query.split("(", 1)[1].split("`")[1::2]
+            self.server.tables[(self.database, table)] = columns
+        elif query.startswith("SELECT *"):
+            self.rows = []
+
+    def executemany(self, query, parameter):
+        self.execute(query)
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class Connection:
+
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self, buffered=False):
+        return Cursor(self.server)
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class StorageHarness (GoogleCloudMySQL):
+
+    def __init__(self, server):
+        self.pool = ConnectionPool(config_db={}, connect=lambda: Connection(server))
+        self.schema_cache = SchemaCache()
+        self.config = SimpleNamespace(mysql_bulk_mode="insert", mysql_bulk_rows=1000)
+        self.temp_folder = None
+        self.transaction_state = threading.local()
+        self.logger_name = "test"
+        self.logger = logging.getLogger("test")
+
+
+def metadata_statements(server):
+    return [statement for statement in server.statements
+            if not statement.startswith(("USE", "INSERT"))]
+
+
+def test_schema_cache():
+    server = Server(tables={("db", "positions"): ["index", "Date", "WKN"]},
+                    databases=["empty"])
+    cache = SchemaCache()
+    calls = []
+
+    def execute(query):
+        calls.append(query)
+        return server.schema_rows()
+
+    assert cache.database_exists("db", execute)
+    assert cache.database_exists("empty", execute)
+    assert cache.table_exists("db", "positions", execute)
+    assert cache.columns("db", "positions", execute) == ["index", "Date", "WKN"]
+    assert cache.columns("db", "orders", execute) is None
+    assert len(calls) == 1
+
+    # The databases and tables not found are checked again in the server.
+    assert not cache.database_exists("other", execute)
+    assert not cache.table_exists("empty", "positions", execute)
+    assert len(calls) == 3
+
+    cache.invalidate()
+    assert cache.table_exists("db", "positions", execute)
+    assert len(calls) == 4
+
+
+def test_created_by_other_process():
+    server = Server(tables={("db", "positions"): ["index", "Date", "WKN"]})
+    cache = SchemaCache()
+    execute = lambda query: server.schema_rows()
+
+    assert cache.table_exists("db", "positions", execute)
+
+    server.tables[("db", "orders")] = ["index", "Date"]
+    server.databases.add("other")
+    assert cache.table_exists("db", "orders", execute)
+    assert cache.database_exists("other", execute)
+
+
+def test_store_existing_tables():
+    sheets = ["balance", "depots", "positions", "orders", "accounts"]
+    server = Server(tables={("db", sheet): ["index", "Date", "WKN", "Value"] for sheet in sheets})
+    storage = StorageHarness(server)
+
+    dataframe = pd.DataFrame({"Date": ["2021-01-01"], "WKN": ["A"], "Value": [1.0]})
+    storage.save_pandas_as_db(database_name="db",
+                              table_name=sheets,
+                              dataframe=[dataframe] * len(sheets))
+
+    # Only the query of the schema, no checks of the database or tables.
+    statements = metadata_statements(server)
+    assert len(statements) == 1 and "information_schema" in statements[0]
+    assert sum(statement.startswith("INSERT") for statement in server.statements) == 5
+
+
+def test_create_table():
+    server = Server()
+    storage = StorageHarness(server)
+
+    dataframe = pd.DataFrame({"Date": ["2021-01-01"], "Position ID": ["1"], "Quantity": [2]})
+    storage.save_pandas_as_db(database_name="db", table_name="positions", dataframe=dataframe)
+    storage.save_pandas_as_db(database_name="db", table_name="positions", dataframe=dataframe)
+
+    statements = metadata_statements(server)
+    create_table = [statement for statement in statements if statement.startswith("CREATE TABLE")]
+    assert "CREATE DATABASE db" in statements
+    assert len(create_table) == 1
+    assert "`Position ID` VARCHAR(200)" in create_table[0]
+    assert "`Quantity` INT(10)" in create_table[0]
+    assert not any("MODIFY" in statement for statement in statements)
+    assert any("UNIQUE (`Date`,`Position ID`)" in statement for statement in statements)
+
+    # The cache is loaded again to confirm the table is missing, and after its
+    # creation.
+    assert sum("information_schema" in statement for statement in statements) == 3
+    assert storage.check_table_exists(database_name="db", table_name="positions")
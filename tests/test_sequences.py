@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+from src.lib.analysis.sequences import Sequences
+
+
+def reference_create_dataset(dataset, input_sequence_length, output_sequence_length):
+    """Sequences and labels built one by one, as done before the strided
+    views."""
+
+    if input_sequence_length == len(dataset):
+        return np.array([dataset]), np.array([])
+
+    dataX = []
+    dataY = []
+    for i in range(len(dataset) - input_sequence_length - output_sequence_length + 1):
+        subsequence = dataset[i: i + input_sequence_length]
+        start_label = i + input_sequence_length
+        label = dataset[start_label: start_label + output_sequence_length]
+        if output_sequence_length == 1:
+            label = label[0]
+        dataX.append(subsequence)
+        dataY.append(label)
+
+    return np.array(dataX), np.array(dataY)
+
+
+def reference_squash_output(data, mode):
+    """Anti-diagonals grouped into lists, as done before the overlap-add. For
+    the weighted average, the weights are linear from 1 up to the number of
+    values of the position."""
+
+    if data.shape[0] == 1 or (len(data.shape) == 2 and data.shape[1] == 1):
+        return np.array(data.flatten()).reshape(-1, 1)
+
+    results = [[] for k in range(data.shape[0] + data.shape[1] - 1)]
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            results[i + j].append(data[i][j][0])
+
+    for k in range(len(results)):
+        if mode == "average":
+            results[k] = sum(results[k]) / len(results[k])
+        elif mode == "last":
+            results[k] = results[k][0]
+        elif mode == "first":
+            results[k] = results[k][-1]
+        elif mode == "weighted-average":
+            weights = np.arange(1, len(results[k]) + 1, dtype=float)
+            results[k] = sum(np.multiply(weights, np.array(results[k]))) / sum(weights)
+
+    return np.array(results).reshape(-1, 1)
+
+
+@pytest.mark.parametrize("input_length, output_length", [(10, 1), (10, 25), (3, 4), (1, 1)])
+@pytest.mark.parametrize("shape", [(200, 1), (200,)])
+def test_create_dataset(input_length, output_length, shape):
+    rng = np.random.default_rng(0)
+    dataset = rng.random(shape)
+
+    sequences, labels = Sequences().create_dataset(dataset=dataset,
+                                                   input_sequence_length=input_length,
+                                                   output_sequence_length=output_length)
+    expected_sequences, expected_labels = reference_create_dataset(
+        dataset, input_length, output_length)
+
+    np.testing.assert_array_equal(sequences, expected_sequences)
+    np.testing.assert_array_equal(labels, expected_labels)
+    assert sequences.shape == expected_sequences.shape
+    assert labels.shape == expected_labels.shape
+    assert np.shares_memory(sequences, dataset)
+
+
+def test_create_dataset_edges():
+    dataset = np.arange(10, dtype=float).reshape(-1, 1)
+
+    sequences, labels = Sequences().create_dataset(dataset=dataset,
+                                                   input_sequence_length=10)
+    assert sequences.shape == (1, 10, 1)
+    assert labels.size == 0
+
+    sequences, labels = Sequences().create_dataset(dataset=dataset,
+                                                   input_sequence_length=8,
+                                                   output_sequence_length=5)
+    assert sequences.size == 0 and labels.size == 0
+
+
+@pytest.mark.parametrize("mode", ["average", "last", "first", "weighted-average"])
+@pytest.mark.parametrize("shape", [(120, 25, 1), (30, 1, 1), (1, 25, 1), (7, 3, 1)])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_squash_output(mode, shape, dtype):
+    rng = np.random.default_rng(1)
+    data = rng.random(shape).astype(dtype)
+
+    results = Sequences().squash_output(data=data, mode=mode)
+    expected = reference_squash_output(data, mode)
+
+    assert results.shape == expected.shape
+    assert results.dtype == expected.dtype
+    np.testing.assert_array_equal(results, expected)
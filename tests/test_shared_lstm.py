@@ -0,0 +1,105 @@
+import logging
+from types import SimpleNamespace
+import numpy as np
+from src.lib.analysis.model_registry import SHARED_SYMBOL
+from src.lib.analysis.shared_lstm import SharedLSTM
+
+
+class Model:
+    """Model which returns the last value of each sequence, counting the
+    calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x):
+        self.calls += 1
+        return x[:, -1, :]
+
+
+class AnalysisHarness:
+    """Minimal analysis with the interface of ``LSTM`` used by
+    ``SharedLSTM``."""
+
+    def __init__(self, offset: float, dates: np.ndarray, model=None):
+        self.ohlc_dataset = None
+        self.sequence_length = 3
+        self.prediction_length = 1
+        self.config = SimpleNamespace(lstm_number_blocks=2, lstm_epochs=1,
+                                      lstm_number_features=1, lstm_hidden_neurons=1)
+        self.offset = offset
+        self.dates = dates
+        self.model = model
+        self.lstm_training = {}
+        self.created = []
+        self.stored = None
+        self.cleared = False
+
+    def prepare_LSTM(self, dataframe, source_column, sequence_length, prediction_length):
+        samples = len(self.dates)
+        return {"x_train": self.offset + np.arange(samples * 3.0).reshape(samples, 3, 1),
+                "y_train": self.offset + np.arange(samples * 1.0).reshape(samples, 1),
+                "x_test": self.offset + np.full((1, 3, 1), -1.0),
+                "sample_dates": self.dates}
+
+    def create_lstm_model(self, **kwargs):
+        self.created.append(kwargs)
+        self.lstm_training[kwargs["source_column"]] = {"LSTM Model": "Stored"}
+        return self.model
+
+    def store_LSTM(self, dataframe, lstm_data, train_predict, test_predict, **kwargs):
+        self.stored = (train_predict, test_predict)
+
+    def clear_LSTM(self, dataframe, source_column, result_column):
+        self.cleared = True
+
+
+class Shared (SharedLSTM):
+    logger = logging.getLogger("test")
+
+
+def test_train_pooled():
+    dates_a = np.array(["2021-01-01", "2021-01-03"], dtype="datetime64[D]")
+    dates_b = np.array(["2021-01-02", "2021-01-04", "2021-01-05"], dtype="datetime64[D]")
+    analyses = [AnalysisHarness(0.0, dates_a), AnalysisHarness(100.0, dates_b)]
+
+    training = Shared().train_shared_LSTM(analyses=analyses)
+
+    call = analyses[0].created[0]
+    assert training == {"MACD Histogram": {"LSTM Model": "Stored"}}
+    assert call["symbol"] == SHARED_SYMBOL and call["train"]
+    assert len(analyses[1].created) == 0
+
+    # Samples from both symbols, ordered by date.
+    X, Y = call["X"].take()
+    assert X.shape == (5, 3, 1)
+    np.testing.assert_array_equal(call["sample_dates"],
+                                  np.sort(np.concatenate([dates_a, dates_b])))
+    np.testing.assert_array_equal(Y[:, 0], [0.0, 100.0, 1.0, 101.0, 102.0])
+
+
+def test_predict_batched():
+    model = Model()
+    dates = np.array(["2021-01-01", "2021-01-02"], dtype="datetime64[D]")
+    analyses = [AnalysisHarness(0.0, dates, model),
+                AnalysisHarness(100.0, dates[:1], model),
+                AnalysisHarness(200.0, dates, model)]
+
+    Shared().predict_shared_LSTM(analyses=analyses)
+
+    assert model.calls == 1
+    for analysis in analyses:
+        expected = analysis.prepare_LSTM(None, "", 3, 1)
+        train_predict, test_predict = analysis.stored
+        np.testing.assert_array_equal(train_predict, expected["x_train"][:, -1, :])
+        np.testing.assert_array_equal(test_predict, expected["x_test"][:, -1, :])
+        assert analysis.lstm_training["MACD Histogram"] == {"LSTM Model": "Stored"}
+
+
+def test_predict_without_model():
+    dates = np.array(["2021-01-01"], dtype="datetime64[D]")
+    analyses = [AnalysisHarness(0.0, dates), AnalysisHarness(1.0, dates)]
+
+    Shared().predict_shared_LSTM(analyses=analyses)
+
+    assert all(analysis.cleared and analysis.stored is None for analysis in analyses)
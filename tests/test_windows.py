@@ -0,0 +1,61 @@
+import numpy as np
+from src.lib.analysis.sequences import Sequences
+from src.lib.analysis.windows import Windows
+
+
+def create_windows(order=None):
+    sequences = Sequences()
+    series = [np.arange(12.0).reshape(-1, 1), 100 + np.arange(9.0).reshape(-1, 1)]
+    pairs = [sequences.create_dataset(dataset=data,
+                                      input_sequence_length=4,
+                                      output_sequence_length=2) for data in series]
+    windows = Windows(sequences=[x for x, y in pairs],
+                      labels=[y for x, y in pairs],
+                      order=order)
+    X = np.concatenate([x for x, y in pairs])
+    Y = np.concatenate([y for x, y in pairs])
+    return windows, X, Y
+
+
+def test_take():
+    windows, X, Y = create_windows()
+    assert len(windows) == len(X) == 11
+
+    x, y = windows.take()
+    np.testing.assert_array_equal(x, X)
+    np.testing.assert_array_equal(y, Y)
+
+    order = np.random.default_rng(3).permutation(len(X))
+    windows, X, Y = create_windows(order=order)
+    x, y = windows.take(slice(2, 8), dtype=np.float32)
+    assert x.dtype == np.float32
+    np.testing.assert_array_equal(x, X[order][2:8])
+    np.testing.assert_array_equal(y, Y[order][2:8])
+
+
+def test_subset_and_split():
+    windows, X, Y = create_windows()
+
+    mask = np.arange(len(X)) % 3 == 0
+    x, y = windows.subset(mask).take()
+    np.testing.assert_array_equal(x, X[mask])
+
+    training, validation = windows.split(0.3)
+    assert len(training) == 7 and len(validation) == 4
+    np.testing.assert_array_equal(validation.take()[1], Y[7:])
+
+
+def test_batches():
+    windows, X, Y = create_windows()
+
+    batches = list(windows.batches(batch_size=4))
+    assert [len(x) for x, y in batches] == [4, 4, 3]
+    np.testing.assert_array_equal(np.concatenate([x for x, y in batches]), X)
+
+    shuffled = list(windows.batches(batch_size=4, shuffle=True, seed=1))
+    x = np.concatenate([x for x, y in shuffled])
+    y = np.concatenate([y for x, y in shuffled])
+    assert not np.array_equal(x, X)
+    np.testing.assert_array_equal(np.sort(x[:, 0, 0]), np.sort(X[:, 0, 0]))
+    # The labels remain paired to the sequences.
+    np.testing.assert_array_equal(y[:, 0, 0], x[:, -1, 0] + 1)